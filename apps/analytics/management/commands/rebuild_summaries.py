@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.organizations.models import Organization
+from apps.analytics.services import AnalyticsService
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds monthly and fiscal emission summaries and rollups from scratch, or verifies them with --verify'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organization',
+            help='Only process this organization id (default: all organizations)'
+        )
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Compare stored summaries against a recompute without changing anything'
+        )
+
+    def handle(self, *args, **options):
+        organizations = Organization.objects.all()
+        if options['organization']:
+            organizations = organizations.filter(id=options['organization'])
+            if not organizations.exists():
+                raise CommandError(f"Organization {options['organization']} not found")
+
+        total_mismatches = 0
+        for organization in organizations:
+            if options['verify']:
+                mismatches = AnalyticsService.verify_summaries(organization)
+                total_mismatches += len(mismatches)
+                for m in mismatches:
+                    where = f"facility {m['facility']}" if m['facility'] else 'org-wide'
+                    if m['category']:
+                        where += f" / {m['category']}"
+                    self.stdout.write(self.style.WARNING(
+                        f"{organization.name} [{m['table']}] {where} {m['reporting_period']} {m['scope'] or 'all scopes'}: "
+                        f"expected {m['expected'][0]} ({m['expected'][1]} records), "
+                        f"stored {m['stored'][0]} ({m['stored'][1]} records)"
+                    ))
+            else:
+                count = AnalyticsService.rebuild_summaries(organization)
+                self.stdout.write(f"{organization.name}: rebuilt {count} summary rows")
+
+        if options['verify']:
+            if total_mismatches:
+                raise CommandError(f"{total_mismatches} summary rows are out of date")
+            self.stdout.write(self.style.SUCCESS("All summaries match the emission records."))
+        else:
+            self.stdout.write(self.style.SUCCESS("Summaries rebuilt."))
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-18 15:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('facilities', '0001_initial'),
+        ('organizations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='emissionsummarymonthly',
+            constraint=models.UniqueConstraint(condition=models.Q(('facility__isnull', True)), fields=('organization', 'reporting_period', 'scope'), name='uniq_org_summary_period_scope'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.1 on 2026-10-18 15:43
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_org_summary_unique'),
+        ('facilities', '0001_initial'),
+        ('organizations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmissionRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('reporting_period', models.CharField(max_length=7)),
+                ('scope', models.CharField(max_length=10)),
+                ('category', models.CharField(max_length=100)),
+                ('total_co2e', models.DecimalField(decimal_places=4, max_digits=15)),
+                ('record_count', models.IntegerField(default=0)),
+                ('last_calculated_at', models.DateTimeField(auto_now=True)),
+                ('facility', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='emission_rollups', to='facilities.facility')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='emission_rollups', to='organizations.organization')),
+            ],
+            options={
+                'db_table': 'emission_rollups',
+                'indexes': [models.Index(fields=['organization', 'reporting_period'], name='emission_ro_organiz_b43266_idx'), models.Index(fields=['organization', 'category'], name='emission_ro_organiz_fa4a3e_idx')],
+                'unique_together': {('organization', 'facility', 'reporting_period', 'scope', 'category')},
+            },
+        ),
+    ]
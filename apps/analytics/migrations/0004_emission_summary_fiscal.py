@@ -0,0 +1,37 @@
+# Generated by Django 5.0.1 on 2026-10-18 15:56
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_emission_rollup'),
+        ('organizations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmissionSummaryFiscal',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('fiscal_year', models.IntegerField()),
+                ('fiscal_quarter', models.IntegerField(default=0)),
+                ('scope', models.CharField(blank=True, max_length=10)),
+                ('total_co2e', models.DecimalField(decimal_places=4, max_digits=15)),
+                ('record_count', models.IntegerField(default=0)),
+                ('last_calculated_at', models.DateTimeField(auto_now=True)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fiscal_summaries', to='organizations.organization')),
+            ],
+            options={
+                'db_table': 'emission_summary_fiscal',
+                'indexes': [models.Index(fields=['organization', 'fiscal_year'], name='emission_su_organiz_e2bc55_idx')],
+                'unique_together': {('organization', 'fiscal_year', 'fiscal_quarter', 'scope')},
+            },
+        ),
+    ]
@@ -0,0 +1,126 @@
+# Generated by Django 5.0.1 on 2026-10-18 18:40
+
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+
+from django.db import migrations
+from django.db.models import Count, Sum
+
+SUMMARY_PLACES = Decimal('0.0001')
+
+
+# Copies of apps.core.utils.fiscal_start_month / fiscal_period as of this
+# migration, so later changes there can't alter the backfill
+def fiscal_start_month(fiscal_year_start):
+    try:
+        parsed = datetime.strptime(f"2000-{fiscal_year_start}", '%Y-%m-%d')
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid fiscal year start: {fiscal_year_start!r} (expected MM-DD)")
+    return parsed.month
+
+
+def fiscal_period(period, start_month):
+    year, month = (int(part) for part in period.split('-'))
+    start_year = year if month >= start_month else year - 1
+    fiscal_year = start_year if start_month == 1 else start_year + 1
+    quarter = (month - start_month) % 12 // 3 + 1
+    return fiscal_year, quarter
+
+
+def rebuild_summaries(apps, schema_editor):
+    """
+    Existing installs only had org-wide monthly summaries. Facility-level
+    monthly rows, the rollup cube and the fiscal totals were empty until
+    `manage.py rebuild_summaries` ran, so the endpoints reading them
+    returned zeros. Recompute every level once from the live emission
+    records, the same way AnalyticsService.rebuild_summaries does.
+    """
+    EmissionRecord = apps.get_model('emissions', 'EmissionRecord')
+    Organization = apps.get_model('organizations', 'Organization')
+    EmissionSummaryMonthly = apps.get_model('analytics', 'EmissionSummaryMonthly')
+    EmissionRollup = apps.get_model('analytics', 'EmissionRollup')
+    EmissionSummaryFiscal = apps.get_model('analytics', 'EmissionSummaryFiscal')
+
+    rows = EmissionRecord.objects.filter(deleted_at__isnull=True).values(
+        'organization_id', 'facility_id', 'reporting_period', 'scope', 'category'
+    ).annotate(total=Sum('co2e_calculated'), count=Count('id')).order_by()
+
+    zero = (Decimal('0'), 0)
+    monthly = defaultdict(lambda: zero)
+    rollup = {}
+    for row in rows:
+        total = (row['total'] or Decimal('0')).quantize(SUMMARY_PLACES)
+        org_id, period = row['organization_id'], row['reporting_period']
+        rollup[(org_id, row['facility_id'], period, row['scope'], row['category'])] = (total, row['count'])
+        # Each record counts towards its scope row and the all-scope row ('')
+        for facility_id in (None, row['facility_id']):
+            for scope in (row['scope'], ''):
+                key = (org_id, facility_id, period, scope)
+                monthly[key] = (monthly[key][0] + total, monthly[key][1] + row['count'])
+
+    start_months = {
+        org_id: fiscal_start_month(fiscal_year_start)
+        for org_id, fiscal_year_start in Organization.objects.values_list('id', 'fiscal_year_start')
+    }
+    fiscal = defaultdict(lambda: zero)
+    for (org_id, facility_id, period, scope), (total, count) in monthly.items():
+        if facility_id is not None:
+            continue
+        fiscal_year, quarter = fiscal_period(period, start_months.get(org_id, 1))
+        # Quarter 0 holds the whole year
+        for fiscal_quarter in (0, quarter):
+            key = (org_id, fiscal_year, fiscal_quarter, scope)
+            fiscal[key] = (fiscal[key][0] + total, fiscal[key][1] + count)
+
+    EmissionSummaryMonthly.objects.all().delete()
+    EmissionRollup.objects.all().delete()
+    EmissionSummaryFiscal.objects.all().delete()
+    EmissionSummaryMonthly.objects.bulk_create([
+        EmissionSummaryMonthly(
+            organization_id=org_id,
+            facility_id=facility_id,
+            reporting_period=period,
+            scope=scope,
+            total_co2e=total,
+            record_count=count
+        )
+        for (org_id, facility_id, period, scope), (total, count) in monthly.items()
+    ], batch_size=1000)
+    EmissionRollup.objects.bulk_create([
+        EmissionRollup(
+            organization_id=org_id,
+            facility_id=facility_id,
+            reporting_period=period,
+            scope=scope,
+            category=category,
+            total_co2e=total,
+            record_count=count
+        )
+        for (org_id, facility_id, period, scope, category), (total, count) in rollup.items()
+    ], batch_size=1000)
+    EmissionSummaryFiscal.objects.bulk_create([
+        EmissionSummaryFiscal(
+            organization_id=org_id,
+            fiscal_year=fiscal_year,
+            fiscal_quarter=fiscal_quarter,
+            scope=scope,
+            total_co2e=total,
+            record_count=count
+        )
+        for (org_id, fiscal_year, fiscal_quarter, scope), (total, count) in fiscal.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_emission_summary_fiscal'),
+        ('emissions', '0006_emission_record_external_ref'),
+        ('facilities', '0001_initial'),
+        ('organizations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_summaries, migrations.RunPython.noop),
+    ]
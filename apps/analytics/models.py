@@ -34,6 +34,14 @@ class EmissionSummaryMonthly(BaseModel):
     class Meta:
         db_table = 'emission_summary_monthly'
         unique_together = [['organization', 'facility', 'reporting_period', 'scope']]
+        constraints = [
+            # NULLs are distinct in unique_together, so org-wide rows need their own constraint
+            models.UniqueConstraint(
+                fields=['organization', 'reporting_period', 'scope'],
+                condition=models.Q(facility__isnull=True),
+                name='uniq_org_summary_period_scope',
+            ),
+        ]
         indexes = [
             models.Index(fields=['organization', 'reporting_period']),
             models.Index(fields=['organization', 'scope']),
@@ -42,3 +50,74 @@ class EmissionSummaryMonthly(BaseModel):
     def __str__(self):
         fac_name = self.facility.name if self.facility else "Total Org"
         return f"{fac_name} - {self.reporting_period} - {self.total_co2e} kg CO2e"
+
+
+class EmissionRollup(BaseModel):
+    """
+    Pre-aggregated cube at organization x facility x scope x category x period grain.
+    Any coarser slice (by facility, by category, ...) is a SUM over this table
+    instead of a scan of emission_records.
+    """
+    organization = models.ForeignKey(
+        'organizations.Organization',
+        on_delete=models.CASCADE,
+        related_name='emission_rollups'
+    )
+    facility = models.ForeignKey(
+        'facilities.Facility',
+        on_delete=models.CASCADE,
+        related_name='emission_rollups'
+    )
+    
+    reporting_period = models.CharField(max_length=7)  # YYYY-MM
+    scope = models.CharField(max_length=10)
+    category = models.CharField(max_length=100)
+    
+    total_co2e = models.DecimalField(max_digits=15, decimal_places=4)
+    record_count = models.IntegerField(default=0)
+    
+    last_calculated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'emission_rollups'
+        unique_together = [['organization', 'facility', 'reporting_period', 'scope', 'category']]
+        indexes = [
+            models.Index(fields=['organization', 'reporting_period']),
+            models.Index(fields=['organization', 'category']),
+        ]
+
+    def __str__(self):
+        return f"{self.facility_id} - {self.reporting_period} - {self.scope} - {self.category}: {self.total_co2e} kg CO2e"
+
+
+class EmissionSummaryFiscal(BaseModel):
+    """
+    Organization-wide totals per fiscal year and quarter, derived from the
+    monthly summaries using Organization.fiscal_year_start.
+    Fiscal years are labelled by the calendar year they end in.
+    """
+    organization = models.ForeignKey(
+        'organizations.Organization',
+        on_delete=models.CASCADE,
+        related_name='fiscal_summaries'
+    )
+    
+    fiscal_year = models.IntegerField()
+    fiscal_quarter = models.IntegerField(default=0)  # 0 means the whole year
+    scope = models.CharField(max_length=10, blank=True)  # Blank means total across scopes
+    
+    total_co2e = models.DecimalField(max_digits=15, decimal_places=4)
+    record_count = models.IntegerField(default=0)
+    
+    last_calculated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'emission_summary_fiscal'
+        unique_together = [['organization', 'fiscal_year', 'fiscal_quarter', 'scope']]
+        indexes = [
+            models.Index(fields=['organization', 'fiscal_year']),
+        ]
+
+    def __str__(self):
+        label = f"FY{self.fiscal_year}" + (f" Q{self.fiscal_quarter}" if self.fiscal_quarter else "")
+        return f"{self.organization.name} - {label} - {self.total_co2e} kg CO2e"
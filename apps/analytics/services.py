@@ -1,6 +1,47 @@
-from django.db.models import Sum, Count
-from .models import EmissionSummaryMonthly
+from collections import defaultdict
+from decimal import Decimal
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Sum, Count, F, Max, Q
+from django.utils import timezone
+from .models import EmissionSummaryMonthly, EmissionRollup, EmissionSummaryFiscal
 from apps.emissions.models import EmissionRecord
+from apps.facilities.models import Facility
+from apps.organizations.models import Organization
+from apps.core.utils import (
+    fiscal_period, fiscal_start_month, format_period, parse_period, period_range, shift_period
+)
+
+
+SUMMARY_PLACES = Decimal('0.0001')
+
+# Longest series the trend endpoint will return
+TREND_MAX_PERIODS = 120
+TREND_MAX_ROLLING_WINDOW = 12
+
+# Default reduction target for progress tracking: 42% below baseline by
+# 2030, the near-term 1.5C pathway
+DEFAULT_TARGET_YEAR = 2030
+DEFAULT_TARGET_REDUCTION_PCT = 42.0
+
+# Rollup dimensions that can be grouped on, mapped to their columns
+ROLLUP_DIMENSIONS = {
+    'facility': 'facility_id',
+    'scope': 'scope',
+    'category': 'category',
+    'reporting_period': 'reporting_period',
+}
+
+# Rollup filter parameters mapped to their lookups
+ROLLUP_FILTERS = {
+    'facility': 'facility_id',
+    'scope': 'scope',
+    'category': 'category',
+    'period': 'reporting_period',
+    'period_from': 'reporting_period__gte',
+    'period_to': 'reporting_period__lte',
+}
 
 
 class AnalyticsService:
@@ -9,65 +50,791 @@ class AnalyticsService:
     """
     
     @staticmethod
-    def calculate_monthly_summary(organization, period=None, facility=None):
+    def record_deltas(records, sign=1, deltas=None):
         """
-        Calculates and updates summaries. 
-        If period is None, it recalculates for all periods found in the organization.
+        Accumulates deltas for records being added (sign=1) or removed
+        (sign=-1) at the finest grain the summaries are kept at.
+        Records may be EmissionRecord instances or dicts with the same
+        attribute names.
+        Returns {(organization_id, facility_id, reporting_period, scope, category): [co2e, count]}.
         """
-        if period:
-            periods = [period]
-        else:
-            # Get all unique periods for this org
-            periods = EmissionRecord.objects.filter(
-                organization=organization
-            ).values_list('reporting_period', flat=True).distinct()
+        if deltas is None:
+            deltas = defaultdict(lambda: [Decimal('0'), 0])
+        for record in records:
+            get = record.get if isinstance(record, dict) else record.__dict__.get
+            # Quantize like the database column so deltas sum exactly
+            co2e = Decimal(get('co2e_calculated')).quantize(SUMMARY_PLACES) * sign
+            key = (
+                get('organization_id'), get('facility_id'),
+                get('reporting_period'), get('scope'), get('category')
+            )
+            deltas[key][0] += co2e
+            deltas[key][1] += sign
+        return deltas
 
-        for p in periods:
-            queryset = EmissionRecord.objects.filter(
-                organization=organization,
-                reporting_period=p,
-                deleted_at__isnull=True
+    @staticmethod
+    def apply_summary_deltas(deltas):
+        """
+        Applies accumulated deltas to every summary level: org-wide and
+        facility monthly summaries (per scope and all-scope), fiscal year
+        and quarter summaries, and the category rollup. One UPDATE per
+        touched row, creating rows that don't exist yet. Call inside the
+        transaction that writes the records.
+        """
+        monthly = defaultdict(lambda: [Decimal('0'), 0])
+        rollup = {}
+        for (org_id, facility_id, period, scope, category), (co2e, count) in deltas.items():
+            if not co2e and not count:
+                continue
+            rollup[(org_id, facility_id, period, scope, category)] = (co2e, count)
+            # Each record counts towards its scope row and the all-scope row ('')
+            for summary_facility in (None, facility_id):
+                for summary_scope in (scope, ''):
+                    key = (org_id, summary_facility, period, summary_scope)
+                    monthly[key][0] += co2e
+                    monthly[key][1] += count
+        
+        now = timezone.now()
+        for (org_id, facility_id, period, scope), (co2e, count) in monthly.items():
+            AnalyticsService._apply_delta(
+                EmissionSummaryMonthly,
+                {
+                    'organization_id': org_id,
+                    'facility_id': facility_id,
+                    'reporting_period': period,
+                    'scope': scope,
+                },
+                co2e, count, now
             )
-            
-            if facility:
-                queryset = queryset.filter(facility=facility)
-                
-            # Get aggregations by scope
-            scope_totals = queryset.values('scope').annotate(
-                total=Sum('co2e_calculated'),
-                count=Count('id')
+        
+        org_monthly = [
+            ((org_id, period, scope), values)
+            for (org_id, facility_id, period, scope), values in monthly.items()
+            if facility_id is None
+        ]
+        start_months = AnalyticsService._fiscal_start_months({key[0] for key, _ in org_monthly})
+        fiscal = AnalyticsService._fiscal_totals(org_monthly, start_months, zero=[Decimal('0'), 0])
+        for (org_id, fiscal_year, fiscal_quarter, scope), (co2e, count) in fiscal.items():
+            AnalyticsService._apply_delta(
+                EmissionSummaryFiscal,
+                {
+                    'organization_id': org_id,
+                    'fiscal_year': fiscal_year,
+                    'fiscal_quarter': fiscal_quarter,
+                    'scope': scope,
+                },
+                co2e, count, now
             )
-            
-            # Totals across all scopes
-            org_total = queryset.aggregate(
-                total=Sum('co2e_calculated'),
-                count=Count('id')
+        
+        for (org_id, facility_id, period, scope, category), (co2e, count) in rollup.items():
+            AnalyticsService._apply_delta(
+                EmissionRollup,
+                {
+                    'organization_id': org_id,
+                    'facility_id': facility_id,
+                    'reporting_period': period,
+                    'scope': scope,
+                    'category': category,
+                },
+                co2e, count, now
             )
-            
-            # Update scope-specific summaries
-            for entry in scope_totals:
-                EmissionSummaryMonthly.objects.update_or_create(
+
+    @staticmethod
+    def _apply_delta(model, key, co2e, count, now):
+        lookup = dict(key)
+        if 'facility_id' in lookup and lookup['facility_id'] is None:
+            del lookup['facility_id']
+            lookup['facility__isnull'] = True
+        changes = {
+            'total_co2e': F('total_co2e') + co2e,
+            'record_count': F('record_count') + count,
+            'last_calculated_at': now,
+            'updated_at': now,
+        }
+        if model.all_objects.filter(**lookup).update(**changes):
+            return
+        try:
+            with transaction.atomic():
+                model.objects.create(total_co2e=co2e, record_count=count, **key)
+        except IntegrityError:
+            # Created concurrently; apply the delta to that row instead
+            model.all_objects.filter(**lookup).update(**changes)
+
+    @staticmethod
+    def _fiscal_start_months(organization_ids):
+        """{organization_id: first month of its fiscal year}"""
+        return {
+            org_id: fiscal_start_month(fiscal_year_start)
+            for org_id, fiscal_year_start in Organization.all_objects.filter(
+                id__in=organization_ids
+            ).values_list('id', 'fiscal_year_start')
+        }
+
+    @staticmethod
+    def _fiscal_totals(org_monthly, start_months, zero=(Decimal('0'), 0)):
+        """
+        Folds org-wide monthly values ((org_id, period, scope), (co2e, count))
+        into {(org_id, fiscal_year, fiscal_quarter, scope): (co2e, count)},
+        with quarter 0 holding the whole year.
+        """
+        fiscal = {}
+        for (org_id, period, scope), (co2e, count) in org_monthly:
+            fiscal_year, quarter = fiscal_period(period, start_months[org_id])
+            for fiscal_quarter in (0, quarter):
+                key = (org_id, fiscal_year, fiscal_quarter, scope)
+                total, records = fiscal.get(key, zero)
+                fiscal[key] = (total + co2e, records + count)
+        return fiscal
+
+    @staticmethod
+    def rebuild_fiscal_summaries(organization):
+        """
+        Recomputes an organization's fiscal summaries from its monthly
+        summaries, e.g. after fiscal_year_start changes. Reads one row per
+        period and scope, never the records. Returns the number of rows written.
+        """
+        org_monthly = [
+            ((organization.id, period, scope), (total, count))
+            for period, scope, total, count in EmissionSummaryMonthly.objects.filter(
+                organization=organization,
+                facility__isnull=True
+            ).values_list('reporting_period', 'scope', 'total_co2e', 'record_count')
+        ]
+        fiscal = AnalyticsService._fiscal_totals(
+            org_monthly, {organization.id: fiscal_start_month(organization.fiscal_year_start)}
+        )
+        with transaction.atomic():
+            EmissionSummaryFiscal.all_objects.filter(organization=organization).delete()
+            EmissionSummaryFiscal.objects.bulk_create([
+                EmissionSummaryFiscal(
                     organization=organization,
-                    facility=facility,
-                    reporting_period=p,
-                    scope=entry['scope'],
-                    defaults={
-                        'total_co2e': entry['total'] or 0,
-                        'record_count': entry['count']
-                    }
+                    fiscal_year=fiscal_year,
+                    fiscal_quarter=fiscal_quarter,
+                    scope=scope,
+                    total_co2e=total,
+                    record_count=count
                 )
-                
-            # Update total summary (scope='')
-            EmissionSummaryMonthly.objects.update_or_create(
-                organization=organization,
-                facility=facility,
-                reporting_period=p,
-                scope='',
-                defaults={
-                    'total_co2e': org_total['total'] or 0,
-                    'record_count': org_total['count']
-                }
+                for (_, fiscal_year, fiscal_quarter, scope), (total, count) in fiscal.items()
+            ])
+        return len(fiscal)
+
+    @staticmethod
+    def apply_record_deltas(records, sign=1):
+        AnalyticsService.apply_summary_deltas(AnalyticsService.record_deltas(records, sign))
+
+    @staticmethod
+    def expected_summaries(organization):
+        """
+        Recomputes all summary levels from emission_records with one grouped
+        query. Returns (monthly, rollup, fiscal) dicts of
+        (total_co2e, record_count) keyed by (facility_id, period, scope),
+        (facility_id, period, scope, category) and
+        (fiscal_year, fiscal_quarter, scope); facility_id None is org-wide.
+        """
+        rows = EmissionRecord.objects.filter(
+            organization=organization
+        ).values('facility_id', 'reporting_period', 'scope', 'category').annotate(
+            total=Sum('co2e_calculated'),
+            count=Count('id')
+        )
+        
+        monthly = defaultdict(lambda: (Decimal('0'), 0))
+        rollup = {}
+        for row in rows:
+            total = (row['total'] or Decimal('0')).quantize(SUMMARY_PLACES)
+            rollup[(row['facility_id'], row['reporting_period'], row['scope'], row['category'])] = (total, row['count'])
+            for facility_id in (None, row['facility_id']):
+                for scope in (row['scope'], ''):
+                    key = (facility_id, row['reporting_period'], scope)
+                    monthly[key] = (monthly[key][0] + total, monthly[key][1] + row['count'])
+        
+        fiscal = AnalyticsService._fiscal_totals(
+            [
+                ((organization.id, period, scope), values)
+                for (facility_id, period, scope), values in monthly.items()
+                if facility_id is None
+            ],
+            {organization.id: fiscal_start_month(organization.fiscal_year_start)}
+        )
+        fiscal = {key[1:]: values for key, values in fiscal.items()}
+        return dict(monthly), rollup, fiscal
+
+    @staticmethod
+    def verify_summaries(organization):
+        """
+        Compares stored summaries and rollups against a fresh recompute.
+        Returns a list of mismatches; empty means everything is correct.
+        """
+        expected_monthly, expected_rollup, expected_fiscal = AnalyticsService.expected_summaries(organization)
+        stored_monthly = {
+            (row.facility_id, row.reporting_period, row.scope): (row.total_co2e.quantize(SUMMARY_PLACES), row.record_count)
+            for row in EmissionSummaryMonthly.objects.filter(organization=organization)
+        }
+        stored_rollup = {
+            (row.facility_id, row.reporting_period, row.scope, row.category): (row.total_co2e.quantize(SUMMARY_PLACES), row.record_count)
+            for row in EmissionRollup.objects.filter(organization=organization)
+        }
+        stored_fiscal = {
+            (row.fiscal_year, row.fiscal_quarter, row.scope): (row.total_co2e.quantize(SUMMARY_PLACES), row.record_count)
+            for row in EmissionSummaryFiscal.objects.filter(organization=organization)
+        }
+        
+        empty = (Decimal('0').quantize(SUMMARY_PLACES), 0)
+        mismatches = []
+        for table, expected, stored in (
+            ('monthly', expected_monthly, stored_monthly),
+            ('rollup', expected_rollup, stored_rollup),
+        ):
+            for key in sorted(set(expected) | set(stored), key=str):
+                want = expected.get(key, empty)
+                have = stored.get(key, empty)
+                if want != have:
+                    mismatches.append({
+                        'table': table,
+                        'facility': key[0],
+                        'reporting_period': key[1],
+                        'scope': key[2],
+                        'category': key[3] if table == 'rollup' else None,
+                        'expected': want,
+                        'stored': have,
+                    })
+        
+        for key in sorted(set(expected_fiscal) | set(stored_fiscal)):
+            want = expected_fiscal.get(key, empty)
+            have = stored_fiscal.get(key, empty)
+            if want != have:
+                fiscal_year, fiscal_quarter, scope = key
+                mismatches.append({
+                    'table': 'fiscal',
+                    'facility': None,
+                    'reporting_period': AnalyticsService.fiscal_label(fiscal_year, fiscal_quarter),
+                    'scope': scope,
+                    'category': None,
+                    'expected': want,
+                    'stored': have,
+                })
+        return mismatches
+
+    @staticmethod
+    def rebuild_summaries(organization):
+        """
+        Replaces the monthly, fiscal and rollup summaries with a fresh
+        recompute. Returns the number of rows written.
+        """
+        monthly, rollup, fiscal = AnalyticsService.expected_summaries(organization)
+        with transaction.atomic():
+            EmissionSummaryMonthly.all_objects.filter(organization=organization).delete()
+            EmissionRollup.all_objects.filter(organization=organization).delete()
+            EmissionSummaryMonthly.objects.bulk_create([
+                EmissionSummaryMonthly(
+                    organization=organization,
+                    facility_id=facility_id,
+                    reporting_period=period,
+                    scope=scope,
+                    total_co2e=total,
+                    record_count=count
+                )
+                for (facility_id, period, scope), (total, count) in monthly.items()
+            ])
+            EmissionRollup.objects.bulk_create([
+                EmissionRollup(
+                    organization=organization,
+                    facility_id=facility_id,
+                    reporting_period=period,
+                    scope=scope,
+                    category=category,
+                    total_co2e=total,
+                    record_count=count
+                )
+                for (facility_id, period, scope, category), (total, count) in rollup.items()
+            ])
+            EmissionSummaryFiscal.all_objects.filter(organization=organization).delete()
+            EmissionSummaryFiscal.objects.bulk_create([
+                EmissionSummaryFiscal(
+                    organization=organization,
+                    fiscal_year=fiscal_year,
+                    fiscal_quarter=fiscal_quarter,
+                    scope=scope,
+                    total_co2e=total,
+                    record_count=count
+                )
+                for (fiscal_year, fiscal_quarter, scope), (total, count) in fiscal.items()
+            ])
+        return len(monthly) + len(rollup) + len(fiscal)
+
+    @staticmethod
+    def get_rollup(organization, group_by, filters=None):
+        """
+        Slices the rollup cube. group_by is any subset of ROLLUP_DIMENSIONS;
+        filters may narrow facility, scope, category, period,
+        period_from and period_to. Drill down by adding a dimension to
+        group_by and filtering on the parent value.
+        """
+        invalid = [dim for dim in group_by if dim not in ROLLUP_DIMENSIONS]
+        if invalid:
+            raise ValueError(f"Unknown rollup dimension(s): {', '.join(invalid)}")
+        
+        filters = filters or {}
+        queryset = EmissionRollup.objects.filter(organization=organization)
+        for param, lookup in ROLLUP_FILTERS.items():
+            if filters.get(param):
+                queryset = queryset.filter(**{lookup: filters[param]})
+        
+        columns = [ROLLUP_DIMENSIONS[dim] for dim in group_by]
+        if 'facility' in group_by:
+            columns.append('facility__name')
+        rows = queryset.values(*columns).annotate(
+            total=Sum('total_co2e'),
+            records=Sum('record_count')
+        ).order_by('-total')
+        
+        results = []
+        for row in rows:
+            entry = {dim: row[ROLLUP_DIMENSIONS[dim]] for dim in group_by}
+            if 'facility' in group_by:
+                entry['facility'] = str(entry['facility'])
+                entry['facility_name'] = row['facility__name']
+            entry['total_co2e'] = float(row['total'] or 0)
+            entry['record_count'] = int(row['records'] or 0)
+            results.append(entry)
+        return results
+
+    @staticmethod
+    def get_facility_breakdown(facility, period_from=None, period_to=None, scope=None):
+        """
+        Totals for one facility from its monthly summaries and category
+        rollup rows: overall, per period and per scope/category, optionally
+        limited to a period range and one scope. Cost depends on the number
+        of periods and categories, not records.
+        Raises ValueError for invalid periods.
+        """
+        for period in (period_from, period_to):
+            if period:
+                parse_period(period)
+        
+        filters = {'organization_id': facility.organization_id, 'facility': facility}
+        if period_from:
+            filters['reporting_period__gte'] = period_from
+        if period_to:
+            filters['reporting_period__lte'] = period_to
+        
+        monthly = EmissionSummaryMonthly.objects.filter(**filters)
+        monthly = monthly.filter(scope__in=['', scope] if scope else ['', 'scope1', 'scope2', 'scope3'])
+        periods = defaultdict(dict)
+        for period, row_scope, total, count in monthly.values_list(
+            'reporting_period', 'scope', 'total_co2e', 'record_count'
+        ):
+            periods[period][row_scope] = (float(total), count)
+        
+        totals = {'total_co2e': 0.0, 'scope1': 0.0, 'scope2': 0.0, 'scope3': 0.0, 'record_count': 0}
+        by_period = []
+        for period in sorted(periods):
+            scopes = periods[period]
+            # With a scope filter the all-scope row would overstate the total
+            total, count = scopes.get(scope or '', (0.0, 0))
+            entry = {
+                'period': period,
+                'total_co2e': total,
+                'scope1': scopes.get('scope1', (0.0, 0))[0],
+                'scope2': scopes.get('scope2', (0.0, 0))[0],
+                'scope3': scopes.get('scope3', (0.0, 0))[0],
+                'record_count': count,
+            }
+            if count == 0 and total == 0:
+                continue
+            for key in totals:
+                totals[key] += entry[key]
+            by_period.append(entry)
+        
+        rollup = EmissionRollup.objects.filter(**filters)
+        if scope:
+            rollup = rollup.filter(scope=scope)
+        by_category = [
+            {
+                'scope': row['scope'],
+                'category': row['category'],
+                'total_co2e': float(row['total'] or 0),
+                'record_count': int(row['records'] or 0),
+            }
+            for row in rollup.values('scope', 'category').annotate(
+                total=Sum('total_co2e'),
+                records=Sum('record_count')
+            ).order_by('scope', '-total')
+        ]
+        
+        return {
+            'facility_id': str(facility.id),
+            'facility_name': facility.name,
+            'period_from': period_from,
+            'period_to': period_to,
+            'scope': scope,
+            'totals': {key: round(value, 4) if key != 'record_count' else value for key, value in totals.items()},
+            'by_period': by_period,
+            'by_category': by_category,
+        }
+
+    @staticmethod
+    def summary_stamp(organization_id):
+        """
+        (version, last_modified) of an organization's org-wide summaries,
+        for conditional GETs. Every delta moves last_calculated_at and a
+        rebuild changes it or the row count.
+        """
+        stamp = EmissionSummaryMonthly.objects.filter(
+            organization_id=organization_id,
+            facility__isnull=True
+        ).aggregate(
+            count=Count('id'),
+            updated=Max('last_calculated_at')
+        )
+        updated = stamp['updated'].isoformat() if stamp['updated'] else ''
+        return f"{organization_id}:{stamp['count']}:{updated}", stamp['updated']
+
+    @staticmethod
+    def fiscal_summary_stamp(organization_id):
+        """
+        (version, last_modified) of an organization's fiscal summaries, for
+        conditional GETs. Covers fiscal_year_start as well, since moving it
+        re-buckets every fiscal year and quarter.
+        Returns None if the organization doesn't exist.
+        """
+        fiscal_year_start = Organization.objects.filter(
+            id=organization_id
+        ).values_list('fiscal_year_start', flat=True).first()
+        if fiscal_year_start is None:
+            return None
+        stamp = EmissionSummaryFiscal.objects.filter(
+            organization_id=organization_id
+        ).aggregate(
+            count=Count('id'),
+            updated=Max('last_calculated_at')
+        )
+        updated = stamp['updated'].isoformat() if stamp['updated'] else ''
+        version = f"{organization_id}:{fiscal_year_start}:{stamp['count']}:{updated}"
+        return version, stamp['updated']
+
+    @staticmethod
+    def trend_range(period_from=None, period_to=None):
+        """
+        (period_from, period_to) a trend covers. Missing bounds default to
+        the 12 months up to the current one, so the result moves with the
+        calendar even when the data doesn't.
+        """
+        period_to = period_to or format_period(timezone.now())
+        period_from = period_from or shift_period(period_to, -11)
+        return period_from, period_to
+
+    @staticmethod
+    def get_trend(organization, period_from=None, period_to=None, facility=None, rolling_window=3):
+        """
+        Monthly per-scope totals from the summaries for period_from..period_to
+        (default: the 12 months up to the current one), org-wide or for one
+        facility. Months without data are filled with zeros. Each point
+        carries a trailing rolling average of total_co2e and the change
+        against the same month a year earlier.
+        Raises ValueError for invalid periods or windows.
+        """
+        period_from, period_to = AnalyticsService.trend_range(period_from, period_to)
+        periods = period_range(period_from, period_to)
+        if not periods:
+            raise ValueError("period_from must not be after period_to")
+        if len(periods) > TREND_MAX_PERIODS:
+            raise ValueError(f"Trend range is limited to {TREND_MAX_PERIODS} months")
+        if not 1 <= rolling_window <= TREND_MAX_ROLLING_WINDOW:
+            raise ValueError(f"rolling_window must be between 1 and {TREND_MAX_ROLLING_WINDOW}")
+        
+        # Read 12 extra months so YoY and rolling values exist for the first points
+        history_from = shift_period(period_from, -12)
+        queryset = EmissionSummaryMonthly.objects.filter(
+            organization=organization,
+            reporting_period__gte=history_from,
+            reporting_period__lte=period_to
+        )
+        if facility:
+            queryset = queryset.filter(facility_id=facility)
+        else:
+            queryset = queryset.filter(facility__isnull=True)
+        
+        totals = defaultdict(dict)
+        for period, scope, total, count in queryset.values_list(
+            'reporting_period', 'scope', 'total_co2e', 'record_count'
+        ):
+            totals[period][scope] = (float(total), count)
+        
+        def total_for(period):
+            return totals.get(period, {}).get('', (0.0, 0))[0]
+        
+        results = []
+        for period in periods:
+            scopes = totals.get(period, {})
+            total, count = scopes.get('', (0.0, 0))
+            window = [total_for(shift_period(period, -offset)) for offset in range(rolling_window)]
+            previous = total_for(shift_period(period, -12))
+            results.append({
+                'period': period,
+                'total_co2e': total,
+                'scope1': scopes.get('scope1', (0.0, 0))[0],
+                'scope2': scopes.get('scope2', (0.0, 0))[0],
+                'scope3': scopes.get('scope3', (0.0, 0))[0],
+                'record_count': count,
+                'rolling_avg': round(sum(window) / rolling_window, 4),
+                'yoy_change': round(total - previous, 4),
+                'yoy_change_pct': round((total - previous) / previous * 100, 2) if previous else None,
+            })
+        
+        return {
+            'period_from': period_from,
+            'period_to': period_to,
+            'facility': str(facility) if facility else None,
+            'rolling_window': rolling_window,
+            'results': results,
+        }
+
+    @staticmethod
+    def progress_year(year=None):
+        """Year target progress is measured for; defaults to the current one."""
+        return year or timezone.now().year
+
+    @staticmethod
+    def get_target_progress(organization, year=None, target_year=DEFAULT_TARGET_YEAR,
+                            target_reduction_pct=DEFAULT_TARGET_REDUCTION_PCT):
+        """
+        Baseline-year vs year emissions and the gap to a linear reduction
+        trajectory from baseline_year to target_year, in total, per scope
+        and per facility. Reads at most two years of monthly summaries.
+        Results are cached until the organization's summaries change.
+        Raises ValueError for invalid targets.
+        """
+        year = AnalyticsService.progress_year(year)
+        if target_year <= organization.baseline_year:
+            raise ValueError("target_year must be after the baseline year")
+        if not 0 < target_reduction_pct <= 100:
+            raise ValueError("target_reduction_pct must be between 0 and 100")
+        
+        version, _ = AnalyticsService.summary_stamp(organization.id)
+        cache_key = (
+            f"analytics:targets:{version}:{organization.baseline_year}:"
+            f"{year}:{target_year}:{target_reduction_pct}"
+        )
+        data = cache.get(cache_key)
+        if data is None:
+            data = AnalyticsService._target_progress(organization, year, target_year, target_reduction_pct)
+            cache.set(cache_key, data, settings.ANALYTICS_CACHE_SECONDS)
+        return data
+
+    @staticmethod
+    def _target_progress(organization, year, target_year, target_reduction_pct):
+        baseline_year = organization.baseline_year
+        columns_by_year = defaultdict(list)
+        columns_by_year[str(baseline_year)].append('baseline')
+        columns_by_year[str(year)].append('current')
+        
+        totals = defaultdict(lambda: {'baseline': 0.0, 'current': 0.0})
+        facility_names = {}
+        current_periods = set()
+        # Only the two years compared, however far apart they are
+        in_years = Q()
+        for period_year in {baseline_year, year}:
+            in_years |= Q(
+                reporting_period__gte=f"{period_year:04d}-01",
+                reporting_period__lte=f"{period_year:04d}-12"
             )
+        queryset = EmissionSummaryMonthly.objects.filter(in_years, organization=organization)
+        for facility_id, facility_name, period, scope, total in queryset.values_list(
+            'facility_id', 'facility__name', 'reporting_period', 'scope', 'total_co2e'
+        ):
+            columns = columns_by_year.get(period[:4])
+            if not columns:
+                continue
+            if facility_id is not None:
+                facility_names[facility_id] = facility_name
+                if scope != '':
+                    continue
+            elif 'current' in columns and scope == '':
+                current_periods.add(period)
+            for column in columns:
+                totals[(facility_id, scope)][column] += float(total)
+        
+        # Share of the reduction due by `year` on a straight line to the target
+        elapsed = (year - baseline_year) / (target_year - baseline_year)
+        required_pct = target_reduction_pct * min(max(elapsed, 0.0), 1.0)
+        
+        def progress(values):
+            baseline, current = values['baseline'], values['current']
+            trajectory = baseline * (1 - required_pct / 100)
+            return {
+                'baseline_co2e': round(baseline, 4),
+                'current_co2e': round(current, 4),
+                'change': round(current - baseline, 4),
+                'change_pct': round((current - baseline) / baseline * 100, 2) if baseline else None,
+                'trajectory_co2e': round(trajectory, 4),
+                'target_co2e': round(baseline * (1 - target_reduction_pct / 100), 4),
+                'gap_to_trajectory': round(current - trajectory, 4),
+                'on_track': current <= trajectory if baseline else None,
+            }
+        
+        empty = {'baseline': 0.0, 'current': 0.0}
+        return {
+            'organization_id': str(organization.id),
+            'baseline_year': baseline_year,
+            'year': year,
+            'periods_reported': len(current_periods),
+            'target_year': target_year,
+            'target_reduction_pct': target_reduction_pct,
+            'required_reduction_pct': round(required_pct, 2),
+            'total': progress(totals.get((None, ''), empty)),
+            'by_scope': {
+                scope: progress(totals.get((None, scope), empty))
+                for scope in ('scope1', 'scope2', 'scope3')
+            },
+            'by_facility': [
+                {
+                    'facility_id': str(facility_id),
+                    'facility_name': facility_names[facility_id],
+                    **progress(totals[(facility_id, '')]),
+                }
+                for facility_id in sorted(facility_names, key=lambda pk: facility_names[pk])
+            ],
+        }
+
+    @staticmethod
+    def get_organization_stats(organizations, top_facilities=5):
+        """
+        Emission statistics for many organizations at once, keyed by
+        organization id: record count, totals by scope, last activity date,
+        verified share and the top facilities by emissions.
+        Runs four grouped queries however many organizations are passed.
+        """
+        organizations = list(organizations)
+        ids = [organization.id for organization in organizations]
+        stats = {
+            organization.id: {
+                'organization_id': str(organization.id),
+                'name': organization.name,
+                'baseline_year': organization.baseline_year,
+                'is_active': organization.is_active,
+                'facilities_count': 0,
+                'record_count': 0,
+                'total_co2e': 0.0,
+                'scope1': 0.0,
+                'scope2': 0.0,
+                'scope3': 0.0,
+                'last_activity_date': None,
+                'verified_count': 0,
+                'verified_share': None,
+                'top_facilities': [],
+            }
+            for organization in organizations
+        }
+        
+        for row in Facility.objects.filter(organization_id__in=ids).values(
+            'organization_id'
+        ).annotate(count=Count('id')):
+            stats[row['organization_id']]['facilities_count'] = row['count']
+        
+        # Totals and counts come from the org-wide summaries
+        for row in EmissionSummaryMonthly.objects.filter(
+            organization_id__in=ids,
+            facility__isnull=True
+        ).values('organization_id', 'scope').annotate(
+            total=Sum('total_co2e'),
+            records=Sum('record_count')
+        ):
+            entry = stats[row['organization_id']]
+            if row['scope'] == '':
+                entry['total_co2e'] = float(row['total'] or 0)
+                entry['record_count'] = int(row['records'] or 0)
+            elif row['scope'] in ('scope1', 'scope2', 'scope3'):
+                entry[row['scope']] = float(row['total'] or 0)
+        
+        # Summaries don't carry status or dates, so these need the records
+        for row in EmissionRecord.objects.filter(organization_id__in=ids).values(
+            'organization_id'
+        ).annotate(
+            last_activity=Max('activity_date'),
+            verified=Count('id', filter=Q(status='verified')),
+            records=Count('id')
+        ):
+            entry = stats[row['organization_id']]
+            entry['last_activity_date'] = row['last_activity']
+            entry['verified_count'] = row['verified']
+            entry['verified_share'] = round(row['verified'] / row['records'] * 100, 2) if row['records'] else None
+        
+        for row in EmissionSummaryMonthly.objects.filter(
+            organization_id__in=ids,
+            facility__isnull=False,
+            scope=''
+        ).values('organization_id', 'facility_id', 'facility__name').annotate(
+            total=Sum('total_co2e'),
+            records=Sum('record_count')
+        ).order_by('organization_id', '-total'):
+            top = stats[row['organization_id']]['top_facilities']
+            if len(top) < top_facilities:
+                top.append({
+                    'facility_id': str(row['facility_id']),
+                    'name': row['facility__name'],
+                    'total_co2e': float(row['total'] or 0),
+                    'record_count': int(row['records'] or 0),
+                })
+        
+        return stats
+
+    @staticmethod
+    def fiscal_label(fiscal_year, fiscal_quarter=0):
+        return f"FY{fiscal_year}" + (f" Q{fiscal_quarter}" if fiscal_quarter else "")
+
+    @staticmethod
+    def get_fiscal_summary(organization, fiscal_year=None, granularity='year'):
+        """
+        Fiscal year (granularity='year') or quarter ('quarter') totals with
+        per-scope values, read from the fiscal summaries. Each entry carries
+        its first and last reporting period.
+        Raises ValueError for an unknown granularity.
+        """
+        if granularity not in ('year', 'quarter'):
+            raise ValueError("granularity must be 'year' or 'quarter'")
+        
+        queryset = EmissionSummaryFiscal.objects.filter(organization=organization)
+        if granularity == 'year':
+            queryset = queryset.filter(fiscal_quarter=0)
+        else:
+            queryset = queryset.exclude(fiscal_quarter=0)
+        if fiscal_year:
+            queryset = queryset.filter(fiscal_year=fiscal_year)
+        
+        start_month = fiscal_start_month(organization.fiscal_year_start)
+        entries = {}
+        for fiscal_year_value, fiscal_quarter, scope, total, count in queryset.order_by(
+            'fiscal_year', 'fiscal_quarter'
+        ).values_list('fiscal_year', 'fiscal_quarter', 'scope', 'total_co2e', 'record_count'):
+            entry = entries.get((fiscal_year_value, fiscal_quarter))
+            if entry is None:
+                # First month of the fiscal year, then of the quarter
+                first_year = fiscal_year_value if start_month == 1 else fiscal_year_value - 1
+                start = shift_period(f"{first_year:04d}-{start_month:02d}", 3 * max(fiscal_quarter - 1, 0))
+                entry = entries[(fiscal_year_value, fiscal_quarter)] = {
+                    'label': AnalyticsService.fiscal_label(fiscal_year_value, fiscal_quarter),
+                    'fiscal_year': fiscal_year_value,
+                    'fiscal_quarter': fiscal_quarter or None,
+                    'period_from': start,
+                    'period_to': shift_period(start, 2 if fiscal_quarter else 11),
+                    'total_co2e': 0.0,
+                    'scope1': 0.0,
+                    'scope2': 0.0,
+                    'scope3': 0.0,
+                    'record_count': 0,
+                }
+            if scope == '':
+                entry['total_co2e'] = float(total)
+                entry['record_count'] = count
+            elif scope in ('scope1', 'scope2', 'scope3'):
+                entry[scope] = float(total)
+        
+        return {
+            'fiscal_year_start': organization.fiscal_year_start,
+            'granularity': granularity,
+            'results': list(entries.values()),
+        }
 
     @staticmethod
     def get_dashboard_data(organization, period=None):
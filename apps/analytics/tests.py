@@ -0,0 +1,250 @@
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase
+from apps.emissions.services import EmissionService
+from apps.facilities.models import Facility
+from apps.organizations.models import Organization
+
+
+class FiscalSummaryConditionalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_emission_factors', verbosity=0)
+        cls.organization = Organization.objects.create(name='Org')
+        cls.facility = Facility.objects.create(
+            organization=cls.organization, name='Plant', country='IN', grid_region='India'
+        )
+        EmissionService.bulk_create_records([{
+            'facility_id': cls.facility.id,
+            'scope': 'scope1',
+            'category': 'Diesel',
+            'subcategory': 'Stationary',
+            'quantity': Decimal('100'),
+            'unit': 'liter',
+            'activity_date': '2024-02-15',
+        }], cls.organization)
+
+    def test_fiscal_year_start_change_invalidates_etag(self):
+        url = '/api/v1/analytics/fiscal/'
+        params = {'organization': str(self.organization.id)}
+        first = self.client.get(url, params)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()['results'][0]['fiscal_year'], 2024)
+        etag = first['ETag']
+        self.assertEqual(self.client.get(url, params, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        response = self.client.patch(
+            f'/api/v1/organizations/{self.organization.id}/',
+            {'fiscal_year_start': '04-01'},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+
+        second = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second['ETag'], etag)
+        # February 2024 falls in the fiscal year ending March 2024
+        self.assertEqual(second.json()['results'][0]['fiscal_year'], 2024)
+        self.assertEqual(second.json()['results'][0]['period_from'], '2023-04')
+
+
+class TrendConditionalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.organization = Organization.objects.create(name='Org')
+
+    def get_trend(self, today, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        with mock.patch('apps.analytics.services.timezone.now', return_value=today):
+            return self.client.get(
+                '/api/v1/analytics/trend/', {'organization': str(self.organization.id)}, **headers
+            )
+
+    def test_default_window_rollover_invalidates_etag(self):
+        may = datetime(2024, 5, 31, 12, tzinfo=dt_timezone.utc)
+        june = datetime(2024, 6, 1, 12, tzinfo=dt_timezone.utc)
+        first = self.get_trend(may)
+        self.assertEqual(first.status_code, 200)
+        etag = first['ETag']
+        self.assertEqual(self.get_trend(may, etag).status_code, 304)
+
+        rolled = self.get_trend(june, etag)
+        self.assertEqual(rolled.status_code, 200)
+        self.assertEqual(rolled.json()['period_to'], '2024-06')
+
+
+class RollupViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_emission_factors', verbosity=0)
+        cls.organization = Organization.objects.create(name='Org')
+        cls.plant = Facility.objects.create(organization=cls.organization, name='Plant')
+        cls.office = Facility.objects.create(organization=cls.organization, name='Office')
+        EmissionService.bulk_create_records([
+            {
+                'facility_id': facility.id,
+                'scope': 'scope1',
+                'category': 'Diesel',
+                'subcategory': 'Stationary',
+                'quantity': Decimal(quantity),
+                'unit': 'liter',
+                'activity_date': '2024-02-15',
+            }
+            for facility, quantity in ((cls.plant, '100'), (cls.plant, '50'), (cls.office, '10'))
+        ], cls.organization)
+
+    def get_rollup(self, **params):
+        return self.client.get(
+            '/api/v1/analytics/rollup/', {'organization': str(self.organization.id), **params}
+        )
+
+    def test_group_by_facility(self):
+        response = self.get_rollup(group_by='facility,scope')
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([row['facility_name'] for row in results], ['Plant', 'Office'])
+        self.assertEqual([row['record_count'] for row in results], [2, 1])
+        self.assertAlmostEqual(results[0]['total_co2e'], 150 * 2.68787, places=3)
+
+    def test_facility_filter(self):
+        response = self.get_rollup(group_by='category', facility=str(self.office.id))
+        self.assertEqual(response.json()['results'][0]['record_count'], 1)
+
+    def test_invalid_facility_is_rejected(self):
+        response = self.get_rollup(facility='abc')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'Invalid facility id'})
+
+    def test_unknown_dimension_is_rejected(self):
+        self.assertEqual(self.get_rollup(group_by='colour').status_code, 400)
+
+    def test_organization_stats(self):
+        response = self.client.get(f'/api/v1/organizations/{self.organization.id}/stats/')
+        self.assertEqual(response.status_code, 200)
+        stats = response.json()
+        self.assertEqual(stats['facilities_count'], 2)
+        self.assertEqual(stats['record_count'], 3)
+        self.assertAlmostEqual(stats['total_co2e'], 160 * 2.68787, places=3)
+        self.assertEqual(stats['scope1'], stats['total_co2e'])
+        self.assertEqual(stats['last_activity_date'], '2024-02-15')
+        self.assertEqual(stats['verified_share'], 0)
+        self.assertEqual([row['name'] for row in stats['top_facilities']], ['Plant', 'Office'])
+
+        response = self.client.get('/api/v1/organizations/stats/', {'ids': str(self.organization.id)})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['record_count'] for row in response.json()['results']], [3])
+        self.assertEqual(self.client.get('/api/v1/organizations/stats/', {'ids': 'x'}).status_code, 400)
+
+    def test_facility_drilldown(self):
+        url = f'/api/v1/facilities/{self.plant.id}/emissions/'
+        response = self.client.get(url, {'page_size': 1})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['totals']['record_count'], 2)
+        self.assertAlmostEqual(data['totals']['total_co2e'], 150 * 2.68787, places=3)
+        self.assertEqual([row['period'] for row in data['by_period']], ['2024-02'])
+        self.assertEqual([row['category'] for row in data['by_category']], ['Diesel'])
+
+        # The records page is keyset paginated
+        first = data['records']
+        self.assertEqual(len(first['results']), 1)
+        second = self.client.get(first['next']).json()['records']
+        self.assertIsNone(second['next'])
+        self.assertNotEqual(second['results'][0]['id'], first['results'][0]['id'])
+
+        self.assertEqual(self.client.get(url, {'scope': 'scope9'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'period_from': '2024-13'}).status_code, 400)
+        empty = self.client.get(url, {'scope': 'scope2'}).json()
+        self.assertEqual(empty['totals']['record_count'], 0)
+        self.assertEqual(empty['records']['results'], [])
+
+
+class TargetProgressTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_emission_factors', verbosity=0)
+        cls.organization = Organization.objects.create(name='Org', baseline_year=2020)
+        cls.facility = Facility.objects.create(organization=cls.organization, name='Plant')
+        EmissionService.bulk_create_records([
+            {
+                'facility_id': cls.facility.id,
+                'scope': 'scope1',
+                'category': 'Diesel',
+                'subcategory': 'Stationary',
+                'quantity': Decimal(quantity),
+                'unit': 'liter',
+                'activity_date': activity_date,
+            }
+            for activity_date, quantity in (('2020-03-01', '1000'), ('2022-03-01', '5000'), ('2024-03-01', '800'))
+        ], cls.organization)
+
+    def get_targets(self, today, etag=None, **params):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        with mock.patch('apps.analytics.services.timezone.now', return_value=today):
+            return self.client.get(
+                '/api/v1/analytics/targets/',
+                {'organization': str(self.organization.id), **params},
+                **headers
+            )
+
+    def test_compares_only_baseline_and_measured_year(self):
+        data = self.get_targets(datetime(2024, 6, 1, tzinfo=dt_timezone.utc)).json()
+        self.assertEqual(data['year'], 2024)
+        self.assertAlmostEqual(data['total']['baseline_co2e'], 1000 * 2.68787, places=3)
+        self.assertAlmostEqual(data['total']['current_co2e'], 800 * 2.68787, places=3)
+        self.assertEqual(data['periods_reported'], 1)
+
+    def test_new_year_invalidates_defaulted_year_etag(self):
+        december = datetime(2024, 12, 31, 12, tzinfo=dt_timezone.utc)
+        january = datetime(2025, 1, 1, 12, tzinfo=dt_timezone.utc)
+        first = self.get_targets(december)
+        etag = first['ETag']
+        self.assertEqual(self.get_targets(december, etag).status_code, 304)
+
+        rolled = self.get_targets(january, etag)
+        self.assertEqual(rolled.status_code, 200)
+        self.assertEqual(rolled.json()['year'], 2025)
+
+
+class DashboardConditionalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_emission_factors', verbosity=0)
+        cls.organization = Organization.objects.create(name='Org')
+        cls.facility = Facility.objects.create(organization=cls.organization, name='Plant')
+
+    def add_record(self):
+        result = EmissionService.bulk_create_records([{
+            'facility_id': self.facility.id,
+            'scope': 'scope1',
+            'category': 'Diesel',
+            'subcategory': 'Stationary',
+            'quantity': Decimal('100'),
+            'unit': 'liter',
+            'activity_date': '2024-02-15',
+        }], self.organization)
+        self.assertEqual(result.created_count, 1)
+
+    def test_unchanged_summaries_answer_304(self):
+        url = '/api/v1/analytics/dashboard/'
+        params = {'organization': str(self.organization.id)}
+        self.add_record()
+        first = self.client.get(url, params)
+        self.assertEqual(first.status_code, 200)
+        etag = first['ETag']
+        self.assertTrue(first.has_header('Last-Modified'))
+
+        cached = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b'')
+
+        self.add_record()
+        changed = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+
+    def test_invalid_organization_skips_validators(self):
+        response = self.client.get('/api/v1/analytics/dashboard/', {'organization': 'abc'})
+        self.assertFalse(response.has_header('ETag'))
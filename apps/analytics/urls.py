@@ -1,6 +1,10 @@
 from django.urls import path
-from .views import DashboardOverviewView
+from .views import DashboardOverviewView, FiscalSummaryView, RollupView, TargetProgressView, TrendView
 
 urlpatterns = [
     path('dashboard/', DashboardOverviewView.as_view(), name='dashboard-overview'),
+    path('rollup/', RollupView.as_view(), name='emission-rollup'),
+    path('trend/', TrendView.as_view(), name='emission-trend'),
+    path('fiscal/', FiscalSummaryView.as_view(), name='emission-fiscal'),
+    path('targets/', TargetProgressView.as_view(), name='emission-targets'),
 ]
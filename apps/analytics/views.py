@@ -1,14 +1,67 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from .services import AnalyticsService
+import uuid
+from .services import AnalyticsService, DEFAULT_TARGET_REDUCTION_PCT, DEFAULT_TARGET_YEAR
+from apps.core.conditional import conditional
 from apps.organizations.models import Organization
 
 
+def dashboard_validators(view, request, *args, **kwargs):
+    try:
+        org_id = uuid.UUID(request.query_params.get('organization', ''))
+    except ValueError:
+        return None
+    return AnalyticsService.summary_stamp(org_id)
+
+
+def fiscal_validators(view, request, *args, **kwargs):
+    try:
+        org_id = uuid.UUID(request.query_params.get('organization', ''))
+    except ValueError:
+        return None
+    return AnalyticsService.fiscal_summary_stamp(org_id)
+
+
+def trend_validators(view, request, *args, **kwargs):
+    current = dashboard_validators(view, request, *args, **kwargs)
+    if current is None:
+        return None
+    # The default window follows today's date, not just the data
+    version, last_modified = current
+    try:
+        period_from, period_to = AnalyticsService.trend_range(
+            request.query_params.get('period_from'),
+            request.query_params.get('period_to')
+        )
+    except ValueError:
+        return None
+    return f"{version}:{period_from}:{period_to}", last_modified
+
+
+def target_validators(view, request, *args, **kwargs):
+    current = dashboard_validators(view, request, *args, **kwargs)
+    if current is None:
+        return None
+    # Progress also depends on the organization's baseline year and on
+    # the measured year, which defaults to the current one
+    version, last_modified = current
+    baseline_year = Organization.objects.filter(
+        id=request.query_params['organization']
+    ).values_list('baseline_year', flat=True).first()
+    try:
+        year = AnalyticsService.progress_year(int(request.query_params.get('year') or 0))
+    except ValueError:
+        return None
+    return f"{version}:{baseline_year}:{year}", last_modified
+
+
 class DashboardOverviewView(APIView):
     """
     API view to get high-level dashboard data.
+    Supports conditional GET against the organization's summaries.
     """
+    @conditional(dashboard_validators)
     def get(self, request):
         org_id = request.query_params.get('organization')
         period = request.query_params.get('period')
@@ -18,12 +71,157 @@ class DashboardOverviewView(APIView):
             
         try:
             organization = Organization.objects.get(id=org_id)
-            # Ensure summaries are fresh for MVP (Simple trigger)
-            AnalyticsService.calculate_monthly_summary(organization, period)
-            
+            # Summaries are maintained incrementally by EmissionService,
+            # so this is a pure lookup
             data = AnalyticsService.get_dashboard_data(organization, period)
             return Response(data)
         except Organization.DoesNotExist:
             return Response({'error': 'Organization not found'}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class RollupView(APIView):
+    """
+    API view to slice the emission rollup cube.
+    group_by is a comma-separated list of facility, scope, category and
+    reporting_period; facility, scope, category, period, period_from and
+    period_to narrow the slice.
+    """
+    def get(self, request):
+        org_id = request.query_params.get('organization')
+        
+        if not org_id:
+            return Response({'error': 'Organization ID required'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        group_by = [
+            dim.strip()
+            for dim in request.query_params.get('group_by', 'scope').split(',')
+            if dim.strip()
+        ]
+        filters = {
+            param: request.query_params.get(param)
+            for param in ('facility', 'scope', 'category', 'period', 'period_from', 'period_to')
+        }
+        try:
+            filters['facility'] = uuid.UUID(filters['facility']) if filters['facility'] else None
+        except ValueError:
+            return Response({'error': 'Invalid facility id'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            organization = Organization.objects.get(id=org_id)
+            results = AnalyticsService.get_rollup(organization, group_by, filters)
+            return Response({'group_by': group_by, 'results': results})
+        except Organization.DoesNotExist:
+            return Response({'error': 'Organization not found'}, status=status.HTTP_404_NOT_FOUND)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class TrendView(APIView):
+    """
+    API view for the monthly emissions time series.
+    Accepts period_from, period_to (YYYY-MM), facility and rolling_window.
+    """
+    @conditional(trend_validators)
+    def get(self, request):
+        org_id = request.query_params.get('organization')
+        
+        if not org_id:
+            return Response({'error': 'Organization ID required'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        facility = request.query_params.get('facility')
+        try:
+            facility = uuid.UUID(facility) if facility else None
+        except ValueError:
+            return Response({'error': 'Invalid facility id'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            rolling_window = int(request.query_params.get('rolling_window', 3))
+        except ValueError:
+            return Response({'error': 'rolling_window must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            organization = Organization.objects.get(id=org_id)
+            data = AnalyticsService.get_trend(
+                organization,
+                period_from=request.query_params.get('period_from'),
+                period_to=request.query_params.get('period_to'),
+                facility=facility,
+                rolling_window=rolling_window
+            )
+            return Response(data)
+        except Organization.DoesNotExist:
+            return Response({'error': 'Organization not found'}, status=status.HTTP_404_NOT_FOUND)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class FiscalSummaryView(APIView):
+    """
+    API view for fiscal year and quarter totals.
+    Accepts fiscal_year and granularity=year|quarter.
+    """
+    @conditional(fiscal_validators)
+    def get(self, request):
+        org_id = request.query_params.get('organization')
+        
+        if not org_id:
+            return Response({'error': 'Organization ID required'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            fiscal_year = request.query_params.get('fiscal_year')
+            fiscal_year = int(fiscal_year) if fiscal_year else None
+        except ValueError:
+            return Response({'error': 'fiscal_year must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            organization = Organization.objects.get(id=org_id)
+            data = AnalyticsService.get_fiscal_summary(
+                organization,
+                fiscal_year=fiscal_year,
+                granularity=request.query_params.get('granularity', 'year')
+            )
+            return Response(data)
+        except Organization.DoesNotExist:
+            return Response({'error': 'Organization not found'}, status=status.HTTP_404_NOT_FOUND)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class TargetProgressView(APIView):
+    """
+    API view comparing emissions against the baseline year and a linear
+    reduction trajectory. Accepts year, target_year and
+    target_reduction_pct.
+    """
+    @conditional(target_validators)
+    def get(self, request):
+        org_id = request.query_params.get('organization')
+        
+        if not org_id:
+            return Response({'error': 'Organization ID required'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        params = request.query_params
+        try:
+            year = int(params['year']) if params.get('year') else None
+            target_year = int(params.get('target_year') or DEFAULT_TARGET_YEAR)
+            target_reduction_pct = float(params.get('target_reduction_pct') or DEFAULT_TARGET_REDUCTION_PCT)
+        except ValueError:
+            return Response(
+                {'error': 'year and target_year must be integers, target_reduction_pct a number'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            organization = Organization.objects.get(id=org_id)
+            data = AnalyticsService.get_target_progress(
+                organization,
+                year=year,
+                target_year=target_year,
+                target_reduction_pct=target_reduction_pct
+            )
+            return Response(data)
+        except Organization.DoesNotExist:
+            return Response({'error': 'Organization not found'}, status=status.HTTP_404_NOT_FOUND)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,46 @@
+"""
+Conditional GET support (ETag / Last-Modified) for API views.
+"""
+
+import hashlib
+from functools import wraps
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def conditional(validators):
+    """
+    Decorator for DRF view methods answering GET/HEAD with 304 Not Modified
+    when the client's If-None-Match / If-Modified-Since still match.
+
+    validators(view, request, *args, **kwargs) returns (version, last_modified):
+    a string that changes whenever the payload would, and the datetime of
+    the newest underlying change (or None). It should be much cheaper than
+    building the payload; returning None skips the check.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return method(self, request, *args, **kwargs)
+
+            current = validators(self, request, *args, **kwargs)
+            if current is None:
+                return method(self, request, *args, **kwargs)
+
+            version, last_modified = current
+            # The same URL can render as JSON or the browsable API
+            token = f"{version}|{request.get_full_path()}|{request.META.get('HTTP_ACCEPT', '')}"
+            etag = quote_etag(hashlib.md5(token.encode('utf-8')).hexdigest())
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = method(self, request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                response['ETag'] = etag
+                if timestamp is not None:
+                    response['Last-Modified'] = http_date(timestamp)
+            return response
+        return wrapper
+    return decorator
@@ -54,6 +54,14 @@ UNIT_CHOICES = [
     ('unit', 'Unit'),
 ]
 
+# Emission factor library region for a facility's ISO country code.
+# Codes not listed here are looked up as-is.
+COUNTRY_REGIONS = {
+    'IN': 'India',
+    'US': 'US',
+    'GB': 'UK',
+}
+
 # Facility Types
 FACILITY_TYPE_CHOICES = [
     ('office', 'Office'),
@@ -0,0 +1,41 @@
+"""
+Fast JSON rendering for API responses.
+"""
+
+from decimal import Decimal
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stock renderer
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson when it is installed.
+
+    Output matches DRF's renderer for the types serializers produce:
+    Decimals become strings, datetimes are ISO 8601 with 'Z' for UTC, and
+    anything else orjson can't encode goes through DRF's JSONEncoder.
+    Browsable-API indentation requests are left to the stock renderer.
+    """
+    _fallback_encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        return orjson.dumps(
+            data,
+            default=self._default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        )
+
+    @classmethod
+    def _default(cls, obj):
+        if isinstance(obj, Decimal):
+            return str(obj)
+        return cls._fallback_encoder.default(obj)
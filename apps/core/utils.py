@@ -2,8 +2,10 @@
 Utility functions used across the application.
 """
 
-from decimal import Decimal
+from collections import deque
+from decimal import Context, Decimal
 from datetime import datetime
+import numpy as np
 
 
 def format_period(date):
@@ -21,6 +23,99 @@ def format_period(date):
     return date.strftime('%Y-%m')
 
 
+def parse_period(period):
+    """
+    Parse a YYYY-MM reporting period.
+    
+    Args:
+        period: Period string (e.g., '2024-01')
+    
+    Returns:
+        tuple: (year, month)
+    
+    Raises:
+        ValueError: If the period is not a valid YYYY-MM string
+    """
+    try:
+        parsed = datetime.strptime(period, '%Y-%m')
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid period: {period!r} (expected YYYY-MM)")
+    return parsed.year, parsed.month
+
+
+def shift_period(period, months):
+    """
+    Move a YYYY-MM period by a number of months.
+    
+    Args:
+        period: Period string (e.g., '2024-01')
+        months: Months to add (negative to go back)
+    
+    Returns:
+        str: Shifted period (e.g., shift_period('2024-01', -1) == '2023-12')
+    """
+    year, month = parse_period(period)
+    index = year * 12 + (month - 1) + months
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def fiscal_start_month(fiscal_year_start):
+    """
+    Month a fiscal year starts in.
+    
+    Args:
+        fiscal_year_start: Organization.fiscal_year_start (MM-DD format)
+    
+    Returns:
+        int: Month number 1-12. Summaries are monthly, so the day is ignored.
+    
+    Raises:
+        ValueError: If the value is not a valid MM-DD string
+    """
+    try:
+        parsed = datetime.strptime(f"2000-{fiscal_year_start}", '%Y-%m-%d')
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid fiscal year start: {fiscal_year_start!r} (expected MM-DD)")
+    return parsed.month
+
+
+def fiscal_period(period, start_month):
+    """
+    Fiscal year and quarter of a YYYY-MM period.
+    
+    Args:
+        period: Period string (e.g., '2024-05')
+        start_month: First month of the fiscal year (1-12)
+    
+    Returns:
+        tuple: (fiscal_year, fiscal_quarter). Fiscal years are labelled by
+        the calendar year they end in, so with an April start 2024-05 is
+        (2025, 1).
+    """
+    year, month = parse_period(period)
+    start_year = year if month >= start_month else year - 1
+    fiscal_year = start_year if start_month == 1 else start_year + 1
+    quarter = (month - start_month) % 12 // 3 + 1
+    return fiscal_year, quarter
+
+
+def period_range(start, end):
+    """
+    List every YYYY-MM period from start to end inclusive.
+    
+    Args:
+        start: First period
+        end: Last period
+    
+    Returns:
+        list: Periods in order; empty if end is before start
+    """
+    start_year, start_month = parse_period(start)
+    end_year, end_month = parse_period(end)
+    count = (end_year * 12 + end_month) - (start_year * 12 + start_month) + 1
+    return [shift_period(start, offset) for offset in range(max(count, 0))]
+
+
 def format_number(value, decimals=2):
     """
     Format number with thousand separators.
@@ -37,68 +132,192 @@ def format_number(value, decimals=2):
     return f"{value:,.{decimals}f}"
 
 
+class UnitRegistry:
+    """
+    Units grouped by physical dimension, with aliases and conversion
+    factors between every pair of units in the same dimension.
+    
+    Only direct relations are declared (e.g. MWh -> kWh, kWh -> MJ,
+    GJ -> MJ); the closure over that graph is computed once, on first
+    use, so multi-hop conversions such as MWh -> GJ are plain dict
+    lookups afterwards. Factors are Decimals; reciprocals and chained
+    products are kept to CONVERSION_PRECISION significant digits.
+    """
+    CONVERSION_PRECISION = 16
+
+    def __init__(self):
+        self._dimensions = {}
+        self._aliases = {}
+        self._relations = {}
+        self._factors = None
+
+    def define(self, unit, dimension, aliases=()):
+        """Register a unit, its dimension and alternative spellings."""
+        self._dimensions[unit] = dimension
+        for name in (unit, *aliases):
+            self._aliases[name.strip().lower()] = unit
+        self._factors = None
+
+    def relate(self, from_unit, to_unit, factor):
+        """Declare 1 from_unit == factor to_unit. Both must be defined."""
+        from_unit, to_unit = self.canonical(from_unit), self.canonical(to_unit)
+        if self._dimensions[from_unit] != self._dimensions[to_unit]:
+            raise ValueError(f"{from_unit} and {to_unit} have different dimensions")
+        self._relations.setdefault(from_unit, {})[to_unit] = Decimal(factor)
+        self._factors = None
+
+    def canonical(self, unit):
+        """
+        Canonical name of a unit or alias (case-insensitive).
+        
+        Raises:
+            ValueError: If the unit is unknown
+        """
+        try:
+            return self._aliases[str(unit).strip().lower()]
+        except KeyError:
+            raise ValueError(f"Unknown unit: {unit!r}")
+
+    def dimension(self, unit):
+        return self._dimensions[self.canonical(unit)]
+
+    def factor(self, from_unit, to_unit):
+        """
+        Multiplier converting a quantity in from_unit to to_unit.
+        
+        Raises:
+            ValueError: If either unit is unknown or the dimensions differ
+        """
+        from_unit, to_unit = self.canonical(from_unit), self.canonical(to_unit)
+        try:
+            return self._closure()[(from_unit, to_unit)]
+        except KeyError:
+            raise ValueError(
+                f"Cannot convert {from_unit} ({self._dimensions[from_unit]}) "
+                f"to {to_unit} ({self._dimensions[to_unit]})"
+            )
+
+    def convert(self, quantity, from_unit, to_unit):
+        """Convert one quantity; returns a Decimal."""
+        return Decimal(str(quantity)) * self.factor(from_unit, to_unit)
+
+    def factor_table(self, from_units, to_units):
+        """
+        Batch form of factor() for whole columns.
+        
+        Args:
+            from_units: Sequence of source units, one per row
+            to_units: Sequence of target units, or a single unit for all rows
+        
+        Returns:
+            tuple: (codes, factors) where codes is an int array indexing
+            into the list of Decimal factors, one per distinct unit pair.
+            Each distinct pair is resolved once.
+        
+        Raises:
+            ValueError: On the first unknown or incompatible pair
+        """
+        if isinstance(to_units, str):
+            to_units = [to_units] * len(from_units)
+        if len(from_units) != len(to_units):
+            raise ValueError("from_units and to_units must have the same length")
+        
+        pairs = {}
+        codes = np.fromiter(
+            (pairs.setdefault(pair, len(pairs)) for pair in zip(from_units, to_units)),
+            dtype=np.intp,
+            count=len(from_units)
+        )
+        return codes, [self.factor(from_unit, to_unit) for from_unit, to_unit in pairs]
+
+    def convert_many(self, quantities, from_units, to_units):
+        """
+        Convert a column of quantities; returns a float64 array.
+        to_units may be a single unit for the whole column.
+        """
+        codes, factors = self.factor_table(from_units, to_units)
+        table = np.array([float(factor) for factor in factors], dtype=np.float64)
+        return np.asarray(quantities, dtype=np.float64) * table[codes]
+
+    def _closure(self):
+        if self._factors is None:
+            context = Context(prec=self.CONVERSION_PRECISION)
+            edges = {unit: {} for unit in self._dimensions}
+            for from_unit, targets in self._relations.items():
+                for to_unit, factor in targets.items():
+                    edges[from_unit][to_unit] = factor
+                    edges[to_unit].setdefault(from_unit, context.divide(1, factor))
+            
+            # Breadth-first from every unit, multiplying factors along the path
+            factors = {}
+            for source in self._dimensions:
+                reached = {source: Decimal(1)}
+                queue = deque([source])
+                while queue:
+                    unit = queue.popleft()
+                    for neighbour, factor in edges[unit].items():
+                        if neighbour not in reached:
+                            reached[neighbour] = context.multiply(reached[unit], factor)
+                            queue.append(neighbour)
+                for target, factor in reached.items():
+                    factor = factor.normalize()
+                    if factor.as_tuple().exponent > 0:
+                        factor = factor.quantize(Decimal(1))
+                    factors[(source, target)] = factor
+            self._factors = factors
+        return self._factors
+
+
+def _default_units():
+    registry = UnitRegistry()
+    
+    registry.define('kWh', 'energy', ['kilowatt-hour', 'kilowatt hour', 'kilowatt-hours'])
+    registry.define('MWh', 'energy', ['megawatt-hour', 'megawatt hour', 'megawatt-hours'])
+    registry.define('MJ', 'energy', ['megajoule', 'megajoules'])
+    registry.define('GJ', 'energy', ['gigajoule', 'gigajoules'])
+    registry.relate('MWh', 'kWh', '1000')
+    registry.relate('kWh', 'MJ', '3.6')
+    registry.relate('GJ', 'MJ', '1000')
+    
+    registry.define('liter', 'volume', ['l', 'liters', 'litre', 'litres'])
+    registry.define('m3', 'volume', ['m³', 'cubic meter', 'cubic meters', 'cubic metre', 'cubic metres'])
+    registry.define('gallon', 'volume', ['gal', 'gallons', 'us gallon', 'us gallons'])
+    registry.relate('m3', 'liter', '1000')
+    registry.relate('gallon', 'liter', '3.785411784')
+    
+    registry.define('kg', 'mass', ['kilogram', 'kilograms', 'kgs'])
+    registry.define('tonne', 'mass', ['t', 'tonnes', 'metric ton', 'metric tons'])
+    registry.define('lb', 'mass', ['lbs', 'pound', 'pounds'])
+    registry.define('g', 'mass', ['gram', 'grams'])
+    registry.relate('tonne', 'kg', '1000')
+    registry.relate('lb', 'kg', '0.45359237')
+    registry.relate('kg', 'g', '1000')
+    
+    registry.define('km', 'distance', ['kilometer', 'kilometers', 'kilometre', 'kilometres'])
+    registry.define('mile', 'distance', ['mi', 'miles'])
+    registry.relate('mile', 'km', '1.609344')
+    
+    registry.define('unit', 'count', ['units', 'each', 'pcs'])
+    return registry
+
+
+# Shared registry of the units emission records and factors use
+UNITS = _default_units()
+
+
 def convert_units(quantity, from_unit, to_unit):
     """
-    Convert between units (basic implementation).
-    TODO: Expand with more unit conversions.
+    Convert a quantity between units of the same dimension.
     
     Args:
         quantity: Amount to convert
-        from_unit: Source unit
-        to_unit: Target unit
+        from_unit: Source unit or alias (e.g., 'liters')
+        to_unit: Target unit or alias
     
     Returns:
         Decimal: Converted quantity
+    
+    Raises:
+        ValueError: If a unit is unknown or the dimensions differ
     """
-    quantity = Decimal(str(quantity))
-    
-    # Energy conversions
-    energy_conversions = {
-        ('kWh', 'MWh'): Decimal('0.001'),
-        ('MWh', 'kWh'): Decimal('1000'),
-        ('kWh', 'GJ'): Decimal('0.0036'),
-        ('GJ', 'kWh'): Decimal('277.778'),
-    }
-    
-    # Volume conversions
-    volume_conversions = {
-        ('liter', 'm3'): Decimal('0.001'),
-        ('m3', 'liter'): Decimal('1000'),
-        ('gallon', 'liter'): Decimal('3.78541'),
-        ('liter', 'gallon'): Decimal('0.264172'),
-    }
-    
-    # Mass conversions
-    mass_conversions = {
-        ('kg', 'tonne'): Decimal('0.001'),
-        ('tonne', 'kg'): Decimal('1000'),
-        ('lb', 'kg'): Decimal('0.453592'),
-        ('kg', 'lb'): Decimal('2.20462'),
-    }
-    
-    # Distance conversions
-    distance_conversions = {
-        ('km', 'mile'): Decimal('0.621371'),
-        ('mile', 'km'): Decimal('1.60934'),
-    }
-    
-    # Combine all conversions
-    all_conversions = {
-        **energy_conversions,
-        **volume_conversions,
-        **mass_conversions,
-        **distance_conversions,
-    }
-    
-    # If same unit, no conversion needed
-    if from_unit == to_unit:
-        return quantity
-    
-    # Look up conversion factor
-    conversion_key = (from_unit, to_unit)
-    if conversion_key in all_conversions:
-        return quantity * all_conversions[conversion_key]
-    
-    # If conversion not found, return original
-    # In production, should raise an exception
-    return quantity
+    return UNITS.convert(quantity, from_unit, to_unit)
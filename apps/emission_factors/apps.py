@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class EmissionFactorsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.emission_factors'
+
+    def ready(self):
+        from django.db.models.signals import post_save, post_delete
+        from .models import EmissionFactor
+        from .services import EmissionFactorCache
+
+        # Library writes in this process drop the cached snapshot at once;
+        # other processes pick them up from the version stamp
+        post_save.connect(EmissionFactorCache.invalidate, sender=EmissionFactor,
+                          dispatch_uid='emission_factor_cache_save')
+        post_delete.connect(EmissionFactorCache.invalidate, sender=EmissionFactor,
+                            dispatch_uid='emission_factor_cache_delete')
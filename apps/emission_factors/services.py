@@ -0,0 +1,192 @@
+"""
+Process-local cache of the emission factor library.
+
+The library is small and rarely changes, so each process keeps a full
+snapshot in memory and resolves factors without touching the database.
+A version stamp (row count + latest updated_at) detects writes made by
+other processes; writes in this process invalidate the snapshot
+immediately through model signals.
+
+Each snapshot also carries a resolution index used to pick a factor for
+an activity from its scope, category, subcategory, facility region and
+activity year, so resolving a large import costs dictionary lookups only.
+"""
+
+import bisect
+import threading
+import time
+from collections import defaultdict
+from django.conf import settings
+from django.db.models import Count, Max
+from apps.core.constants import COUNTRY_REGIONS
+from .models import EmissionFactor
+
+
+class FactorLibrary:
+    """
+    Immutable snapshot of the factor library at one version.
+    """
+    def __init__(self, version, factors):
+        self.version = version
+        self.factors = factors
+        self.by_id = {factor.id: factor for factor in factors}
+        self._serialized = None
+        self._serialized_lock = threading.Lock()
+        self._build_resolution_index()
+
+    def _build_resolution_index(self):
+        """
+        Indexes factors as {(scope, category, subcategory): {region: ([years], [[factors]])}}
+        with years sorted ascending. Rows without a subcategory resolve
+        against every factor of the category, indexed under subcategory None.
+        Categories, subcategories and regions are compared case-insensitively.
+        """
+        grouped = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+        for factor in self.factors:
+            region = factor.region.casefold()
+            category = factor.category.casefold()
+            for subcategory in (factor.subcategory.casefold(), None):
+                grouped[(factor.scope, category, subcategory)][region][factor.valid_year].append(factor)
+
+        self.resolution_index = {
+            key: {
+                region: (sorted(by_year), [by_year[year] for year in sorted(by_year)])
+                for region, by_year in regions.items()
+            }
+            for key, regions in grouped.items()
+        }
+
+    def resolve(self, scope, category, subcategory, regions, year):
+        """
+        Picks the best factor for an activity. Regions are tried in order
+        (most specific first); within the first region that has a factor,
+        the valid_year nearest to year wins, the earlier year on a tie.
+        Raises ValueError if nothing matches or the match is ambiguous.
+        """
+        by_region = self.resolution_index.get(
+            (scope, category.casefold(), subcategory.casefold() if subcategory else None)
+        )
+        if by_region is not None:
+            for region in regions:
+                entry = by_region.get(region.casefold())
+                if entry is None:
+                    continue
+                years, candidates = entry
+                factors = candidates[EmissionFactorCache.nearest_index(years, year)]
+                if len(factors) > 1:
+                    raise ValueError(
+                        f"Several emission factors match {category} in {region}; "
+                        f"specify a subcategory"
+                    )
+                return factors[0]
+
+        label = f"{category} / {subcategory}" if subcategory else category
+        raise ValueError(f"No emission factor found for {scope} {label} in {', '.join(regions)}")
+
+    def serialized(self):
+        """The library as API data, serialized once per version."""
+        if self._serialized is None:
+            from .serializers import EmissionFactorSerializer
+            with self._serialized_lock:
+                if self._serialized is None:
+                    self._serialized = EmissionFactorSerializer(self.factors, many=True).data
+        return self._serialized
+
+
+class EmissionFactorCache:
+    """
+    Resolves emission factors from an in-memory snapshot of the library.
+    """
+    _library = None
+    _checked_at = 0.0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def nearest_index(years, year):
+        """Index of the year nearest to year in a sorted list; earlier wins ties."""
+        position = bisect.bisect_left(years, year)
+        if position == len(years):
+            return position - 1
+        if position == 0 or years[position] == year:
+            return position
+        return position - 1 if year - years[position - 1] <= years[position] - year else position
+
+    @staticmethod
+    def region_chain(grid_region='', country=''):
+        """
+        Regions to try for a facility, most specific first:
+        grid region, then country, then Global. Countries are ISO codes
+        and are mapped to the library's region names (IN -> India).
+        """
+        if country:
+            country = COUNTRY_REGIONS.get(country.upper(), country)
+        chain = []
+        for region in (grid_region, country, 'Global'):
+            if region and region.casefold() not in {r.casefold() for r in chain}:
+                chain.append(region)
+        return chain
+
+    @staticmethod
+    def current_stamp():
+        """
+        (version, last_modified) of the library in the database. Counting
+        all rows (including soft-deleted) catches hard deletes; soft
+        deletes and edits move updated_at.
+        """
+        stamp = EmissionFactor.all_objects.aggregate(
+            count=Count('id'),
+            updated=Max('updated_at')
+        )
+        updated = stamp['updated'].isoformat() if stamp['updated'] else ''
+        return f"{stamp['count']}:{updated}", stamp['updated']
+
+    @staticmethod
+    def current_version():
+        """Version stamp of the library in the database."""
+        return EmissionFactorCache.current_stamp()[0]
+
+    @classmethod
+    def library(cls):
+        """
+        Returns the current snapshot, reloading it when the version stamp
+        has moved. The stamp is checked at most once per
+        EMISSION_FACTOR_CACHE_CHECK_SECONDS.
+        """
+        library = cls._library
+        if library is not None and time.monotonic() - cls._checked_at < settings.EMISSION_FACTOR_CACHE_CHECK_SECONDS:
+            return library
+
+        with cls._lock:
+            library = cls._library
+            if library is not None and time.monotonic() - cls._checked_at < settings.EMISSION_FACTOR_CACHE_CHECK_SECONDS:
+                return library
+
+            version = cls.current_version()
+            if library is None or library.version != version:
+                factors = list(EmissionFactor.objects.all())
+                library = FactorLibrary(version, factors)
+                cls._library = library
+            cls._checked_at = time.monotonic()
+            return library
+
+    @classmethod
+    def get(cls, factor_id):
+        """Returns the factor with this id, or None."""
+        return cls.library().by_id.get(factor_id)
+
+    @classmethod
+    def resolve(cls, scope, category, subcategory, regions, year):
+        """
+        Resolves the best factor for an activity; see FactorLibrary.resolve.
+        """
+        return cls.library().resolve(scope, category, subcategory, regions, year)
+
+    @classmethod
+    def invalidate(cls, **kwargs):
+        """
+        Drops the snapshot so the next lookup reloads it.
+        Accepts signal arguments so it can be connected directly.
+        """
+        with cls._lock:
+            cls._library = None
+            cls._checked_at = 0.0
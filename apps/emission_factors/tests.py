@@ -0,0 +1,54 @@
+from datetime import date
+from decimal import Decimal
+from django.core.management import call_command
+from django.test import TestCase
+from apps.emissions.services import EmissionService
+from apps.facilities.models import Facility
+from apps.organizations.models import Organization
+from .services import EmissionFactorCache
+
+
+class RegionResolutionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_emission_factors', verbosity=0)
+        cls.organization = Organization.objects.create(name='Org')
+
+    def setUp(self):
+        EmissionFactorCache.invalidate()
+
+    def test_region_chain_maps_iso_country_codes(self):
+        self.assertEqual(
+            EmissionFactorCache.region_chain('India-Northern', 'IN'),
+            ['India-Northern', 'India', 'Global']
+        )
+        self.assertEqual(EmissionFactorCache.region_chain('', 'gb'), ['UK', 'Global'])
+        self.assertEqual(EmissionFactorCache.region_chain('', 'DE'), ['DE', 'Global'])
+
+    def test_unknown_grid_region_falls_back_to_country_factor(self):
+        facility = Facility.objects.create(
+            organization=self.organization, name='Plant', country='IN', grid_region='India-Northern'
+        )
+        result = EmissionService.bulk_create_records([{
+            'facility_id': facility.id,
+            'scope': 'scope2',
+            'category': 'Electricity',
+            'quantity': Decimal('1000'),
+            'unit': 'kWh',
+            'activity_date': date(2024, 5, 1),
+        }], self.organization)
+
+        self.assertEqual(result.errors, [])
+        record = result.records[0]
+        self.assertEqual(record.emission_factor.region, 'India')
+        self.assertEqual(record.co2e_calculated, Decimal('712.0000'))
+
+    def test_category_and_subcategory_match_case_insensitively(self):
+        factor = EmissionFactorCache.resolve('scope1', 'diesel', 'STATIONARY', ['Global'], 2024)
+        self.assertEqual((factor.category, factor.subcategory), ('Diesel', 'Stationary'))
+
+        factor = EmissionFactorCache.resolve('scope2', 'electricity', '', ['india'], 2024)
+        self.assertEqual(factor.region, 'India')
+
+        with self.assertRaisesMessage(ValueError, 'No emission factor found'):
+            EmissionFactorCache.resolve('scope1', 'dieselx', '', ['Global'], 2024)
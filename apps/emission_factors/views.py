@@ -1,7 +1,15 @@
 from rest_framework import viewsets, filters
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import EmissionFactor
 from .serializers import EmissionFactorSerializer
+from .services import EmissionFactorCache
+from apps.core.conditional import conditional
+
+
+def library_validators(view, request, *args, **kwargs):
+    return EmissionFactorCache.current_stamp()
 
 
 class EmissionFactorViewSet(viewsets.ReadOnlyModelViewSet):
@@ -15,3 +23,25 @@ class EmissionFactorViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ['scope', 'category', 'region']
     search_fields = ['category', 'subcategory', 'region', 'source']
     ordering_fields = ['category', 'valid_year', 'scope']
+
+    @conditional(library_validators)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional(library_validators)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(detail=False, methods=['get'])
+    @conditional(library_validators)
+    def library(self, request):
+        """
+        The whole factor library in one unpaginated response, served from
+        the in-memory cache. The version changes whenever the library does.
+        """
+        library = EmissionFactorCache.library()
+        return Response({
+            'version': library.version,
+            'count': len(library.factors),
+            'results': library.serialized(),
+        })
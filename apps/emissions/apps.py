@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class EmissionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.emissions'
+
+    def ready(self):
+        from importlib import import_module
+        from django.conf import settings
+
+        # Plugin modules register extra calculators with CalculatorFactory on import
+        for module in settings.EMISSION_CALCULATOR_PLUGINS:
+            import_module(module)
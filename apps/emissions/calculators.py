@@ -1,5 +1,21 @@
 from abc import ABC, abstractmethod
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_EVEN
+from functools import lru_cache
+import re
+import numpy as np
+import pandas as pd
+from apps.core.utils import UNITS
+
+
+# Fixed-point precision of the columns involved in a calculation
+QUANTITY_DECIMAL_PLACES = 4
+FACTOR_DECIMAL_PLACES = 6
+CO2E_DECIMAL_PLACES = 4
+
+# Distinct category strings CalculatorFactory keeps resolved routes for
+ROUTE_CACHE_SIZE = 4096
+# Distinct (from_unit, to_unit) spellings it keeps conversion factors for
+CONVERSION_CACHE_SIZE = 1024
 
 
 class BaseCalculator(ABC):
@@ -10,6 +26,13 @@ class BaseCalculator(ABC):
     def calculate(self, quantity, emission_factor, **kwargs):
         pass
 
+    def multiplier(self, **kwargs):
+        """
+        Constant applied on top of Quantity * Emission Factor.
+        Used by VectorizedCalculator to route whole columns.
+        """
+        return Decimal('1')
+
     def validate_inputs(self, quantity, unit):
         if quantity < 0:
             raise ValueError("Quantity cannot be negative")
@@ -43,20 +66,305 @@ class RadiativeForcingCalculator(BaseCalculator):
     to account for high-altitude climate impacts.
     """
     def calculate(self, quantity, emission_factor, **kwargs):
+        return Decimal(str(quantity)) * Decimal(str(emission_factor)) * self.multiplier(**kwargs)
+
+    def multiplier(self, **kwargs):
         use_rf = kwargs.get('use_rf', True)
-        rf_multiplier = Decimal('1.9') if use_rf else Decimal('1.0')
-        return Decimal(str(quantity)) * Decimal(str(emission_factor)) * rf_multiplier
+        return Decimal('1.9') if use_rf else Decimal('1.0')
 
 
 class CalculatorFactory:
     """
-    Factory to return appropriate calculator based on activity type.
+    Routes activities to calculators.
+
+    Calculators are registered once as named singletons. A category is
+    matched, after normalizing case and whitespace, against exact category
+    routes first, then keyword rules in registration order, falling back
+    to the default calculator. Resolved category strings are memoized in
+    a bounded LRU (ROUTE_CACHE_SIZE entries), so per-row dispatch is a
+    single cache lookup and arbitrary upload categories can't grow it.
+    Emission factors can be pinned to a calculator by id, overriding
+    their category.
+
+    New methods (e.g. spend-based) plug in with register(), typically
+    from a module listed in settings.EMISSION_CALCULATOR_PLUGINS.
+    """
+    default = 'standard'
+    _calculators = {}
+    _categories = {}
+    _rules = []
+    _factors = {}
+
+    @classmethod
+    def register(cls, name, calculator, categories=(), keywords=()):
+        """
+        Adds or replaces the calculator called name.
+
+        Args:
+            name: Route name (e.g., 'spend_based')
+            calculator: BaseCalculator instance, shared by every row routed to it
+            categories: Category names routed to it exactly
+            keywords: Substrings that route a category to it
+        """
+        cls._calculators[name] = calculator
+        for category in categories:
+            cls._categories[cls.normalize(category)] = name
+        if keywords:
+            pattern = re.compile('|'.join(re.escape(cls.normalize(keyword)) for keyword in keywords))
+            cls._rules = [rule for rule in cls._rules if rule[1] != name] + [(pattern, name)]
+        cls._routed_calculator.cache_clear()
+        return calculator
+
+    @classmethod
+    def route_factor(cls, factor_id, name):
+        """Sends records using this emission factor to the named calculator."""
+        if name not in cls._calculators:
+            raise ValueError(f"Unknown calculator: {name}")
+        cls._factors[factor_id] = name
+
+    @staticmethod
+    def normalize(category):
+        return ' '.join(str(category).casefold().split())
+
+    @classmethod
+    def get_calculator(cls, category, factor_id=None):
+        if factor_id is not None and factor_id in cls._factors:
+            return cls._calculators[cls._factors[factor_id]]
+        return cls._routed_calculator(category)
+
+    @staticmethod
+    @lru_cache(maxsize=ROUTE_CACHE_SIZE)
+    def _routed_calculator(category):
+        return CalculatorFactory._calculators[CalculatorFactory.route(category)]
+
+    @classmethod
+    def route(cls, category):
+        """Name of the calculator a category resolves to."""
+        normalized = cls.normalize(category)
+        name = cls._categories.get(normalized)
+        if name is not None:
+            return name
+        for pattern, name in cls._rules:
+            if pattern.search(normalized):
+                return name
+        return cls.default
+
+    @classmethod
+    def has_factor_routes(cls):
+        return bool(cls._factors)
+
+    @staticmethod
+    @lru_cache(maxsize=CONVERSION_CACHE_SIZE)
+    def conversion_factor(from_unit, to_unit):
+        """
+        Multiplier taking a quantity in from_unit (the record's unit) to
+        to_unit (the emission factor's unit), memoized per pair in a bounded
+        LRU since units come straight from uploads. Without a
+        factor unit, or with identical spellings, the quantity is used as is.
+        Raises ValueError for unknown units or mismatched dimensions.
+        """
+        if not to_unit or from_unit == to_unit:
+            return Decimal('1')
+        return UNITS.factor(from_unit, to_unit)
+
+
+CalculatorFactory.register('standard', StandardCalculator())
+CalculatorFactory.register('fugitive', FugitiveCalculator(), keywords=['refrigerant', 'fugitive'])
+CalculatorFactory.register('radiative_forcing', RadiativeForcingCalculator(), keywords=['flight', 'air travel'])
+
+
+class VectorizedCalculator:
+    """
+    Columnar CO2e calculation over whole arrays of quantity, factor and category.
+
+    Categories (or pinned factor ids) are routed through CalculatorFactory once
+    per distinct value and all rows are then computed in a single pass using exact fixed-point integer
+    arithmetic. Results are int64 CO2e values scaled by 10^CO2E_DECIMAL_PLACES,
+    rounded half-even exactly like the Decimal path stored in
+    EmissionRecord.co2e_calculated.
+
+    Inputs are taken at the precision of the model fields (4 decimal places
+    for quantity, 6 for the emission factor). Unit conversions are folded
+    into the per-row multiplier, so they are exact as well.
     """
+
+    @staticmethod
+    def calculate(quantity, emission_factor, category, conversion=None, factor_ids=None, **kwargs):
+        """
+        Returns CO2e for every row as int64 scaled by 10^CO2E_DECIMAL_PLACES.
+        conversion is an optional (codes, factors) pair as returned by
+        UnitRegistry.factor_table: row i's quantity is multiplied by
+        factors[codes[i]] to bring it into the emission factor's unit.
+        factor_ids (one per row, or None) lets factors pinned with
+        CalculatorFactory.route_factor override their category's route.
+        kwargs are passed to each calculator's multiplier (e.g. use_rf).
+        """
+        quantity = VectorizedCalculator.to_fixed_point(quantity, QUANTITY_DECIMAL_PLACES)
+        factor = VectorizedCalculator.to_fixed_point(emission_factor, FACTOR_DECIMAL_PLACES)
+        if len(quantity) != len(factor) or len(quantity) != len(category):
+            raise ValueError("quantity, emission_factor and category must have the same length")
+        if (quantity < 0).any():
+            raise ValueError("Quantity cannot be negative")
+
+        labels = np.asarray(category, dtype=object)
+        if factor_ids is not None and CalculatorFactory.has_factor_routes():
+            # Rows on a pinned factor are routed by (category, factor id)
+            labels = np.fromiter(
+                (
+                    (name, factor_id) if not pd.isna(name) and factor_id in CalculatorFactory._factors else name
+                    for name, factor_id in zip(labels, factor_ids)
+                ),
+                dtype=object,
+                count=len(labels)
+            )
+        codes, categories = pd.factorize(labels, use_na_sentinel=True)
+        if (codes < 0).any():
+            raise ValueError("Category is required")
+
+        if conversion is None:
+            conversion_codes, conversion_factors = np.zeros(len(quantity), dtype=np.int64), [Decimal('1')]
+        else:
+            conversion_codes, conversion_factors = conversion
+            conversion_codes = np.asarray(conversion_codes, dtype=np.int64)
+            if len(conversion_codes) != len(quantity):
+                raise ValueError("conversion codes must have one entry per row")
+
+        # One calculator lookup per distinct category
+        category_multipliers = [
+            (CalculatorFactory.get_calculator(*label) if isinstance(label, tuple)
+             else CalculatorFactory.get_calculator(label)).multiplier(**kwargs)
+            for label in categories
+        ]
+
+        # One exact multiplier per distinct (category, unit conversion) pair
+        pairs, inverse = np.unique(
+            codes.astype(np.int64) * len(conversion_factors) + conversion_codes,
+            return_inverse=True
+        )
+        numerators = np.empty(len(pairs), dtype=np.int64)
+        exponents = np.empty(len(pairs), dtype=np.int64)
+        for i, pair in enumerate(pairs):
+            category_code, conversion_code = divmod(int(pair), len(conversion_factors))
+            numerators[i], exponents[i] = VectorizedCalculator._as_ratio(
+                category_multipliers[category_code] * conversion_factors[conversion_code]
+            )
+
+        # CO2e = quantity * factor * numerator / 10^(exponent + places)
+        shift = QUANTITY_DECIMAL_PLACES + FACTOR_DECIMAL_PLACES - CO2E_DECIMAL_PLACES
+        return VectorizedCalculator._multiply_round(
+            quantity, factor, numerators[inverse], exponents[inverse] + shift
+        )
+
+    @staticmethod
+    def calculate_frame(df, quantity_column='quantity', factor_column='emission_factor_used',
+                        category_column='category', **kwargs):
+        """
+        Convenience wrapper for DataFrames such as the ones read by CSVParser.
+        """
+        return VectorizedCalculator.calculate(
+            df[quantity_column].to_numpy(),
+            df[factor_column].to_numpy(),
+            df[category_column].to_numpy(),
+            **kwargs
+        )
+
+    @staticmethod
+    def to_fixed_point(values, places):
+        """
+        Converts numbers (ints, floats, Decimals or numeric strings) to int64
+        scaled by 10^places, rounding half-even.
+        """
+        if isinstance(values, (list, tuple)) and values and isinstance(values[0], (Decimal, str)):
+            # NumPy's type inference is slow on Decimal lists; convert directly
+            return VectorizedCalculator._decimals_to_fixed_point(values, places)
+
+        values = np.asarray(values)
+        scale = 10 ** places
+        if values.dtype.kind in 'iub':
+            if values.size and np.abs(values).max() >= np.iinfo(np.int64).max // scale:
+                raise ValueError("Value out of range")
+            return values.astype(np.int64) * scale
+        if values.dtype.kind == 'f':
+            if not np.isfinite(values).all():
+                raise ValueError("Values must be finite numbers")
+            scaled = np.rint(values * scale)
+            if scaled.size and np.abs(scaled).max() >= 2 ** 62:
+                raise ValueError("Value out of range")
+            return scaled.astype(np.int64)
+        return VectorizedCalculator._decimals_to_fixed_point(values.ravel(), places)
+
+    @staticmethod
+    def _decimals_to_fixed_point(values, places):
+        def convert(value):
+            if not isinstance(value, Decimal):
+                value = Decimal(str(value))
+            if not value.is_finite():
+                raise ValueError("Values must be finite numbers")
+            return int(value.scaleb(places).to_integral_value(ROUND_HALF_EVEN))
+
+        return np.fromiter((convert(value) for value in values), dtype=np.int64, count=len(values))
+
+    @staticmethod
+    def to_decimal(values, places=CO2E_DECIMAL_PLACES):
+        """
+        Converts fixed-point integers back to Decimals.
+        """
+        return [Decimal(int(value)).scaleb(-places) for value in values]
+
+    @staticmethod
+    def _as_ratio(value):
+        """
+        Splits a Decimal into (integer numerator, power-of-ten exponent).
+        """
+        sign, digits, exponent = value.as_tuple()
+        numerator = int(''.join(map(str, digits))) * (-1 if sign else 1)
+        if exponent >= 0:
+            return numerator * 10 ** exponent, 0
+        return numerator, -exponent
+
+    @staticmethod
+    def _multiply_round(a, b, numerator, exponent):
+        """
+        Exact round_half_even(a * b * numerator / 10^exponent) for non-negative
+        operands. Rows whose magnitudes allow it are computed in int64 by
+        splitting the operands around the divisor; the rest fall back to
+        Python integers.
+        """
+        result = np.zeros(len(a), dtype=np.int64)
+        if not len(a):
+            return result
+
+        limit = 2.0 ** 62
+        g_estimate = b.astype(np.float64) * numerator
+        divisor_estimate = np.power(10.0, exponent)
+        fast = (
+            (g_estimate < limit)
+            & (divisor_estimate * divisor_estimate < limit)
+            & (a.astype(np.float64) * g_estimate / divisor_estimate < limit)
+        )
+
+        if fast.any():
+            a_fast = a[fast]
+            divisor = np.power(np.int64(10), exponent[fast])
+            g_int, g_frac = np.divmod(b[fast] * numerator[fast], divisor)
+            a_hi, a_lo = np.divmod(a_fast, divisor)
+            low_int, remainder = np.divmod(a_lo * g_frac, divisor)
+            quotient = a_fast * g_int + a_hi * g_frac + low_int
+            result[fast] = VectorizedCalculator._round_half_even(quotient, remainder, divisor)
+
+        slow = ~fast
+        if slow.any():
+            divisor = np.array([10 ** int(e) for e in exponent[slow]], dtype=object)
+            product = a[slow].astype(object) * b[slow].astype(object) * numerator[slow].astype(object)
+            quotient = VectorizedCalculator._round_half_even(product // divisor, product % divisor, divisor)
+            if any(value >= 2 ** 63 for value in quotient):
+                raise ValueError("CO2e out of range")
+            result[slow] = quotient.astype(np.int64)
+
+        return result
+
     @staticmethod
-    def get_calculator(category):
-        category_lower = category.lower()
-        if 'refrigerant' in category_lower or 'fugitive' in category_lower:
-            return FugitiveCalculator()
-        if 'flight' in category_lower or 'air travel' in category_lower:
-            return RadiativeForcingCalculator()
-        return StandardCalculator()
+    def _round_half_even(quotient, remainder, divisor):
+        half = divisor // 2
+        round_up = (remainder > half) | ((remainder == half) & (quotient % 2 == 1))
+        return quotient + round_up.astype(np.int64)
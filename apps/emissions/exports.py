@@ -0,0 +1,152 @@
+"""
+Streaming exports of emission records.
+
+Rows are pulled from the database with a server-side iterator and
+encoded chunk by chunk, so memory stays flat regardless of export size.
+"""
+
+import csv
+from .models import EmissionRecord
+
+
+# (column name, queryset lookup)
+EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('facility_id', 'facility_id'),
+    ('facility_name', 'facility__name'),
+    ('scope', 'scope'),
+    ('category', 'category'),
+    ('subcategory', 'subcategory'),
+    ('quantity', 'quantity'),
+    ('unit', 'unit'),
+    ('emission_factor_used', 'emission_factor_used'),
+    ('emission_factor_id', 'emission_factor_id'),
+    ('co2e_calculated', 'co2e_calculated'),
+    ('activity_date', 'activity_date'),
+    ('reporting_period', 'reporting_period'),
+    ('data_source', 'data_source'),
+    ('status', 'status'),
+    ('notes', 'notes'),
+    ('external_ref', 'external_ref'),
+    ('created_at', 'created_at'),
+]
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+
+class _Echo:
+    """File-like object whose write() returns the data instead of storing it."""
+    def write(self, value):
+        return value
+
+
+class _DrainableSink:
+    """
+    Write-only file-like object for pyarrow that hands back what was
+    written since the last drain.
+    """
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class EmissionExporter:
+    """
+    Encodes an EmissionRecord queryset as a stream of CSV or Parquet bytes.
+    """
+
+    @staticmethod
+    def iter_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+        lookups = [lookup for _, lookup in EXPORT_COLUMNS]
+        return queryset.values_list(*lookups).iterator(chunk_size=chunk_size)
+
+    @staticmethod
+    def iter_csv(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+        writer = csv.writer(_Echo())
+        yield writer.writerow([name for name, _ in EXPORT_COLUMNS])
+        for row in EmissionExporter.iter_rows(queryset, chunk_size):
+            yield writer.writerow(row)
+
+    @staticmethod
+    def iter_parquet(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+        """
+        Writes one Parquet row group per chunk and yields the bytes as
+        each group is flushed. Requires pyarrow.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = EmissionExporter.parquet_schema()
+        sink = _DrainableSink()
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode='w'), schema)
+        try:
+            columns = [[] for _ in EXPORT_COLUMNS]
+            for row in EmissionExporter.iter_rows(queryset, chunk_size):
+                for column, value in zip(columns, row):
+                    column.append(value)
+                if len(columns[0]) >= chunk_size:
+                    writer.write_table(EmissionExporter._table(columns, schema))
+                    columns = [[] for _ in EXPORT_COLUMNS]
+                    yield sink.drain()
+            if columns[0]:
+                writer.write_table(EmissionExporter._table(columns, schema))
+        finally:
+            writer.close()
+        yield sink.drain()
+
+    @staticmethod
+    def parquet_schema():
+        """
+        Arrow schema mirroring the model: decimals keep their precision,
+        ids are strings.
+        """
+        import pyarrow as pa
+
+        types = {
+            'DecimalField': lambda field: pa.decimal128(field.max_digits, field.decimal_places),
+            'DateField': lambda field: pa.date32(),
+            'DateTimeField': lambda field: pa.timestamp('us', tz='UTC'),
+        }
+        fields = []
+        for name, lookup in EXPORT_COLUMNS:
+            model_field = EmissionRecord._meta.get_field(lookup) if '__' not in lookup else None
+            make_type = types.get(model_field.get_internal_type()) if model_field else None
+            fields.append(pa.field(name, make_type(model_field) if make_type else pa.string()))
+        return pa.schema(fields)
+
+    @staticmethod
+    def _table(columns, schema):
+        import pyarrow as pa
+
+        arrays = []
+        for values, field in zip(columns, schema):
+            if pa.types.is_string(field.type):
+                values = [None if value is None else str(value) for value in values]
+            arrays.append(pa.array(values, type=field.type))
+        return pa.Table.from_arrays(arrays, schema=schema)
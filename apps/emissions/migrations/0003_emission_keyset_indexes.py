@@ -0,0 +1,26 @@
+# Generated by Django 5.0.1 on 2026-10-18 15:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emission_factors', '0001_initial'),
+        ('emissions', '0002_alter_emissionrecord_reporting_period'),
+        ('facilities', '0001_initial'),
+        ('organizations', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emissionrecord',
+            index=models.Index(fields=['activity_date', 'created_at', 'id'], name='emission_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emissionrecord',
+            index=models.Index(fields=['organization', 'activity_date', 'created_at', 'id'], name='emission_org_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.1 on 2026-10-18 16:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emission_factors', '0001_initial'),
+        ('emissions', '0003_emission_keyset_indexes'),
+        ('facilities', '0001_initial'),
+        ('organizations', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emissionrecord',
+            index=models.Index(fields=['facility', 'activity_date', 'created_at', 'id'], name='emission_facility_keyset_idx'),
+        ),
+    ]
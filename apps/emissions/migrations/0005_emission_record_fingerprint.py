@@ -0,0 +1,62 @@
+# Generated by Django 5.0.1 on 2026-10-18 16:06
+
+import hashlib
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Copy of apps.emissions.models.natural_key_fingerprint as of this
+# migration, so later changes there can't alter the backfill
+def natural_key_fingerprint(facility_id, category, subcategory, activity_date, quantity):
+    key = '|'.join([
+        str(facility_id),
+        category.strip().casefold(),
+        (subcategory or '').strip().casefold(),
+        activity_date.isoformat(),
+        str(Decimal(str(quantity)).quantize(Decimal('0.0001'))),
+    ])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def backfill_fingerprints(apps, schema_editor):
+    EmissionRecord = apps.get_model('emissions', 'EmissionRecord')
+    batch = []
+    rows = EmissionRecord.objects.only(
+        'id', 'facility_id', 'category', 'subcategory', 'activity_date', 'quantity'
+    ).iterator(chunk_size=2000)
+    for record in rows:
+        record.fingerprint = natural_key_fingerprint(
+            record.facility_id, record.category, record.subcategory, record.activity_date, record.quantity
+        )
+        batch.append(record)
+        if len(batch) >= 2000:
+            EmissionRecord.objects.bulk_update(batch, ['fingerprint'])
+            batch = []
+    if batch:
+        EmissionRecord.objects.bulk_update(batch, ['fingerprint'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emission_factors', '0001_initial'),
+        ('emissions', '0004_emission_facility_keyset_index'),
+        ('facilities', '0001_initial'),
+        ('organizations', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emissionrecord',
+            name='fingerprint',
+            field=models.CharField(blank=True, editable=False, help_text='sha256 of the natural key, see natural_key_fingerprint', max_length=64),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='emissionrecord',
+            index=models.Index(fields=['organization', 'fingerprint'], name='emission_fingerprint_idx'),
+        ),
+    ]
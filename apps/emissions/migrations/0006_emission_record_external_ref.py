@@ -0,0 +1,27 @@
+# Generated by Django 5.0.1 on 2026-10-18 16:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emission_factors', '0001_initial'),
+        ('emissions', '0005_emission_record_fingerprint'),
+        ('facilities', '0001_initial'),
+        ('organizations', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emissionrecord',
+            name='external_ref',
+            field=models.CharField(blank=True, help_text='Id of the row in the source system (e.g., ERP); upserts are keyed on it', max_length=255, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='emissionrecord',
+            constraint=models.UniqueConstraint(fields=('organization', 'external_ref'), name='uniq_emission_external_ref'),
+        ),
+    ]
@@ -2,11 +2,29 @@
 EmissionRecord model - stores raw activity data and calculated CO2e.
 """
 
+import hashlib
+from decimal import Decimal
 from django.db import models
 from apps.core.models import BaseModel
 from apps.core.constants import SCOPE_CHOICES, STATUS_CHOICES
 
 
+def natural_key_fingerprint(facility_id, category, subcategory, activity_date, quantity):
+    """
+    sha256 of a record's natural key: facility, category, subcategory,
+    activity date and quantity. Case, surrounding whitespace and the
+    quantity's formatting don't change it.
+    """
+    key = '|'.join([
+        str(facility_id),
+        category.strip().casefold(),
+        (subcategory or '').strip().casefold(),
+        activity_date.isoformat(),
+        str(Decimal(str(quantity)).quantize(Decimal('0.0001'))),
+    ])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
 class EmissionRecord(BaseModel):
     """
     The central transaction table for all emission activities.
@@ -58,6 +76,20 @@ class EmissionRecord(BaseModel):
         help_text="YYYY-MM format for aggregation"
     )
     
+    # Deduplication
+    external_ref = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        help_text="Id of the row in the source system (e.g., ERP); upserts are keyed on it"
+    )
+    fingerprint = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text="sha256 of the natural key, see natural_key_fingerprint"
+    )
+    
     # Metadata
     data_source = models.CharField(
         max_length=100, 
@@ -88,8 +120,24 @@ class EmissionRecord(BaseModel):
             models.Index(fields=['scope', 'category']),
             models.Index(fields=['activity_date']),
             models.Index(fields=['status']),
+            # Keyset pagination walks (activity_date, created_at, id)
+            models.Index(fields=['activity_date', 'created_at', 'id'], name='emission_keyset_idx'),
+            models.Index(fields=['organization', 'activity_date', 'created_at', 'id'], name='emission_org_keyset_idx'),
+            models.Index(fields=['facility', 'activity_date', 'created_at', 'id'], name='emission_facility_keyset_idx'),
+            # Duplicate checks during ingestion
+            models.Index(fields=['organization', 'fingerprint'], name='emission_fingerprint_idx'),
+        ]
+        constraints = [
+            # Also the conflict target of EmissionService.bulk_upsert_records
+            models.UniqueConstraint(fields=['organization', 'external_ref'], name='uniq_emission_external_ref'),
         ]
 
+    def save(self, *args, **kwargs):
+        self.fingerprint = natural_key_fingerprint(
+            self.facility_id, self.category, self.subcategory, self.activity_date, self.quantity
+        )
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.category} ({self.reporting_period}) - {self.co2e_calculated} kg CO2e"
 
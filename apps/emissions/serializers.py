@@ -1,6 +1,25 @@
 from rest_framework import serializers
 from .models import EmissionRecord, ScopeDetails
 from apps.emission_factors.models import EmissionFactor
+from apps.emission_factors.services import EmissionFactorCache
+
+
+class CachedEmissionFactorField(serializers.PrimaryKeyRelatedField):
+    """
+    Resolves emission factor ids from the in-memory factor library
+    instead of querying per record.
+    """
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            factor_id = self.get_queryset().model._meta.pk.to_python(data)
+        except Exception:
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        factor = EmissionFactorCache.get(factor_id)
+        if factor is None:
+            self.fail('does_not_exist', pk_value=data)
+        return factor
 
 
 class ScopeDetailsSerializer(serializers.ModelSerializer):
@@ -12,12 +31,18 @@ class ScopeDetailsSerializer(serializers.ModelSerializer):
 class EmissionRecordSerializer(serializers.ModelSerializer):
     """
     Serializer for EmissionRecord model.
+    Pass fields= or exclude= (lists of field names) to serialize a subset.
     """
     organization_name = serializers.CharField(source='organization.name', read_only=True)
     facility_name = serializers.CharField(source='facility.name', read_only=True)
     scope_details = ScopeDetailsSerializer(read_only=True)
     details_data = serializers.JSONField(write_only=True, required=False)
     reporting_period = serializers.CharField(required=False, allow_blank=True)
+    emission_factor = CachedEmissionFactorField(
+        queryset=EmissionFactor.objects.all(),
+        required=False,
+        allow_null=True
+    )
     
     class Meta:
         model = EmissionRecord
@@ -26,6 +51,47 @@ class EmissionRecordSerializer(serializers.ModelSerializer):
             'scope', 'category', 'subcategory', 'quantity', 'unit',
             'emission_factor_used', 'emission_factor', 'co2e_calculated',
             'activity_date', 'reporting_period', 'data_source', 'status',
-            'notes', 'scope_details', 'details_data', 'created_at'
+            'notes', 'external_ref', 'scope_details', 'details_data', 'created_at'
         ]
         read_only_fields = ['id', 'co2e_calculated', 'created_at']
+        # Left out, the factor is resolved from the library on create
+        extra_kwargs = {'emission_factor_used': {'required': False}}
+
+    def __init__(self, *args, fields=None, exclude=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        for name in exclude or ():
+            self.fields.pop(name, None)
+
+    def validate_external_ref(self, value):
+        # Blank means no reference; stored as NULL so it isn't unique
+        return (value or '').strip() or None
+
+    def validate(self, attrs):
+        external_ref = attrs.get('external_ref')
+        if external_ref:
+            organization = attrs.get('organization') or getattr(self.instance, 'organization', None)
+            taken = EmissionRecord.all_objects.filter(organization=organization, external_ref=external_ref)
+            if self.instance is not None:
+                taken = taken.exclude(pk=self.instance.pk)
+            if taken.exists():
+                raise serializers.ValidationError({'external_ref': f"external_ref {external_ref} already exists"})
+        return attrs
+
+    def source_columns(self):
+        """
+        Model lookups the readable fields load, e.g. 'facility__name' for
+        facility_name. Used to narrow the queryset with only().
+        """
+        columns = []
+        for field in self.fields.values():
+            if field.write_only:
+                continue
+            source = field.source.replace('.', '__')
+            if isinstance(field, serializers.BaseSerializer):
+                columns.extend(f"{source}__{child.source}" for child in field.fields.values())
+            else:
+                columns.append(source)
+        return columns
@@ -1,7 +1,107 @@
+import uuid
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
 from django.db import transaction
-from .models import EmissionRecord, ScopeDetails
-from .calculators import CalculatorFactory
+from django.db.models import F
+from .models import EmissionRecord, ScopeDetails, natural_key_fingerprint
+from .calculators import CalculatorFactory, VectorizedCalculator
+from apps.core.constants import SCOPE_DICT, STATUS_CHOICES
 from apps.core.utils import format_period
+from apps.analytics.services import AnalyticsService
+from apps.emission_factors.services import EmissionFactorCache
+
+
+# Rows per INSERT statement for bulk ingestion
+BULK_CREATE_BATCH_SIZE = 1000
+
+# Columns an upsert compares to tell updated rows from unchanged ones
+UPSERT_COMPARED_FIELDS = [
+    'facility_id', 'scope', 'category', 'subcategory', 'quantity', 'unit',
+    'emission_factor_used', 'emission_factor_id', 'co2e_calculated',
+    'activity_date', 'reporting_period', 'data_source', 'notes',
+]
+
+# Columns an upsert overwrites on conflict; created_by and created_at stay
+UPSERT_UPDATE_FIELDS = [
+    'facility', 'scope', 'category', 'subcategory', 'quantity', 'unit',
+    'emission_factor_used', 'emission_factor', 'co2e_calculated',
+    'activity_date', 'reporting_period', 'data_source', 'status', 'notes',
+    'fingerprint', 'deleted_at', 'updated_at',
+]
+
+QUANTITY_PLACES = Decimal('0.0001')
+FACTOR_PLACES = Decimal('0.000001')
+
+# Columns of the lean list mode: output name -> lookup. Plain names map
+# to the column of the same name (foreign keys give their id); the rest
+# are pulled through a join. Decimals stay Decimals and are rendered as
+# strings by the JSON renderer, like the serializer does.
+LEAN_COLUMNS = {
+    'id': None,
+    'organization': None,
+    'organization_name': F('organization__name'),
+    'facility': None,
+    'facility_name': F('facility__name'),
+    'scope': None,
+    'category': None,
+    'subcategory': None,
+    'quantity': None,
+    'unit': None,
+    'emission_factor_used': None,
+    'emission_factor': None,
+    'co2e_calculated': None,
+    'activity_date': None,
+    'reporting_period': None,
+    'data_source': None,
+    'status': None,
+    'notes': None,
+    'external_ref': None,
+    'details': F('scope_details__details'),
+    'created_at': None,
+}
+
+
+class BulkCreateResult:
+    """
+    Outcome of a bulk ingestion: the records written, per-row errors and
+    the rows skipped as duplicates.
+    Rows are numbered from 1 in the order they were submitted.
+    """
+    def __init__(self):
+        self.records = []
+        self.errors = []
+        self.skipped = []
+
+    @property
+    def created_count(self):
+        return len(self.records)
+
+    @property
+    def failed_count(self):
+        return len(self.errors)
+
+    @property
+    def skipped_count(self):
+        return len(self.skipped)
+
+    def add_error(self, row, message):
+        self.errors.append({'row': row, 'error': message})
+
+
+class BulkUpsertResult(BulkCreateResult):
+    """
+    Outcome of a bulk upsert: records holds the created records, updated
+    the ones that changed, and unchanged_count the rows that matched the
+    stored record exactly and were not written.
+    """
+    def __init__(self):
+        super().__init__()
+        self.updated = []
+        self.unchanged_count = 0
+
+    @property
+    def updated_count(self):
+        return len(self.updated)
 
 
 class EmissionService:
@@ -13,13 +113,19 @@ class EmissionService:
     def create_record(data, organization, user=None):
         """
         Creates an emission record and calculates CO2e.
+        Without an emission_factor_used value the factor is resolved
+        from the library.
         """
+        if data.get('emission_factor_used') is None:
+            EmissionService.resolve_factor(data)
+        
         # Get appropriate calculator
-        calculator = CalculatorFactory.get_calculator(data['category'])
+        factor = data.get('emission_factor')
+        calculator = CalculatorFactory.get_calculator(data['category'], factor.id if factor else None)
         
-        # Calculate CO2e
+        # Calculate CO2e in the emission factor's unit
         co2e = calculator.calculate(
-            quantity=data['quantity'],
+            quantity=EmissionService.normalized_quantity(data['quantity'], data['unit'], factor),
             emission_factor=data['emission_factor_used']
         )
         
@@ -47,18 +153,536 @@ class EmissionService:
                     details=details_dict
                 )
             
-            # TODO: Trigger analytics update
+            # Keep monthly summaries in step with the records
+            AnalyticsService.apply_record_deltas([record])
             
             return record
 
     @staticmethod
-    def bulk_create_records(records_list, organization, user=None):
+    def resolve_factor(data):
         """
-        Handles bulk creation of emission records.
+        Fills emission_factor and emission_factor_used for one record: the
+        chosen factor's value if one was given, otherwise the best library
+        match for the facility's region and the activity year.
+        Raises ValueError if no factor matches.
         """
-        created_records = []
+        factor = data.get('emission_factor')
+        if factor is None:
+            facility = data['facility']
+            factor = EmissionFactorCache.resolve(
+                data['scope'],
+                data['category'],
+                data.get('subcategory'),
+                EmissionFactorCache.region_chain(facility.grid_region, facility.country),
+                data['activity_date'].year
+            )
+            data['emission_factor'] = factor
+        data['emission_factor_used'] = factor.emission_factor_co2e
+        return factor
+
+    @staticmethod
+    def normalized_quantity(quantity, unit, factor=None):
+        """
+        Quantity expressed in the emission factor's unit, so a record in
+        MWh against a per-kWh factor is scaled by 1000. Records without a
+        library factor are taken to be in the factor value's unit.
+        Raises ValueError for unknown units or mismatched dimensions.
+        """
+        conversion = CalculatorFactory.conversion_factor(unit, factor.unit if factor else None)
+        return Decimal(str(quantity)) * conversion
+
+    @staticmethod
+    def update_record(record, data):
+        """
+        Updates an emission record, recalculates CO2e and moves its
+        contribution in the monthly summaries from the old values to the new.
+        """
+        data = dict(data)
+        details_dict = data.pop('details_data', None)
+        old_snapshot = EmissionService._summary_snapshot(record)
+        
+        for field, value in data.items():
+            setattr(record, field, value)
+        
+        if 'activity_date' in data and not data.get('reporting_period'):
+            record.reporting_period = format_period(record.activity_date)
+        
+        calculator = CalculatorFactory.get_calculator(record.category, record.emission_factor_id)
+        factor = EmissionFactorCache.get(record.emission_factor_id) if record.emission_factor_id else None
+        record.co2e_calculated = calculator.calculate(
+            quantity=EmissionService.normalized_quantity(record.quantity, record.unit, factor),
+            emission_factor=record.emission_factor_used
+        )
+        
         with transaction.atomic():
-            for record_data in records_list:
-                record = EmissionService.create_record(record_data, organization, user)
-                created_records.append(record)
-        return created_records
+            record.save()
+            
+            if details_dict is not None:
+                ScopeDetails.objects.update_or_create(
+                    emission_record=record,
+                    defaults={'details': details_dict}
+                )
+            
+            # Re-read so cached scope details and rounding match the database
+            record.refresh_from_db()
+            if record.deleted_at is None:
+                deltas = AnalyticsService.record_deltas([old_snapshot], sign=-1)
+                AnalyticsService.record_deltas([record], deltas=deltas)
+                AnalyticsService.apply_summary_deltas(deltas)
+        
+        return record
+
+    @staticmethod
+    def delete_record(record):
+        """
+        Soft-deletes a record and removes it from the monthly summaries.
+        """
+        if record.deleted_at is not None:
+            return record
+        with transaction.atomic():
+            record.delete()
+            AnalyticsService.apply_record_deltas([record], sign=-1)
+        return record
+
+    @staticmethod
+    def restore_record(record):
+        """
+        Restores a soft-deleted record and adds it back to the monthly summaries.
+        """
+        if record.deleted_at is None:
+            return record
+        with transaction.atomic():
+            record.restore()
+            AnalyticsService.apply_record_deltas([record])
+        return record
+
+    @staticmethod
+    def bulk_create_records(records_list, organization, user=None, batch_size=BULK_CREATE_BATCH_SIZE,
+                            row_offset=0, skip_duplicates=False):
+        """
+        Set-based bulk creation of emission records.
+
+        All rows are validated and calculated in memory first, then written
+        with chunked bulk_create for records and scope details inside a
+        single transaction. Invalid rows are skipped and reported in the
+        returned BulkCreateResult instead of aborting the whole import.
+        row_offset shifts reported row numbers when records_list is one
+        batch of a larger stream.
+        With skip_duplicates, rows whose natural key already exists for the
+        organization (or appears earlier in the batch) are left out and
+        listed in result.skipped, so re-importing a file is a no-op.
+        """
+        result = BulkCreateResult()
+        prepared = EmissionService._prepare_records(
+            records_list, organization, user, result, row_offset, skip_duplicates
+        )
+        if not prepared:
+            return result
+
+        records = [record for record, *_ in prepared]
+        details = [
+            ScopeDetails(emission_record=record, details=details_dict)
+            for record, details_dict, _ in prepared
+            if details_dict
+        ]
+
+        with transaction.atomic():
+            EmissionRecord.objects.bulk_create(records, batch_size=batch_size)
+            if details:
+                ScopeDetails.objects.bulk_create(details, batch_size=batch_size)
+            # One summary update per touched summary row, not per record
+            AnalyticsService.apply_record_deltas(records)
+
+        result.records = records
+        return result
+
+    @staticmethod
+    def bulk_upsert_records(records_list, organization, user=None, batch_size=BULK_CREATE_BATCH_SIZE):
+        """
+        Creates or updates records keyed by (organization, external_ref).
+
+        Rows are validated and calculated like bulk_create_records. The
+        stored versions are read with one indexed query per chunk. Rows
+        identical to what is stored are left alone; status only counts
+        when the row gives one. The rest are written with chunked
+        INSERT ... ON CONFLICT DO UPDATE statements. Changed rows take the
+        payload's status (draft by default), so they are verified again.
+        Soft-deleted records are restored. Summaries move by the
+        difference between the old and new values.
+        """
+        result = BulkUpsertResult()
+        prepared = EmissionService._prepare_records(
+            records_list, organization, user, result, require_external_ref=True
+        )
+        if not prepared:
+            return result
+
+        stored = EmissionService._stored_by_external_ref(
+            organization, [record.external_ref for record, *_ in prepared]
+        )
+
+        created, updated, removed = [], [], []
+        for record, details_dict, given in prepared:
+            current = stored.get(record.external_ref)
+            if current is None:
+                created.append((record, details_dict))
+                continue
+            compared = UPSERT_COMPARED_FIELDS + (['status'] if 'status' in given else [])
+            if current['deleted_at'] is None and all(
+                getattr(record, field) == current[field] for field in compared
+            ) and (details_dict is None or details_dict == current['details']):
+                result.unchanged_count += 1
+                continue
+            if current['deleted_at'] is None:
+                removed.append(current)
+            updated.append((record, details_dict, current['id']))
+
+        records = [record for record, _ in created] + [record for record, _, _ in updated]
+        with transaction.atomic():
+            if records:
+                EmissionRecord.objects.bulk_create(
+                    records,
+                    batch_size=batch_size,
+                    update_conflicts=True,
+                    unique_fields=['organization', 'external_ref'],
+                    update_fields=UPSERT_UPDATE_FIELDS
+                )
+            # Updated rows kept their stored id on conflict
+            for record, _, record_id in updated:
+                record.id = record_id
+            details = [
+                ScopeDetails(emission_record=record, details=details_dict)
+                for record, details_dict, *_ in created + updated
+                if details_dict
+            ]
+            if details:
+                ScopeDetails.objects.bulk_create(
+                    details,
+                    batch_size=batch_size,
+                    update_conflicts=True,
+                    unique_fields=['emission_record'],
+                    update_fields=['details']
+                )
+            deltas = AnalyticsService.record_deltas(removed, sign=-1)
+            AnalyticsService.record_deltas(records, deltas=deltas)
+            AnalyticsService.apply_summary_deltas(deltas)
+
+        result.records = [record for record, _ in created]
+        result.updated = [record for record, _, _ in updated]
+        return result
+
+    @staticmethod
+    def _stored_by_external_ref(organization, external_refs, chunk_size=1000):
+        """
+        Stored state of the organization's records (soft-deleted included)
+        for these external references, keyed by external_ref.
+        """
+        columns = [
+            'id', 'external_ref', 'organization_id', 'deleted_at', 'status', *UPSERT_COMPARED_FIELDS
+        ]
+        stored = {}
+        for start in range(0, len(external_refs), chunk_size):
+            for row in EmissionRecord.all_objects.filter(
+                organization=organization,
+                external_ref__in=external_refs[start:start + chunk_size]
+            ).values(*columns, details=F('scope_details__details')):
+                stored[row['external_ref']] = row
+        return stored
+
+    @staticmethod
+    def lean_queryset(queryset, fields=None):
+        """
+        Read-optimized rows for list endpoints: plain dicts built by
+        .values() over LEAN_COLUMNS, restricted to fields when given.
+        Joins are only added for the columns that need them.
+        Raises ValueError for unknown field names.
+        """
+        fields = list(fields or LEAN_COLUMNS)
+        unknown = [name for name in fields if name not in LEAN_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+        plain = [name for name in fields if LEAN_COLUMNS[name] is None]
+        joined = {name: LEAN_COLUMNS[name] for name in fields if LEAN_COLUMNS[name] is not None}
+        # Drop select_related joins; values() adds only the ones it needs
+        return queryset.select_related(None).values(*plain, **joined)
+
+    @staticmethod
+    def _prepare_records(records_list, organization, user, result, row_offset=0, skip_duplicates=False,
+                         require_external_ref=False):
+        """
+        Validates raw rows and builds unsaved EmissionRecord instances.
+        Facility ownership is checked with one query for the whole batch and
+        factor references against the cached factor library. Rows without
+        an emission_factor_used value get the best library factor for their
+        facility's region and activity year. Quantities are converted to
+        their factor's unit through the memoized conversion table; rows
+        whose unit can't be converted are rejected. Duplicate checks are
+        one indexed fingerprint lookup per chunk of rows. An external_ref
+        may appear once per batch; outside upserts it must not be used by
+        a stored record either (one indexed lookup per chunk). With
+        require_external_ref, every row needs an external_ref.
+        Returns a list of (record, details_dict, given) tuples, given being
+        the optional fields (status) the row set explicitly.
+        """
+        from apps.facilities.models import Facility
+
+        rows = []
+        for row_number, data in enumerate(records_list, start=row_offset + 1):
+            try:
+                rows.append((row_number, EmissionService._clean_row(data)))
+            except (KeyError, TypeError, ValueError, InvalidOperation) as e:
+                result.add_error(row_number, EmissionService._error_message(e))
+
+        # Facility id -> regions to try when resolving factors
+        facility_regions = {
+            facility_id: EmissionFactorCache.region_chain(grid_region, country)
+            for facility_id, grid_region, country in Facility.objects.filter(
+                organization=organization,
+                id__in={cleaned['facility_id'] for _, cleaned in rows}
+            ).values_list('id', 'grid_region', 'country')
+        }
+
+        existing = set()
+        if skip_duplicates:
+            existing = EmissionService.existing_fingerprints(
+                organization, [cleaned['fingerprint'] for _, cleaned in rows]
+            )
+        # Upserts update the records holding a stored external_ref
+        taken_refs = set()
+        if not require_external_ref:
+            taken_refs = EmissionService.existing_external_refs(
+                organization, [cleaned['external_ref'] for _, cleaned in rows if cleaned['external_ref']]
+            )
+
+        # Factors resolve from the in-memory library, no query per row
+        factor_library = EmissionFactorCache.library()
+
+        valid = []
+        external_refs = set()
+        # (record unit, factor unit) -> index into conversion_factors
+        conversions = {}
+        conversion_factors = []
+        conversion_codes = []
+        for row_number, cleaned in rows:
+            factor = None
+            if cleaned['facility_id'] not in facility_regions:
+                result.add_error(row_number, f"Facility {cleaned['facility_id']} not found for organization")
+                continue
+            external_ref = cleaned['external_ref']
+            if require_external_ref and not external_ref:
+                result.add_error(row_number, "external_ref is required")
+                continue
+            if skip_duplicates and cleaned['fingerprint'] in existing:
+                result.skipped.append(row_number)
+                continue
+            if external_ref in external_refs:
+                result.add_error(row_number, f"Duplicate external_ref {external_ref}")
+                continue
+            if external_ref in taken_refs:
+                result.add_error(row_number, f"external_ref {external_ref} already exists")
+                continue
+            if 'emission_factor_id' in cleaned:
+                factor = factor_library.by_id.get(cleaned['emission_factor_id'])
+                if factor is None:
+                    result.add_error(row_number, f"Emission factor {cleaned['emission_factor_id']} not found")
+                    continue
+            elif cleaned['emission_factor_used'] is None:
+                try:
+                    factor = factor_library.resolve(
+                        cleaned['scope'],
+                        cleaned['category'],
+                        cleaned['subcategory'],
+                        facility_regions[cleaned['facility_id']],
+                        cleaned['activity_date'].year
+                    )
+                except ValueError as e:
+                    result.add_error(row_number, str(e))
+                    continue
+                cleaned['emission_factor_id'] = factor.id
+            if cleaned['emission_factor_used'] is None:
+                cleaned['emission_factor_used'] = factor.emission_factor_co2e
+
+            pair = (cleaned['unit'], factor.unit if factor else None)
+            code = conversions.get(pair)
+            if code is None:
+                try:
+                    conversion_factors.append(CalculatorFactory.conversion_factor(*pair))
+                except ValueError as e:
+                    result.add_error(row_number, str(e))
+                    continue
+                code = conversions[pair] = len(conversion_factors) - 1
+            conversion_codes.append(code)
+            valid.append(cleaned)
+            # Only rows that will be written count as seen, so a repeat of
+            # a rejected row is rejected too instead of skipped
+            existing.add(cleaned['fingerprint'])
+            if external_ref:
+                external_refs.add(external_ref)
+
+        if not valid:
+            return []
+
+        # Calculate CO2e for the whole batch in one vectorized pass
+        co2e_values = VectorizedCalculator.to_decimal(VectorizedCalculator.calculate(
+            [cleaned['quantity'] for cleaned in valid],
+            [cleaned['emission_factor_used'] for cleaned in valid],
+            [cleaned['category'] for cleaned in valid],
+            conversion=(conversion_codes, conversion_factors),
+            factor_ids=[cleaned.get('emission_factor_id') for cleaned in valid],
+        ))
+
+        prepared = []
+        for cleaned, co2e in zip(valid, co2e_values):
+            details_dict = cleaned.pop('details_data', None)
+            given = {'status'} & cleaned.keys()
+            record = EmissionRecord(
+                organization=organization,
+                co2e_calculated=co2e,
+                created_by=user,
+                **cleaned
+            )
+            prepared.append((record, details_dict, given))
+
+        return prepared
+
+    @staticmethod
+    def existing_fingerprints(organization, fingerprints, chunk_size=1000):
+        """
+        The subset of fingerprints already used by the organization's
+        records, read from the fingerprint index in chunks.
+        """
+        fingerprints = list(set(fingerprints))
+        existing = set()
+        for start in range(0, len(fingerprints), chunk_size):
+            existing.update(EmissionRecord.objects.filter(
+                organization=organization,
+                fingerprint__in=fingerprints[start:start + chunk_size]
+            ).values_list('fingerprint', flat=True))
+        return existing
+
+    @staticmethod
+    def existing_external_refs(organization, external_refs, chunk_size=1000):
+        """
+        The subset of external_refs already used by the organization's
+        records (soft-deleted included, as the unique constraint covers
+        them), read from the constraint's index in chunks.
+        """
+        external_refs = list(set(external_refs))
+        existing = set()
+        for start in range(0, len(external_refs), chunk_size):
+            existing.update(EmissionRecord.all_objects.filter(
+                organization=organization,
+                external_ref__in=external_refs[start:start + chunk_size]
+            ).values_list('external_ref', flat=True))
+        return existing
+
+    @staticmethod
+    def _clean_row(data):
+        """
+        Normalizes one raw row (CSV dict or API payload) into EmissionRecord fields.
+        Raises KeyError/ValueError on invalid input.
+        """
+        facility = data.get('facility_id') or data.get('facility')
+        if not facility:
+            raise ValueError("Facility is required")
+        facility_id = EmissionService._parse_uuid(facility, 'facility')
+
+        scope = data.get('scope')
+        if scope not in SCOPE_DICT:
+            raise ValueError(f"Invalid scope: {scope}")
+
+        category = data.get('category')
+        if not category:
+            raise ValueError("Category is required")
+
+        unit = data.get('unit')
+        if not unit:
+            raise ValueError("Unit is required")
+
+        quantity = Decimal(str(data['quantity']))
+        if not quantity.is_finite():
+            raise ValueError("Quantity must be a number")
+        quantity = quantity.quantize(QUANTITY_PLACES)
+        if quantity < 0:
+            raise ValueError("Quantity cannot be negative")
+
+        # A blank factor value is resolved from the library later
+        emission_factor_used = data.get('emission_factor_used')
+        if emission_factor_used in (None, ''):
+            emission_factor_used = None
+        else:
+            emission_factor_used = Decimal(str(emission_factor_used))
+            if not emission_factor_used.is_finite():
+                raise ValueError("Emission factor must be a number")
+            emission_factor_used = emission_factor_used.quantize(FACTOR_PLACES)
+            if emission_factor_used < 0:
+                raise ValueError("Emission factor cannot be negative")
+
+        external_ref = str(data.get('external_ref') or '').strip() or None
+        if external_ref and len(external_ref) > 255:
+            raise ValueError("external_ref is longer than 255 characters")
+
+        activity_date = data['activity_date']
+        if isinstance(activity_date, datetime):
+            activity_date = activity_date.date()
+        elif not isinstance(activity_date, date):
+            activity_date = datetime.strptime(str(activity_date), '%Y-%m-%d').date()
+
+        cleaned = {
+            'fingerprint': natural_key_fingerprint(
+                facility_id, category, data.get('subcategory'), activity_date, quantity
+            ),
+            'facility_id': facility_id,
+            'scope': scope,
+            'category': category,
+            'subcategory': data.get('subcategory') or '',
+            'quantity': quantity,
+            'unit': unit,
+            'emission_factor_used': emission_factor_used,
+            'activity_date': activity_date,
+            'reporting_period': data.get('reporting_period') or format_period(activity_date),
+            'data_source': data.get('data_source') or '',
+            'notes': data.get('notes') or '',
+            'external_ref': external_ref,
+            'details_data': data.get('details_data'),
+        }
+
+        emission_factor = data.get('emission_factor_id') or data.get('emission_factor')
+        if emission_factor:
+            cleaned['emission_factor_id'] = EmissionService._parse_uuid(emission_factor, 'emission factor')
+
+        status = data.get('status')
+        if status:
+            if status not in dict(STATUS_CHOICES):
+                raise ValueError(f"Invalid status: {status}")
+            cleaned['status'] = status
+
+        return cleaned
+
+    @staticmethod
+    def _summary_snapshot(record):
+        """The fields that decide where a record counts in the summaries."""
+        return {
+            'organization_id': record.organization_id,
+            'facility_id': record.facility_id,
+            'reporting_period': record.reporting_period,
+            'scope': record.scope,
+            'category': record.category,
+            'co2e_calculated': record.co2e_calculated,
+        }
+
+    @staticmethod
+    def _parse_uuid(value, label):
+        """Accepts a model instance or an id and returns a UUID."""
+        try:
+            return uuid.UUID(str(getattr(value, 'pk', value)))
+        except ValueError:
+            raise ValueError(f"Invalid {label} id: {value}")
+
+    @staticmethod
+    def _error_message(error):
+        if isinstance(error, KeyError):
+            return f"Missing required field: {error.args[0]}"
+        if isinstance(error, InvalidOperation):
+            return "Invalid numeric value"
+        return str(error)
@@ -0,0 +1,383 @@
+import csv
+import io
+import json
+import random
+from datetime import date
+from decimal import Decimal, ROUND_HALF_EVEN
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from apps.analytics.services import AnalyticsService
+from apps.core.renderers import ORJSONRenderer
+from apps.core.utils import UNITS, UnitRegistry
+from apps.facilities.models import Facility
+from apps.organizations.models import Organization
+from .calculators import (
+    CO2E_DECIMAL_PLACES, CONVERSION_CACHE_SIZE, ROUTE_CACHE_SIZE, CalculatorFactory, VectorizedCalculator
+)
+from .exports import EXPORT_COLUMNS
+from .models import EmissionRecord
+from .serializers import EmissionRecordSerializer
+from .services import EmissionService
+
+
+class BulkDuplicateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_emission_factors', verbosity=0)
+        cls.organization = Organization.objects.create(name='Org')
+        cls.facility = Facility.objects.create(organization=cls.organization, name='Plant')
+
+    def row(self, **overrides):
+        return {
+            'facility_id': self.facility.id,
+            'scope': 'scope1',
+            'category': 'Diesel',
+            'subcategory': 'Stationary',
+            'quantity': Decimal('100'),
+            'unit': 'liter',
+            'activity_date': date(2024, 1, 15),
+            **overrides,
+        }
+
+    def test_repeated_invalid_rows_fail_instead_of_skipping(self):
+        # kg can't be converted to the Diesel factor's liters
+        invalid = self.row(unit='kg')
+        result = EmissionService.bulk_create_records(
+            [invalid, dict(invalid)], self.organization, skip_duplicates=True
+        )
+
+        self.assertEqual(result.created_count, 0)
+        self.assertEqual(result.skipped, [])
+        self.assertEqual([error['row'] for error in result.errors], [1, 2])
+
+    def test_repeated_valid_rows_are_skipped(self):
+        result = EmissionService.bulk_create_records(
+            [self.row(), self.row()], self.organization, skip_duplicates=True
+        )
+
+        self.assertEqual(result.created_count, 1)
+        self.assertEqual(result.skipped, [2])
+
+    def test_rejected_row_does_not_reserve_its_external_ref(self):
+        result = EmissionService.bulk_upsert_records(
+            [self.row(external_ref='ERP-1', unit='kg'), self.row(external_ref='ERP-1')],
+            self.organization
+        )
+
+        self.assertEqual(result.created_count, 1)
+        self.assertEqual([error['row'] for error in result.errors], [1])
+
+
+class ExternalRefTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_emission_factors', verbosity=0)
+        cls.organization = Organization.objects.create(name='Org')
+        cls.facility = Facility.objects.create(organization=cls.organization, name='Plant')
+
+    def row(self, external_ref, **overrides):
+        return {
+            'external_ref': external_ref,
+            'facility_id': self.facility.id,
+            'scope': 'scope1',
+            'category': 'Diesel',
+            'subcategory': 'Stationary',
+            'quantity': Decimal('100'),
+            'unit': 'liter',
+            'activity_date': date(2024, 1, 15),
+            **overrides,
+        }
+
+    def test_upsert_counts(self):
+        rows = [self.row(f'ERP-{i}', quantity=Decimal(100 + i)) for i in range(3)]
+        first = EmissionService.bulk_upsert_records(rows, self.organization)
+        self.assertEqual((first.created_count, first.updated_count, first.unchanged_count), (3, 0, 0))
+
+        rows[0]['quantity'] = Decimal('500')
+        second = EmissionService.bulk_upsert_records(rows, self.organization)
+        self.assertEqual((second.created_count, second.updated_count, second.unchanged_count), (0, 1, 2))
+        self.assertEqual(second.updated[0].id, first.records[0].id)
+        self.assertEqual(AnalyticsService.verify_summaries(self.organization), [])
+
+    def test_upsert_status_change_is_an_update(self):
+        EmissionService.bulk_upsert_records([self.row('ERP-1')], self.organization)
+
+        result = EmissionService.bulk_upsert_records([self.row('ERP-1', status='verified')], self.organization)
+        self.assertEqual((result.updated_count, result.unchanged_count), (1, 0))
+        self.assertEqual(EmissionRecord.objects.get(external_ref='ERP-1').status, 'verified')
+
+        # Without a status in the row the stored one is kept
+        result = EmissionService.bulk_upsert_records([self.row('ERP-1')], self.organization)
+        self.assertEqual(result.unchanged_count, 1)
+        self.assertEqual(EmissionRecord.objects.get(external_ref='ERP-1').status, 'verified')
+
+    def test_bulk_create_reports_duplicate_refs_per_row(self):
+        EmissionService.bulk_create_records([self.row('ERP-1')], self.organization)
+
+        result = EmissionService.bulk_create_records([
+            self.row('ERP-1', quantity=Decimal('5')),
+            self.row('ERP-2'),
+            self.row('ERP-2', quantity=Decimal('7')),
+            self.row(None, quantity=Decimal('8')),
+            self.row(None, quantity=Decimal('9')),
+        ], self.organization)
+
+        self.assertEqual(result.created_count, 3)
+        self.assertEqual(result.errors, [
+            {'row': 1, 'error': 'external_ref ERP-1 already exists'},
+            {'row': 3, 'error': 'Duplicate external_ref ERP-2'},
+        ])
+
+    def test_api_blank_ref_is_stored_as_null(self):
+        payload = {
+            'organization': str(self.organization.id),
+            'facility': str(self.facility.id),
+            'scope': 'scope1',
+            'category': 'Diesel',
+            'subcategory': 'Stationary',
+            'quantity': '10',
+            'unit': 'liter',
+            'activity_date': '2024-01-15',
+            'external_ref': '',
+        }
+        for quantity in ('10', '20'):
+            response = self.client.post(
+                '/api/v1/emissions/', {**payload, 'quantity': quantity}, content_type='application/json'
+            )
+            self.assertEqual(response.status_code, 201, response.content)
+            self.assertIsNone(response.json()['external_ref'])
+
+        response = self.client.post(
+            '/api/v1/emissions/', {**payload, 'external_ref': 'ERP-9'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post(
+            '/api/v1/emissions/', {**payload, 'external_ref': 'ERP-9'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('external_ref', response.json())
+
+
+class CalculatorCacheTests(TestCase):
+    def test_caches_are_bounded(self):
+        for i in range(ROUTE_CACHE_SIZE + 10):
+            CalculatorFactory.get_calculator(f'Category {i}')
+        self.assertEqual(CalculatorFactory._routed_calculator.cache_info().currsize, ROUTE_CACHE_SIZE)
+
+        # Every padding of a unit is a valid, distinct spelling
+        for i in range(CONVERSION_CACHE_SIZE + 10):
+            self.assertEqual(CalculatorFactory.conversion_factor(' ' * i + 'MWh', 'kWh'), Decimal('1000'))
+        self.assertEqual(CalculatorFactory.conversion_factor.cache_info().currsize, CONVERSION_CACHE_SIZE)
+
+
+class VectorizedCalculatorTests(TestCase):
+    CO2E_PLACES = Decimal(1).scaleb(-CO2E_DECIMAL_PLACES)
+
+    def decimal_path(self, quantities, factors, categories, **kwargs):
+        return [
+            CalculatorFactory.get_calculator(category).calculate(quantity, factor, **kwargs).quantize(
+                self.CO2E_PLACES, ROUND_HALF_EVEN
+            )
+            for quantity, factor, category in zip(quantities, factors, categories)
+        ]
+
+    def test_matches_decimal_path_exactly(self):
+        rng = random.Random(2024)
+        categories = ['Electricity', 'Refrigerant R-410A', 'Flight', 'Diesel']
+        quantities = [Decimal(rng.randrange(0, 10 ** 9)).scaleb(-4) for _ in range(2000)]
+        factors = [Decimal(rng.randrange(0, 10 ** 7)).scaleb(-6) for _ in range(2000)]
+        rows = [rng.choice(categories) for _ in range(2000)]
+        # Products landing exactly halfway must round to even, like Decimal
+        quantities += [Decimal('0.0001'), Decimal('0.0003'), Decimal('12.5')]
+        factors += [Decimal('0.500000'), Decimal('0.500000'), Decimal('0.000001')]
+        rows += ['Diesel'] * 3
+
+        for use_rf in (True, False):
+            expected = self.decimal_path(quantities, factors, rows, use_rf=use_rf)
+            result = VectorizedCalculator.calculate(quantities, factors, rows, use_rf=use_rf)
+            self.assertEqual(VectorizedCalculator.to_decimal(result), expected)
+
+    def test_unit_conversion_is_folded_in_exactly(self):
+        quantities = [Decimal('1.5'), Decimal('2'), Decimal('2500')]
+        units = ['MWh', 'GJ', 'kWh']
+        conversion = UNITS.factor_table(units, 'kWh')
+        result = VectorizedCalculator.calculate(
+            quantities, [Decimal('0.708000')] * 3, ['Electricity'] * 3, conversion=conversion
+        )
+
+        converted = [quantity * UNITS.factor(unit, 'kWh') for quantity, unit in zip(quantities, units)]
+        self.assertEqual(
+            VectorizedCalculator.to_decimal(result),
+            self.decimal_path(converted, [Decimal('0.708000')] * 3, ['Electricity'] * 3)
+        )
+
+    def test_rejects_negative_quantities(self):
+        with self.assertRaises(ValueError):
+            VectorizedCalculator.calculate([Decimal('-1')], [Decimal('1')], ['Diesel'])
+
+
+class UnitRegistryTests(TestCase):
+    def test_aliases_are_case_and_space_insensitive(self):
+        for spelling in ('kWh', 'kwh', ' KWH ', 'kilowatt-hour'):
+            self.assertEqual(UNITS.canonical(spelling), 'kWh')
+
+    def test_multi_hop_and_reverse_factors(self):
+        # MWh -> kWh -> MJ -> GJ
+        self.assertEqual(UNITS.factor('MWh', 'GJ'), Decimal('3.6'))
+        self.assertEqual(UNITS.convert('2500', 'kWh', 'MWh'), Decimal('2.5'))
+        self.assertEqual(UNITS.factor('GJ', 'MWh'), Decimal('0.2777777777777778'))
+        self.assertEqual(UNITS.factor('tonne', 'g'), Decimal('1000000'))
+        self.assertEqual(UNITS.factor('kg', 'kg'), Decimal('1'))
+
+    def test_incompatible_or_unknown_units_raise(self):
+        with self.assertRaises(ValueError):
+            UNITS.factor('kWh', 'kg')
+        with self.assertRaises(ValueError):
+            UNITS.factor('furlong', 'km')
+
+    def test_factor_table_resolves_each_pair_once(self):
+        codes, factors = UNITS.factor_table(['MWh', 'kWh', 'megawatt-hour', 'MWh'], 'kWh')
+        self.assertEqual(list(codes), [0, 1, 2, 0])
+        self.assertEqual(factors, [Decimal('1000'), Decimal('1'), Decimal('1000')])
+
+    def test_definitions_reset_the_closure(self):
+        registry = UnitRegistry()
+        registry.define('a', 'x')
+        registry.define('b', 'x')
+        registry.relate('a', 'b', '2')
+        self.assertEqual(registry.factor('b', 'a'), Decimal('0.5'))
+        registry.define('c', 'x')
+        registry.relate('b', 'c', '3')
+        self.assertEqual(registry.factor('a', 'c'), Decimal('6'))
+
+
+class EmissionReadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_emission_factors', verbosity=0)
+        cls.organization = Organization.objects.create(name='Org')
+        cls.facility = Facility.objects.create(organization=cls.organization, name='Plant')
+        # Repeated dates exercise the created_at/id tie-breakers
+        days = [date(2024, 1, 15), date(2024, 1, 15), date(2024, 2, 1), date(2024, 3, 9),
+                date(2024, 3, 9), date(2024, 3, 9), date(2024, 4, 20)]
+        result = EmissionService.bulk_create_records([
+            {
+                'facility_id': cls.facility.id,
+                'scope': 'scope1',
+                'category': 'Diesel',
+                'subcategory': 'Stationary',
+                'quantity': Decimal(100 + i),
+                'unit': 'liter',
+                'activity_date': day,
+            }
+            for i, day in enumerate(days)
+        ], cls.organization)
+        assert result.created_count == len(days), result.errors
+        other = Organization.objects.create(name='Other')
+        EmissionService.bulk_create_records([{
+            'facility_id': Facility.objects.create(organization=other, name='Elsewhere').id,
+            'scope': 'scope1',
+            'category': 'Diesel',
+            'subcategory': 'Stationary',
+            'quantity': Decimal('1'),
+            'unit': 'liter',
+            'activity_date': date(2024, 1, 1),
+        }], other)
+
+    def list_url(self):
+        return '/api/v1/emissions/'
+
+    def params(self, **extra):
+        return {'organization': str(self.organization.id), **extra}
+
+    def test_cursor_pages_cover_every_record_once_in_order(self):
+        expected = [
+            str(pk) for pk in EmissionRecord.objects.filter(organization=self.organization).order_by(
+                '-activity_date', '-created_at', '-id'
+            ).values_list('id', flat=True)
+        ]
+        for lean in ('false', 'true'):
+            seen = []
+            response = self.client.get(self.list_url(), self.params(pagination='cursor', page_size=2, lean=lean))
+            while True:
+                self.assertEqual(response.status_code, 200)
+                body = response.json()
+                self.assertNotIn('count', body)
+                seen += [row['id'] for row in body['results']]
+                if not body['next']:
+                    break
+                response = self.client.get(body['next'])
+            self.assertEqual(seen, expected)
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(self.list_url(), self.params(cursor='not-a-cursor'))
+        self.assertEqual(response.status_code, 404)
+
+    def test_lean_rows_match_serializer_output(self):
+        full = self.client.get(self.list_url(), self.params()).json()['results']
+        lean = self.client.get(self.list_url(), self.params(lean='true')).json()['results']
+
+        self.assertEqual(len(lean), 7)
+        full_by_id = {row['id']: row for row in full}
+        for row in lean:
+            expected = full_by_id[row['id']]
+            for name, value in row.items():
+                if name in expected:
+                    self.assertEqual(value, expected[name], name)
+
+    def test_sparse_fieldsets(self):
+        for lean in ('false', 'true'):
+            response = self.client.get(self.list_url(), self.params(fields='id,co2e_calculated', lean=lean))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(set(response.json()['results'][0]), {'id', 'co2e_calculated'})
+
+            response = self.client.get(self.list_url(), self.params(exclude='notes', lean=lean))
+            self.assertNotIn('notes', response.json()['results'][0])
+
+        response = self.client.get(self.list_url(), self.params(fields='id,password'))
+        self.assertEqual(response.status_code, 400)
+
+    def test_orjson_renderer_matches_stock_renderer(self):
+        data = EmissionRecordSerializer(
+            EmissionRecord.objects.filter(organization=self.organization), many=True
+        ).data
+        self.assertEqual(
+            json.loads(ORJSONRenderer().render(data)),
+            json.loads(JSONRenderer().render(data))
+        )
+
+    def test_csv_export(self):
+        response = self.client.get(f'{self.list_url()}export/', self.params())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('attachment;', response['Content-Disposition'])
+
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode('utf-8'))))
+        self.assertEqual(rows[0], [name for name, _ in EXPORT_COLUMNS])
+        self.assertEqual(len(rows), 8)
+        stored = {
+            str(pk): str(co2e) for pk, co2e in
+            EmissionRecord.objects.filter(organization=self.organization).values_list('id', 'co2e_calculated')
+        }
+        co2e = rows[0].index('co2e_calculated')
+        self.assertEqual({row[0]: row[co2e] for row in rows[1:]}, stored)
+
+    def test_parquet_export(self):
+        import pyarrow.parquet as pq
+
+        response = self.client.get(f'{self.list_url()}export/', self.params(export_format='parquet'))
+        self.assertEqual(response.status_code, 200)
+        table = pq.read_table(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(table.num_rows, 7)
+        self.assertEqual(table.column_names, [name for name, _ in EXPORT_COLUMNS])
+        self.assertEqual(
+            sorted(table.column('co2e_calculated').to_pylist()),
+            sorted(EmissionRecord.objects.filter(organization=self.organization).values_list(
+                'co2e_calculated', flat=True
+            ))
+        )
+
+    def test_unknown_export_format_is_rejected(self):
+        response = self.client.get(f'{self.list_url()}export/', self.params(export_format='xlsx'))
+        self.assertEqual(response.status_code, 400)
@@ -1,10 +1,16 @@
 from rest_framework import viewsets, status, filters
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from .exports import EmissionExporter, EXPORT_FORMATS
 from .models import EmissionRecord
+from .pagination import EmissionKeysetPagination
 from .serializers import EmissionRecordSerializer
-from .services import EmissionService
+from .services import EmissionService, LEAN_COLUMNS
 
 
 class EmissionRecordViewSet(viewsets.ModelViewSet):
@@ -18,16 +24,101 @@ class EmissionRecordViewSet(viewsets.ModelViewSet):
     search_fields = ['category', 'subcategory', 'notes']
     ordering_fields = ['activity_date', 'co2e_calculated', 'created_at']
 
+    # Columns always loaded so ordering and cursors never hit deferred fields
+    ALWAYS_LOADED = ['id', 'activity_date', 'created_at']
+
     def get_queryset(self):
         """
         Filter queryset by user's organization if provided.
+        Reads with fields=/exclude= load only the columns and joins the
+        selected fields need.
         """
         queryset = super().get_queryset()
         org_id = self.request.query_params.get('organization', None)
         if org_id:
             queryset = queryset.filter(organization_id=org_id)
+        
+        if self.action in ('list', 'retrieve') and not self._lean_requested():
+            selection = self._field_selection()
+            if selection:
+                columns = self.get_serializer(**selection).source_columns()
+                relations = {column.split('__')[0] for column in columns if '__' in column}
+                queryset = queryset.select_related(None)
+                if relations:
+                    queryset = queryset.select_related(*relations)
+                queryset = queryset.only(*self.ALWAYS_LOADED, *columns)
         return queryset
 
+    def get_serializer(self, *args, **kwargs):
+        """
+        Read responses honour fields=a,b and exclude=a,b.
+        """
+        if self.action in ('list', 'retrieve') and 'fields' not in kwargs and 'exclude' not in kwargs:
+            kwargs.update(self._field_selection())
+        return super().get_serializer(*args, **kwargs)
+
+    def _field_selection(self):
+        """
+        fields/exclude kwargs for the serializer from the query string.
+        Raises ValidationError for unknown names.
+        """
+        selection = {}
+        known = set(EmissionRecordSerializer.Meta.fields)
+        for param in ('fields', 'exclude'):
+            names = self._requested_fields(param)
+            if not names:
+                continue
+            unknown = [name for name in names if name not in known]
+            if unknown:
+                raise ValidationError({param: f"Unknown field(s): {', '.join(unknown)}"})
+            selection[param] = names
+        return selection
+
+    def _lean_requested(self):
+        return self.request.query_params.get('lean', '').lower() in ('1', 'true', 'yes')
+
+    def list(self, request, *args, **kwargs):
+        """
+        Serializer output by default. With ?lean=true rows are built
+        straight from .values() instead, optionally narrowed with
+        fields=a,b,c or exclude=a,b, for read-heavy clients.
+        """
+        if not self._lean_requested():
+            return super().list(request, *args, **kwargs)
+        
+        fields = self._requested_fields('fields')
+        excluded = self._requested_fields('exclude')
+        if excluded:
+            fields = [name for name in (fields or LEAN_COLUMNS) if name not in excluded]
+        if fields and isinstance(self.paginator, EmissionKeysetPagination):
+            fields += [name for name in EmissionKeysetPagination.position_fields if name not in fields]
+        try:
+            queryset = EmissionService.lean_queryset(self.filter_queryset(self.get_queryset()), fields)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(list(queryset))
+
+    def _requested_fields(self, param):
+        value = self.request.query_params.get(param, '')
+        return [name.strip() for name in value.split(',') if name.strip()]
+
+    @property
+    def paginator(self):
+        """
+        Page-number pagination by default; keyset pagination for
+        ?pagination=cursor so deep pages of large syncs stay cheap.
+        """
+        if not hasattr(self, '_paginator'):
+            if EmissionKeysetPagination.is_requested(self.request):
+                self._paginator = EmissionKeysetPagination()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
+
     def create(self, request, *args, **kwargs):
         """
         Overridden create to use EmissionService for calculation.
@@ -50,11 +141,41 @@ class EmissionRecordViewSet(viewsets.ModelViewSet):
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+    def perform_update(self, serializer):
+        """
+        Route updates through EmissionService so CO2e is recalculated and
+        the monthly summaries stay in step.
+        """
+        try:
+            serializer.instance = EmissionService.update_record(
+                serializer.instance,
+                serializer.validated_data
+            )
+        except ValueError as e:
+            raise ValidationError({'error': str(e)})
+
+    def perform_destroy(self, instance):
+        EmissionService.delete_record(instance)
+
+    @action(detail=True, methods=['post'])
+    def restore(self, request, pk=None):
+        """
+        Restore a soft-deleted record.
+        """
+        try:
+            record = EmissionRecord.all_objects.get(pk=pk)
+        except (EmissionRecord.DoesNotExist, ValueError, DjangoValidationError):
+            return Response({'error': 'Record not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        record = EmissionService.restore_record(record)
+        return Response(EmissionRecordSerializer(record).data)
+
     @action(detail=False, methods=['post'])
     def bulk_create(self, request):
         """
         Bulk creation of records.
-        Expects a list of record objects.
+        Expects a list of record objects. With skip_duplicates=true, rows
+        matching an existing record's natural key are skipped.
         """
         records_data = request.data.get('records', [])
         organization_id = request.data.get('organization')
@@ -69,15 +190,104 @@ class EmissionRecordViewSet(viewsets.ModelViewSet):
             from apps.organizations.models import Organization
             organization = Organization.objects.get(id=organization_id)
             
-            records = EmissionService.bulk_create_records(
+            skip_duplicates = str(request.data.get('skip_duplicates', '')).lower() in ('1', 'true', 'yes')
+            result = EmissionService.bulk_create_records(
+                records_list=records_data,
+                organization=organization,
+                user=request.user if not request.user.is_anonymous else None,
+                skip_duplicates=skip_duplicates
+            )
+            
+            if result.created_count:
+                response_status = status.HTTP_201_CREATED
+            elif result.skipped_count and not result.failed_count:
+                response_status = status.HTTP_200_OK
+            else:
+                response_status = status.HTTP_400_BAD_REQUEST
+            return Response(
+                {
+                    'message': f'Successfully created {result.created_count} records',
+                    'created': result.created_count,
+                    'skipped': result.skipped_count,
+                    'failed': result.failed_count,
+                    'errors': result.errors,
+                },
+                status=response_status
+            )
+        except Exception as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['post'], url_path='bulk-upsert')
+    def bulk_upsert(self, request):
+        """
+        Creates or updates records keyed by external_ref.
+        Expects a list of record objects, each with an external_ref.
+        Returns created/updated/unchanged counts and per-row errors.
+        """
+        records_data = request.data.get('records', [])
+        organization_id = request.data.get('organization')
+        
+        if not records_data or not organization_id:
+            return Response(
+                {'error': 'Records and organization are required'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            from apps.organizations.models import Organization
+            organization = Organization.objects.get(id=organization_id)
+            
+            result = EmissionService.bulk_upsert_records(
                 records_list=records_data,
                 organization=organization,
                 user=request.user if not request.user.is_anonymous else None
             )
             
+            written = result.created_count or result.updated_count or result.unchanged_count
             return Response(
-                {'message': f'Successfully created {len(records)} records'}, 
-                status=status.HTTP_201_CREATED
+                {
+                    'created': result.created_count,
+                    'updated': result.updated_count,
+                    'unchanged': result.unchanged_count,
+                    'failed': result.failed_count,
+                    'errors': result.errors,
+                },
+                status=status.HTTP_200_OK if written else status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Streams the filtered records as CSV (default) or Parquet.
+        Accepts the same filters as the list endpoint plus
+        export_format=csv|parquet.
+        """
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'error': f"Unsupported export format: {export_format}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if export_format == 'parquet':
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                return Response(
+                    {'error': 'Parquet export requires pyarrow'},
+                    status=status.HTTP_501_NOT_IMPLEMENTED
+                )
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        content_type, extension = EXPORT_FORMATS[export_format]
+        stream = (
+            EmissionExporter.iter_parquet(queryset)
+            if export_format == 'parquet'
+            else EmissionExporter.iter_csv(queryset)
+        )
+        
+        response = StreamingHttpResponse(stream, content_type=content_type)
+        filename = f"emissions_{timezone.now():%Y%m%d}.{extension}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
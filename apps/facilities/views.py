@@ -2,11 +2,24 @@
 Facility API views.
 """
 
-from rest_framework import viewsets
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import Facility
 from .serializers import FacilitySerializer, FacilityCreateSerializer
+from apps.analytics.services import AnalyticsService
+from apps.core.constants import SCOPE_DICT
+from apps.emissions.models import EmissionRecord
+from apps.emissions.pagination import EmissionKeysetPagination
+from apps.emissions.services import EmissionService
+
+
+# Record columns returned by the emissions drilldown
+FACILITY_RECORD_FIELDS = [
+    'id', 'scope', 'category', 'subcategory', 'quantity', 'unit',
+    'emission_factor_used', 'co2e_calculated', 'activity_date',
+    'reporting_period', 'status', 'created_at',
+]
 
 
 class FacilityViewSet(viewsets.ModelViewSet):
@@ -37,14 +50,39 @@ class FacilityViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def emissions(self, request, pk=None):
         """
-        Get emissions for this facility.
-        TODO: Implement when emissions app is ready.
+        Emissions drilldown for this facility.
+        Totals, per-period and per-category breakdowns come from the
+        summaries; 'records' is a keyset-paginated page of the raw records
+        (follow records.next). Accepts period_from, period_to, scope and
+        page_size.
         """
         facility = self.get_object()
+        params = request.query_params
+        period_from = params.get('period_from')
+        period_to = params.get('period_to')
+        scope = params.get('scope')
+        
+        if scope and scope not in SCOPE_DICT:
+            return Response({'error': f"Unknown scope: {scope}"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            data = AnalyticsService.get_facility_breakdown(facility, period_from, period_to, scope)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        records = EmissionRecord.objects.filter(facility=facility)
+        if period_from:
+            records = records.filter(reporting_period__gte=period_from)
+        if period_to:
+            records = records.filter(reporting_period__lte=period_to)
+        if scope:
+            records = records.filter(scope=scope)
         
-        # Placeholder - will be implemented with emissions app
-        return Response({
-            'facility_id': str(facility.id),
-            'facility_name': facility.name,
-            'message': 'Emissions data will be available after emissions app is implemented'
-        })
+        paginator = EmissionKeysetPagination()
+        page = paginator.paginate_queryset(
+            EmissionService.lean_queryset(records, FACILITY_RECORD_FIELDS), request, view=self
+        )
+        data['records'] = {
+            'next': paginator.get_next_link(),
+            'results': page,
+        }
+        return Response(data)
@@ -4,6 +4,16 @@ Organization serializers for API.
 
 from rest_framework import serializers
 from .models import Organization
+from apps.core.utils import fiscal_start_month
+
+
+def validate_fiscal_year_start(value):
+    """Validate fiscal year start is a real MM-DD date."""
+    try:
+        fiscal_start_month(value)
+    except ValueError as e:
+        raise serializers.ValidationError(str(e))
+    return value
 
 
 class OrganizationSerializer(serializers.ModelSerializer):
@@ -24,6 +34,9 @@ class OrganizationSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+    
+    def validate_fiscal_year_start(self, value):
+        return validate_fiscal_year_start(value)
 
 
 class OrganizationCreateSerializer(serializers.ModelSerializer):
@@ -39,3 +52,6 @@ class OrganizationCreateSerializer(serializers.ModelSerializer):
         if value < 1990 or value > 2030:
             raise serializers.ValidationError("Baseline year must be between 1990 and 2030")
         return value
+    
+    def validate_fiscal_year_start(self, value):
+        return validate_fiscal_year_start(value)
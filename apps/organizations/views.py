@@ -2,11 +2,13 @@
 Organization API views.
 """
 
+import uuid
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import Organization
 from .serializers import OrganizationSerializer, OrganizationCreateSerializer
+from apps.analytics.services import AnalyticsService
 
 
 class OrganizationViewSet(viewsets.ModelViewSet):
@@ -29,21 +31,41 @@ class OrganizationViewSet(viewsets.ModelViewSet):
             return OrganizationCreateSerializer
         return OrganizationSerializer
     
+    def perform_update(self, serializer):
+        """Re-bucket the fiscal summaries when the fiscal year start moves."""
+        previous_start = serializer.instance.fiscal_year_start
+        organization = serializer.save()
+        if organization.fiscal_year_start != previous_start:
+            AnalyticsService.rebuild_fiscal_summaries(organization)
+    
     @action(detail=True, methods=['get'])
     def stats(self, request, pk=None):
         """
-        Get organization statistics.
-        Returns basic stats for now, will be enhanced with emission data.
+        Get organization statistics: facilities, record count, totals by
+        scope, last activity date, verified share and top facilities.
         """
         organization = self.get_object()
+        stats = AnalyticsService.get_organization_stats([organization])
+        return Response(stats[organization.id])
+    
+    @action(detail=False, methods=['get'], url_path='stats', url_name='stats-list')
+    def stats_list(self, request):
+        """
+        Statistics for a page of organizations, optionally narrowed with
+        ?ids=<uuid>,<uuid>. Costs the same few queries for any page size.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        ids = [value.strip() for value in request.query_params.get('ids', '').split(',') if value.strip()]
+        if ids:
+            try:
+                queryset = queryset.filter(id__in=[uuid.UUID(value) for value in ids])
+            except ValueError:
+                return Response({'error': 'ids must be organization UUIDs'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # TODO: Add emission statistics when analytics app is ready
-        stats = {
-            'organization_id': str(organization.id),
-            'name': organization.name,
-            'baseline_year': organization.baseline_year,
-            'facilities_count': organization.facility_set.count(),
-            'is_active': organization.is_active,
-        }
-        
-        return Response(stats)
+        page = self.paginate_queryset(queryset)
+        organizations = page if page is not None else list(queryset)
+        stats = AnalyticsService.get_organization_stats(organizations)
+        results = [stats[organization.id] for organization in organizations]
+        if page is not None:
+            return self.get_paginated_response(results)
+        return Response(results)
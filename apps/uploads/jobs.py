@@ -0,0 +1,112 @@
+"""
+In-process background job runner for bulk uploads.
+
+UploadedFile rows double as the job queue: every bulk upload in 'pending'
+state is a queued job. Workers claim a job with a conditional UPDATE, so an
+upload is processed exactly once even when several processes share the
+database. No external broker is required.
+
+A job left in 'processing' by a worker that crashed or was restarted is
+stale once neither its start nor its last progress write is newer than
+UPLOAD_JOB_TIMEOUT_SECONDS; it is then claimed again like a pending one.
+Reprocessing is safe because rows already imported are skipped.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import UploadedFile
+from .services import UploadService
+
+logger = logging.getLogger(__name__)
+
+
+class UploadJobRunner:
+    """
+    Runs bulk upload processing on a process-wide worker pool.
+    """
+    _executor = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def enqueue(cls, upload_id):
+        """
+        Schedules processing of an upload once the current transaction
+        commits, so the worker is guaranteed to see the row.
+        """
+        if settings.UPLOAD_JOBS_EAGER:
+            transaction.on_commit(lambda: cls.run(upload_id))
+        else:
+            transaction.on_commit(lambda: cls._get_executor().submit(cls._run_in_worker, upload_id))
+        return upload_id
+
+    @staticmethod
+    def claimable():
+        """
+        Q for jobs a worker may claim: pending ones, and 'processing' ones
+        whose worker stopped reporting progress.
+        """
+        cutoff = timezone.now() - timedelta(seconds=settings.UPLOAD_JOB_TIMEOUT_SECONDS)
+        return Q(processing_status='pending') | Q(
+            processing_status='processing',
+            started_at__lt=cutoff,
+            updated_at__lt=cutoff
+        )
+
+    @staticmethod
+    def pending_upload_ids():
+        """
+        Ids of queued and stale bulk uploads, oldest first.
+        """
+        return list(
+            UploadedFile.objects.filter(
+                UploadJobRunner.claimable(),
+                file_type='bulk_upload'
+            ).order_by('created_at').values_list('id', flat=True)
+        )
+
+    @staticmethod
+    def run(upload_id):
+        """
+        Claims and processes one upload in the calling thread.
+        Returns False if the job was already claimed by another worker.
+        """
+        now = timezone.now()
+        claimed = UploadedFile.objects.filter(
+            UploadJobRunner.claimable(),
+            pk=upload_id
+        ).update(processing_status='processing', started_at=now, updated_at=now)
+        if not claimed:
+            return False
+        
+        upload = UploadedFile.objects.select_related('organization', 'uploaded_by').get(pk=upload_id)
+        try:
+            UploadService.process_bulk_upload(upload)
+        except Exception:
+            # Failure details are recorded on the upload by UploadService
+            logger.exception("Bulk upload %s failed", upload_id)
+        return True
+
+    @classmethod
+    def _run_in_worker(cls, upload_id):
+        close_old_connections()
+        try:
+            return cls.run(upload_id)
+        finally:
+            # Worker threads own their connection; don't leak it
+            connection.close()
+
+    @classmethod
+    def _get_executor(cls):
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=settings.UPLOAD_WORKERS,
+                    thread_name_prefix='upload-worker'
+                )
+            return cls._executor
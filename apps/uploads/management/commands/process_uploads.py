@@ -0,0 +1,41 @@
+import time
+from django.core.management.base import BaseCommand
+from apps.uploads.models import UploadedFile
+from apps.uploads.jobs import UploadJobRunner
+
+
+class Command(BaseCommand):
+    help = (
+        'Processes pending bulk uploads and reclaims stale ones left in processing '
+        '(standalone worker or recovery after a restart)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--watch',
+            action='store_true',
+            help='Keep polling for new pending uploads instead of exiting'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Polling interval in seconds when --watch is set'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            for upload_id in UploadJobRunner.pending_upload_ids():
+                if UploadJobRunner.run(upload_id):
+                    upload = UploadedFile.objects.get(pk=upload_id)
+                    self.stdout.write(
+                        f"{upload.file_name}: {upload.processing_status} "
+                        f"({upload.records_created} created, {upload.rows_failed} failed, "
+                        f"{upload.throughput:,.0f} rows/s)"
+                    )
+            
+            if not options['watch']:
+                break
+            time.sleep(options['interval'])
+        
+        self.stdout.write(self.style.SUCCESS("Done processing pending uploads."))
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.1 on 2026-10-18 15:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0001_initial'),
+        ('uploads', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='rows_failed',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='rows_processed',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='throughput',
+            field=models.FloatField(default=0, help_text='Rows processed per second'),
+        ),
+        migrations.AddIndex(
+            model_name='uploadedfile',
+            index=models.Index(fields=['processing_status', 'created_at'], name='uploaded_fi_process_39ce32_idx'),
+        ),
+    ]
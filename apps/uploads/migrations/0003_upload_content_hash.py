@@ -0,0 +1,36 @@
+# Generated by Django 5.0.1 on 2026-10-18 16:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0001_initial'),
+        ('uploads', '0002_upload_job_progress'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='content_hash',
+            field=models.CharField(blank=True, help_text='sha256 of the file contents', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, help_text='Earlier upload with identical contents; this one was not imported', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='uploads.uploadedfile'),
+        ),
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='rows_skipped',
+            field=models.IntegerField(default=0, help_text='Rows already imported before'),
+        ),
+        migrations.AddIndex(
+            model_name='uploadedfile',
+            index=models.Index(fields=['organization', 'content_hash'], name='uploaded_fi_organiz_4ca80b_idx'),
+        ),
+    ]
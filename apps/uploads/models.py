@@ -38,6 +38,25 @@ class UploadedFile(BaseModel):
     records_created = models.IntegerField(default=0)
     error_message = models.TextField(blank=True)
     
+    # Deduplication
+    content_hash = models.CharField(max_length=64, blank=True, help_text="sha256 of the file contents")
+    duplicate_of = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='duplicates',
+        help_text="Earlier upload with identical contents; this one was not imported"
+    )
+    rows_skipped = models.IntegerField(default=0, help_text="Rows already imported before")
+    
+    # Background job progress
+    rows_processed = models.IntegerField(default=0)
+    rows_failed = models.IntegerField(default=0)
+    throughput = models.FloatField(default=0, help_text="Rows processed per second")
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
     uploaded_by = models.ForeignKey(
         'auth.User', 
         on_delete=models.SET_NULL, 
@@ -47,6 +66,10 @@ class UploadedFile(BaseModel):
     class Meta:
         db_table = 'uploaded_files'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['processing_status', 'created_at']),
+            models.Index(fields=['organization', 'content_hash']),
+        ]
 
     def __str__(self):
         return f"{self.file_name} - {self.processing_status}"
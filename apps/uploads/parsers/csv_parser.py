@@ -10,10 +10,22 @@ class CSVParser:
     
     EXPECTED_COLUMNS = [
         'facility_id', 'scope', 'category', 'subcategory', 
-        'quantity', 'unit', 'emission_factor_used', 
+        'quantity', 'unit',
         'activity_date', 'notes'
     ]
 
+    # Blank or missing emission_factor_used values are resolved from the
+    # factor library by facility region and activity year; external_ref is
+    # the row's id in the source system
+    OPTIONAL_COLUMNS = ['emission_factor_used', 'external_ref']
+
+    # Read as text so chunked reads don't infer different types per chunk
+    TEXT_COLUMNS = [
+        'facility_id', 'scope', 'category', 'subcategory', 'unit', 'activity_date', 'notes', 'external_ref'
+    ]
+
+    DEFAULT_BATCH_SIZE = 5000
+
     @staticmethod
     def parse(file_path):
         """
@@ -22,21 +34,50 @@ class CSVParser:
         df = pd.read_csv(file_path)
         
         # Basic validation of columns
-        for col in CSVParser.EXPECTED_COLUMNS:
-            if col not in df.columns:
-                raise ValueError(f"Missing required column: {col}")
+        CSVParser.validate_columns(df.columns)
         
-        records = df.to_dict('records')
+        return CSVParser._clean_records(df.to_dict('records'))
+
+    @staticmethod
+    def iter_batches(file_path, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Streams the CSV in chunks and yields lists of cleaned record dicts
+        of at most batch_size rows, so memory stays bounded by the batch size
+        rather than the file size.
+        """
+        # Validate the header before reading any data
+        CSVParser.validate_columns(pd.read_csv(file_path, nrows=0).columns)
         
+        reader = pd.read_csv(
+            file_path,
+            chunksize=batch_size,
+            dtype={col: str for col in CSVParser.TEXT_COLUMNS},
+        )
+        with reader:
+            for chunk in reader:
+                yield CSVParser._clean_records(chunk.to_dict('records'))
+
+    @staticmethod
+    def validate_columns(columns):
+        for col in CSVParser.EXPECTED_COLUMNS:
+            if col not in columns:
+                raise ValueError(f"Missing required column: {col}")
+
+    @staticmethod
+    def _clean_records(records):
         # Clean data types
         for record in records:
-            # Convert NaN to empty string for subcategory/notes
-            for key in ['subcategory', 'notes']:
-                if pd.isna(record.get(key)):
-                    record[key] = ''
+            # Convert NaN to empty string for subcategory/notes, None elsewhere
+            for key, value in record.items():
+                if pd.isna(value):
+                    record[key] = '' if key in ('subcategory', 'notes') else None
             
-            # Ensure date is properly formatted
+            # Ensure date is properly formatted; malformed dates are left
+            # as-is and reported per row by EmissionService
             if isinstance(record['activity_date'], str):
-                record['activity_date'] = datetime.strptime(record['activity_date'], '%Y-%m-%d').date()
+                try:
+                    record['activity_date'] = datetime.strptime(record['activity_date'], '%Y-%m-%d').date()
+                except ValueError:
+                    pass
                 
         return records
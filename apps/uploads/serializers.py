@@ -3,7 +3,13 @@ from .models import UploadedFile
 
 
 class UploadedFileSerializer(serializers.ModelSerializer):
+    job_id = serializers.UUIDField(source='id', read_only=True)
+    
     class Meta:
         model = UploadedFile
         fields = '__all__'
-        read_only_fields = ['processing_status', 'records_created', 'error_message']
+        read_only_fields = [
+            'processing_status', 'records_created', 'error_message',
+            'rows_processed', 'rows_failed', 'throughput', 'started_at', 'completed_at',
+            'content_hash', 'duplicate_of', 'rows_skipped'
+        ]
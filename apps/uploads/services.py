@@ -1,6 +1,15 @@
+import hashlib
+import time
+from .models import UploadedFile
 from .parsers.csv_parser import CSVParser
 from apps.emissions.services import EmissionService
+from django.conf import settings
 from django.db import transaction
+from django.utils import timezone
+
+
+# Number of row errors kept for UploadedFile.error_message
+ERROR_SUMMARY_LIMIT = 20
 
 
 class UploadService:
@@ -9,35 +18,129 @@ class UploadService:
     """
     
     @staticmethod
-    def process_bulk_upload(upload_obj):
+    def process_bulk_upload(upload_obj, batch_size=None):
         """
-        Synchronous processing for MVP.
-        In production, this should be a Celery task.
+        Processes a bulk upload. Runs in a background worker via
+        apps.uploads.jobs.UploadJobRunner, or inline when called directly.
+        
+        The file is streamed in batches so peak memory is bounded by the
+        batch size, not the file size. Each batch is committed on its own and
+        progress (rows processed/failed, throughput) is written to the upload
+        after every batch. Rows already imported (same natural key) are
+        skipped, so reprocessing a file only adds what is missing.
+        Returns the number of records created.
         """
+        batch_size = batch_size or settings.UPLOAD_BATCH_SIZE
+        started = time.monotonic()
         upload_obj.processing_status = 'processing'
+        upload_obj.started_at = upload_obj.started_at or timezone.now()
+        # A rerun of a stale job starts over; imported rows come back as skipped
+        upload_obj.rows_processed = 0
+        upload_obj.rows_failed = 0
+        upload_obj.rows_skipped = 0
+        upload_obj.records_created = 0
         upload_obj.save()
         
         try:
-            # 1. Parse file
-            records_data = CSVParser.parse(upload_obj.file.path)
+            errors = []
             
-            # 2. Bulk create using EmissionService
-            with transaction.atomic():
-                created_records = EmissionService.bulk_create_records(
-                    records_list=records_data,
-                    organization=upload_obj.organization,
-                    user=upload_obj.uploaded_by
+            # 1. Parse file batch by batch
+            for records_data in CSVParser.iter_batches(upload_obj.file.path, batch_size=batch_size):
+                # 2. Bulk create using EmissionService
+                with transaction.atomic():
+                    result = EmissionService.bulk_create_records(
+                        records_list=records_data,
+                        organization=upload_obj.organization,
+                        user=upload_obj.uploaded_by,
+                        row_offset=upload_obj.rows_processed,
+                        skip_duplicates=True
+                    )
+                
+                upload_obj.rows_processed += len(records_data)
+                upload_obj.rows_failed += result.failed_count
+                upload_obj.rows_skipped += result.skipped_count
+                upload_obj.records_created += result.created_count
+                upload_obj.throughput = UploadService._throughput(upload_obj.rows_processed, started)
+                # Only keep what the error summary can show
+                errors.extend(result.errors[:ERROR_SUMMARY_LIMIT - len(errors)])
+                
+                # Progress update without touching the other columns;
+                # updated_at is the heartbeat UploadJobRunner checks for stale jobs
+                UploadedFile.objects.filter(pk=upload_obj.pk).update(
+                    rows_processed=upload_obj.rows_processed,
+                    rows_failed=upload_obj.rows_failed,
+                    rows_skipped=upload_obj.rows_skipped,
+                    records_created=upload_obj.records_created,
+                    throughput=upload_obj.throughput,
+                    updated_at=timezone.now()
                 )
                 
             # 3. Update status
             upload_obj.processing_status = 'completed'
-            upload_obj.records_created = len(created_records)
+            upload_obj.error_message = UploadService._format_row_errors(errors, upload_obj.rows_failed)
+            upload_obj.completed_at = timezone.now()
             upload_obj.save()
             
-            return created_records
+            return upload_obj.records_created
             
         except Exception as e:
             upload_obj.processing_status = 'failed'
             upload_obj.error_message = str(e)
+            upload_obj.completed_at = timezone.now()
             upload_obj.save()
             raise e
+
+    @staticmethod
+    def content_hash(file):
+        """sha256 of an uploaded file, read in chunks. Leaves it rewound."""
+        digest = hashlib.sha256()
+        for chunk in file.chunks():
+            digest.update(chunk)
+        file.seek(0)
+        return digest.hexdigest()
+
+    @staticmethod
+    def find_duplicate(upload_obj):
+        """
+        Earliest other bulk upload of the organization with the same
+        contents that wasn't itself a duplicate or a failure, or None.
+        """
+        if not upload_obj.content_hash:
+            return None
+        return UploadedFile.objects.filter(
+            organization_id=upload_obj.organization_id,
+            content_hash=upload_obj.content_hash,
+            file_type='bulk_upload',
+            duplicate_of__isnull=True
+        ).exclude(pk=upload_obj.pk).exclude(processing_status='failed').order_by('created_at').first()
+
+    @staticmethod
+    def mark_duplicate(upload_obj, original):
+        """Completes a re-upload without importing anything."""
+        upload_obj.duplicate_of = original
+        upload_obj.processing_status = 'completed'
+        upload_obj.error_message = (
+            f"Identical to {original.file_name} uploaded {original.created_at:%Y-%m-%d %H:%M}; "
+            f"nothing was imported"
+        )
+        upload_obj.completed_at = timezone.now()
+        upload_obj.save()
+        return upload_obj
+
+    @staticmethod
+    def _throughput(rows, started):
+        elapsed = time.monotonic() - started
+        return round(rows / elapsed, 2) if elapsed > 0 else 0
+
+    @staticmethod
+    def _format_row_errors(errors, failed_count):
+        """
+        Summarizes per-row ingestion errors for UploadedFile.error_message.
+        Row numbers are converted to CSV line numbers (header is line 1).
+        """
+        if not errors:
+            return ''
+        lines = [f"Line {e['row'] + 1}: {e['error']}" for e in errors]
+        if failed_count > len(errors):
+            lines.append(f"... and {failed_count - len(errors)} more rows failed")
+        return '\n'.join(lines)
@@ -0,0 +1,102 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from apps.emissions.models import EmissionRecord
+from apps.facilities.models import Facility
+from apps.organizations.models import Organization
+from .jobs import UploadJobRunner
+from .models import UploadedFile
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, UPLOAD_JOB_TIMEOUT_SECONDS=600)
+class StaleUploadJobTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_emission_factors', verbosity=0)
+        cls.organization = Organization.objects.create(name='Org')
+        cls.facility = Facility.objects.create(organization=cls.organization, name='Plant')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def make_upload(self, processing_status, age):
+        contents = (
+            'facility_id,scope,category,subcategory,quantity,unit,activity_date,notes\n'
+            f'{self.facility.id},scope1,Diesel,Stationary,100,liter,2024-01-15,\n'
+        )
+        upload = UploadedFile.objects.create(
+            organization=self.organization,
+            file=SimpleUploadedFile('data.csv', contents.encode()),
+            file_name='data.csv',
+            processing_status=processing_status
+        )
+        if processing_status == 'processing':
+            stamp = timezone.now() - age
+            UploadedFile.objects.filter(pk=upload.pk).update(started_at=stamp, updated_at=stamp)
+        return upload
+
+    def test_stale_processing_job_is_reclaimed(self):
+        upload = self.make_upload('processing', timedelta(hours=1))
+
+        self.assertIn(upload.id, UploadJobRunner.pending_upload_ids())
+        self.assertTrue(UploadJobRunner.run(upload.id))
+
+        upload.refresh_from_db()
+        self.assertEqual(upload.processing_status, 'completed')
+        self.assertEqual(upload.records_created, 1)
+        self.assertEqual(EmissionRecord.objects.filter(organization=self.organization).count(), 1)
+
+    def test_running_job_is_not_reclaimed(self):
+        upload = self.make_upload('processing', timedelta(minutes=1))
+
+        self.assertNotIn(upload.id, UploadJobRunner.pending_upload_ids())
+        self.assertFalse(UploadJobRunner.run(upload.id))
+
+    def test_pending_job_is_claimed_once(self):
+        upload = self.make_upload('pending', timedelta(0))
+
+        self.assertEqual(UploadJobRunner.pending_upload_ids(), [upload.id])
+        self.assertTrue(UploadJobRunner.run(upload.id))
+        self.assertFalse(UploadJobRunner.run(upload.id))
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ExternalRefUploadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_emission_factors', verbosity=0)
+        cls.organization = Organization.objects.create(name='Org')
+        cls.facility = Facility.objects.create(organization=cls.organization, name='Plant')
+
+    def upload(self, quantities):
+        lines = ['facility_id,scope,category,subcategory,quantity,unit,activity_date,notes,external_ref']
+        lines += [
+            f'{self.facility.id},scope1,Diesel,Stationary,{quantity},liter,2024-01-15,,{1000 + i}'
+            for i, quantity in enumerate(quantities)
+        ]
+        upload = UploadedFile.objects.create(
+            organization=self.organization,
+            file=SimpleUploadedFile('data.csv', '\n'.join(lines).encode()),
+            file_name='data.csv'
+        )
+        UploadJobRunner.run(upload.id)
+        upload.refresh_from_db()
+        return upload
+
+    def test_reupload_with_a_corrected_row_reports_it(self):
+        self.upload([100, 200, 300])
+
+        upload = self.upload([100, 250, 300])
+
+        self.assertEqual(upload.processing_status, 'completed')
+        self.assertEqual((upload.records_created, upload.rows_skipped, upload.rows_failed), (0, 2, 1))
+        self.assertIn('external_ref 1001 already exists', upload.error_message)
+        self.assertEqual(EmissionRecord.objects.filter(external_ref='1001').get().quantity, 200)
@@ -2,6 +2,7 @@ from rest_framework import viewsets, status
 from rest_framework.response import Response
 from .models import UploadedFile
 from .serializers import UploadedFileSerializer
+from .jobs import UploadJobRunner
 from .services import UploadService
 
 
@@ -20,15 +21,19 @@ class UploadedFileViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         """
-        Hook to trigger processing after upload.
+        Hook to queue processing after upload.
+        Bulk uploads are processed by a background worker; the response
+        returns immediately and clients poll the upload (job_id) for progress.
+        A file identical to an earlier upload is completed as a duplicate
+        without processing, unless force=true is sent.
         """
-        instance = serializer.save()
+        instance = serializer.save(content_hash=UploadService.content_hash(serializer.validated_data['file']))
         
-        # Trigger processing if it's a bulk upload
+        # Queue processing if it's a bulk upload
         if instance.file_type == 'bulk_upload':
-            try:
-                UploadService.process_bulk_upload(instance)
-            except Exception:
-                # We handle the error inside the service, 
-                # but we let the view know something happened if needed
-                pass
+            force = str(self.request.data.get('force', '')).lower() in ('1', 'true', 'yes')
+            original = None if force else UploadService.find_duplicate(instance)
+            if original is not None:
+                UploadService.mark_duplicate(instance, original)
+            else:
+                UploadJobRunner.enqueue(instance.id)
@@ -4,7 +4,7 @@ Base settings shared across all environments.
 """
 
 from pathlib import Path
-from decouple import config
+from decouple import config, Csv
 
 # Build paths inside the project
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -98,13 +98,35 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Bulk uploads are streamed and ingested in batches of this many rows
+UPLOAD_BATCH_SIZE = config('UPLOAD_BATCH_SIZE', default=5000, cast=int)
+
+# In-process upload job runner (apps.uploads.jobs)
+UPLOAD_WORKERS = config('UPLOAD_WORKERS', default=2, cast=int)
+UPLOAD_JOBS_EAGER = config('UPLOAD_JOBS_EAGER', default=False, cast=bool)
+# A 'processing' upload with no progress for this long is assumed to belong
+# to a worker that died and is claimed again
+UPLOAD_JOB_TIMEOUT_SECONDS = config('UPLOAD_JOB_TIMEOUT_SECONDS', default=900, cast=int)
+
+# How often each process checks the emission factor library for changes
+# made elsewhere (apps.emission_factors.services)
+EMISSION_FACTOR_CACHE_CHECK_SECONDS = config('EMISSION_FACTOR_CACHE_CHECK_SECONDS', default=5, cast=float)
+
+# Lifetime of cached analytics results. Keys include the summary version,
+# so entries are never served after the summaries change.
+ANALYTICS_CACHE_SECONDS = config('ANALYTICS_CACHE_SECONDS', default=3600, cast=int)
+
+# Modules that register extra calculators with
+# apps.emissions.calculators.CalculatorFactory (comma-separated)
+EMISSION_CALCULATOR_PLUGINS = config('EMISSION_CALCULATOR_PLUGINS', default='', cast=Csv())
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'apps.core.renderers.ORJSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
@@ -1,5 +1,5 @@
 import streamlit as st
-from utils.api_client import APIClient
+from utils.api_client import get_api_client
 
 # Page configuration
 st.set_page_config(
@@ -392,7 +392,7 @@ st.markdown("""
 
 # Initialize API Client
 if 'api' not in st.session_state:
-    st.session_state.api = APIClient()
+    st.session_state.api = get_api_client()
 
 # Sidebar
 with st.sidebar:
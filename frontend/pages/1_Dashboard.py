@@ -3,7 +3,8 @@ import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 from datetime import datetime, timedelta
-from utils.api_client import APIClient
+from functools import partial
+from utils.api_client import get_api_client
 
 st.set_page_config(page_title="Dashboard | Carbon Ledger", layout="wide")
 
@@ -163,15 +164,21 @@ if 'org_id' not in st.session_state:
 else:
     # Initialize API if not present
     if 'api' not in st.session_state:
-        st.session_state.api = APIClient()
+        st.session_state.api = get_api_client()
         
     api = st.session_state.api
     org_id = st.session_state.org_id
 
     try:
-        # Fetch data
-        stats = api.get_dashboard_stats(org_id, period=None)
-        records = api.get_emission_records(org_id)
+        # Fetch data concurrently; the records table only needs five columns
+        stats, trend, records = api.gather(
+            partial(api.get_dashboard_stats, org_id, period=None),
+            partial(api.get_emissions_trend, org_id),
+            partial(
+                api.get_emission_records,
+                org_id, fields=['category', 'scope', 'quantity', 'unit', 'activity_date']
+            ),
+        )
         
         # Top metrics
         col1, col2, col3, col4 = st.columns(4)
@@ -250,9 +257,12 @@ else:
         with col2:
             st.markdown('<div class="chart-container"><div class="chart-title">Monthly Emissions Trend</div><div class="chart-subtitle">Total carbon emissions over the past 12 months.</div></div>', unsafe_allow_html=True)
             
-            # Generate sample monthly data
-            months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-            emissions_trend = [180, 195, 200, 230, 235, 210, 245, 240, 260, 280, 285, 290]
+            # Last 12 months, gap-filled by the API
+            months = [
+                datetime.strptime(point['period'], '%Y-%m').strftime('%b %y')
+                for point in trend['results']
+            ]
+            emissions_trend = [point['total_co2e'] for point in trend['results']]
             
             fig_line = go.Figure(data=go.Scatter(
                 x=months,
@@ -286,11 +296,10 @@ else:
                 st.switch_page("pages/2_Add_Emissions.py")
         
         with col_actions1:
-            st.download_button(
-                label="Download Report",
-                data="Sample CSV data",
-                file_name="emissions_report.csv",
-                mime="text/csv",
+            # The API streams the export straight to the browser
+            st.link_button(
+                "Download Report",
+                api.get_emissions_export_url(org_id),
                 use_container_width=False
             )
         
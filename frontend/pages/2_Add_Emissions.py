@@ -1,6 +1,7 @@
 import streamlit as st
 import datetime
-from utils.api_client import APIClient
+from functools import partial
+from utils.api_client import get_api_client
 
 st.set_page_config(page_title="Add Emissions | Carbon Ledger", layout="centered")
 
@@ -116,12 +117,18 @@ if 'org_id' not in st.session_state:
 else:
     # Initialize API if not present
     if 'api' not in st.session_state:
-        from utils.api_client import APIClient
-        st.session_state.api = APIClient()
+        st.session_state.api = get_api_client()
         
     api = st.session_state.api
     org_id = st.session_state.org_id
     
+    # Fetch everything the form needs concurrently
+    efs, facilities = api.gather(
+        api.get_emission_factor_library,
+        partial(api.get_facilities, org_id),
+        return_exceptions=True
+    )
+    
     # Activity Details Section
     st.markdown('<div class="form-section"><div class="section-title">Activity Details</div></div>', unsafe_allow_html=True)
     
@@ -130,7 +137,8 @@ else:
     with col1:
         # Activity Type
         try:
-            efs = api.get_emission_factors()
+            if isinstance(efs, Exception):
+                raise efs
             def get_label(f):
                 sub = f" - {f['subcategory']}" if f['subcategory'] else ""
                 return f"{f['category']}{sub} ({f['unit']}) [{f['region']}]"
@@ -207,7 +215,8 @@ else:
         if st.button("Save Emission", use_container_width=True):
             try:
                 # Get facility (use first available for demo)
-                facilities = api.get_facilities(org_id)
+                if isinstance(facilities, Exception):
+                    raise facilities
                 if not facilities['results']:
                     st.error("No facilities found. Please create a facility in Settings first.")
                 else:
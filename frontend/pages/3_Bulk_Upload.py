@@ -1,5 +1,9 @@
 import streamlit as st
 import pandas as pd
+import time
+
+# Stop polling an upload job after this long; it keeps running on the server
+UPLOAD_POLL_TIMEOUT_SECONDS = 300
 
 st.set_page_config(page_title="Bulk Upload | Carbon Ledger", layout="wide")
 
@@ -200,6 +204,7 @@ else:
     <div class="section-text">
         To ensure data consistency and accuracy, please download our pre-formatted CSV template. 
         It includes all the necessary columns for your emission records, simplifying the upload process.
+        Leave emission_factor_used blank to have the factor picked from the library by facility region and activity date.
     </div>
     ''', unsafe_allow_html=True)
     
@@ -210,7 +215,7 @@ else:
         'category': ['Company Fleet Fuel', 'Electricity Consumption'],
         'subcategory': ['Diesel', 'Grid'],
         'quantity': [500, 12000],
-        'unit': ['liters', 'kWh'],
+        'unit': ['liter', 'kWh'],
         'emission_factor_used': [2.687, 0.712],
         'activity_date': ['2024-10-26', '2024-10-25'],
         'notes': ['Monthly fuel purchase', 'Office electricity bill']
@@ -279,15 +284,39 @@ else:
                         
                         result = api.upload_bulk_csv(org_id, uploaded_file)
                         
-                        st.success(f"Upload completed! Status: {result.get('processing_status', 'completed')}")
-                        
-                        if result.get('records_created', 0) > 0:
-                            st.info(f"Records created: {result['records_created']}")
-                        
-                        if result.get('error_message'):
-                            st.warning(f"Note: {result['error_message']}")
+                        # Processing runs in a background job; poll its progress
+                        progress = st.empty()
+                        deadline = time.monotonic() + UPLOAD_POLL_TIMEOUT_SECONDS
+                        while (result.get('processing_status') in ('pending', 'processing')
+                               and time.monotonic() < deadline):
+                            progress.info(
+                                f"Processing... {result.get('rows_processed', 0):,} rows processed, "
+                                f"{result.get('rows_failed', 0):,} failed "
+                                f"({result.get('throughput', 0):,.0f} rows/s)"
+                            )
+                            time.sleep(1)
+                            result = api.get_upload(result['job_id'])
+                        progress.empty()
                         
-                        st.balloons()
+                        if result.get('processing_status') in ('pending', 'processing'):
+                            st.warning(
+                                f"Still processing: {result.get('rows_processed', 0):,} rows processed so far. "
+                                f"The import continues in the background; check back later "
+                                f"(job {result.get('job_id')})."
+                            )
+                        else:
+                            st.success(f"Upload completed! Status: {result.get('processing_status', 'completed')}")
+                            
+                            if result.get('records_created', 0) > 0:
+                                st.info(f"Records created: {result['records_created']}")
+                            
+                            if result.get('rows_skipped', 0) > 0:
+                                st.info(f"Rows already imported (skipped): {result['rows_skipped']}")
+                            
+                            if result.get('error_message'):
+                                st.warning(f"Note: {result['error_message']}")
+                            
+                            st.balloons()
                         
                     except Exception as e:
                         st.error(f"Upload failed: {str(e)}")
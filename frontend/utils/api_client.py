@@ -1,25 +1,126 @@
 import requests
 import pandas as pd
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import streamlit as st
 
 load_dotenv()
 
+
+class ResponseCache:
+    """
+    Thread-safe, size-bounded cache of GET payloads by URL.
+
+    Entries are served without a request while younger than ttl seconds.
+    After that they are revalidated with If-None-Match when the server sent
+    an ETag, so an unchanged payload costs a 304 instead of a full body.
+    Cached payloads are shared; treat them as read-only.
+    """
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # url -> (expires_at, etag, data)
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry:
+                self._entries.move_to_end(url)
+            return entry
+
+    def put(self, url, etag, data):
+        with self._lock:
+            self._entries[url] = (time.monotonic() + self.ttl, etag, data)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
 class APIClient:
     """
     Client for interacting with the Carbon Accounting API.
+    Requests go through one pooled keep-alive session; GETs are answered
+    from a TTL-bounded response cache where possible. gather() runs
+    several calls concurrently.
     """
     def __init__(self, base_url=None):
         self.base_url = base_url or os.getenv('API_BASE_URL', 'http://localhost:8000/api/v1')
+        self.pool_size = int(os.getenv('API_POOL_SIZE', '10'))
+        self.session = self._build_session(self.pool_size)
+        self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix='api-client')
+        self.cache = ResponseCache(
+            ttl=float(os.getenv('API_CACHE_TTL', '30')),
+            max_entries=int(os.getenv('API_CACHE_MAX_ENTRIES', '256'))
+        )
+
+    @staticmethod
+    def _build_session(pool_size):
+        # Only idempotent requests are retried; POSTs are never replayed
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD'])
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
 
-    def _get(self, endpoint, params=None):
-        response = requests.get(f"{self.base_url}/{endpoint}", params=params)
+    def gather(self, *calls, return_exceptions=False):
+        """
+        Runs zero-argument callables (e.g. functools.partial(api.get_facilities, org_id))
+        concurrently and returns their results in the same order, so a page
+        waits only as long as its slowest call. The first error is raised
+        unless return_exceptions is True, in which case errors are returned
+        in place of results.
+        """
+        futures = [self._executor.submit(call) for call in calls]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+    def _get(self, endpoint, params=None, cache=True):
+        url = requests.Request('GET', f"{self.base_url}/{endpoint}", params=params).prepare().url
+        cached = self.cache.get(url) if cache else None
+        if cached and cached[0] > time.monotonic():
+            return cached[2]
+        
+        headers = {'If-None-Match': cached[1]} if cached and cached[1] else None
+        response = self.session.get(url, headers=headers)
+        if response.status_code == 304 and cached:
+            self.cache.put(url, cached[1], cached[2])
+            return cached[2]
         response.raise_for_status()
-        return response.json()
+        
+        data = response.json()
+        if cache:
+            self.cache.put(url, response.headers.get('ETag'), data)
+        return data
 
     def _post(self, endpoint, data=None, files=None):
-        response = requests.post(f"{self.base_url}/{endpoint}", json=data, files=files)
+        response = self.session.post(f"{self.base_url}/{endpoint}", json=data, files=files)
         response.raise_for_status()
+        # Writes can change any cached read
+        self.cache.clear()
         return response.json()
 
     # --- Organizations ---
@@ -29,11 +130,24 @@ class APIClient:
     def get_organization_stats(self, org_id):
         return self._get(f'organizations/{org_id}/stats/')
 
+    def get_organizations_stats(self, org_ids=None, page=1):
+        params = {'page': page}
+        if org_ids: params['ids'] = ','.join(str(org_id) for org_id in org_ids)
+        return self._get('organizations/stats/', params=params)
+
     # --- Facilities ---
     def get_facilities(self, org_id=None):
         params = {'organization': org_id} if org_id else {}
         return self._get('facilities/', params=params)
 
+    def get_facility_emissions(self, facility_id, period_from=None, period_to=None, scope=None, cursor=None):
+        params = {}
+        if period_from: params['period_from'] = period_from
+        if period_to: params['period_to'] = period_to
+        if scope: params['scope'] = scope
+        if cursor: params['cursor'] = cursor
+        return self._get(f'facilities/{facility_id}/emissions/', params=params)
+
     # --- Emission Factors ---
     def get_emission_factors(self, scope=None, category=None):
         params = {}
@@ -41,29 +155,91 @@ class APIClient:
         if category: params['category'] = category
         return self._get('emission-factors/', params=params)
 
+    def get_emission_factor_library(self):
+        return self._get('emission-factors/library/')
+
     # --- Emissions ---
-    def get_emission_records(self, org_id=None):
+    def get_emission_records(self, org_id=None, fields=None):
         params = {'organization': org_id} if org_id else {}
+        if fields: params['fields'] = ','.join(fields)
         return self._get('emissions/', params=params)
 
+    def iter_emission_records(self, org_id=None, page_size=1000):
+        """
+        Yields every emission record using cursor pagination, so walking
+        a large ledger doesn't slow down on later pages.
+        """
+        params = {'pagination': 'cursor', 'page_size': page_size}
+        if org_id: params['organization'] = org_id
+        url = f"{self.base_url}/emissions/"
+        while url:
+            response = self.session.get(url, params=params)
+            response.raise_for_status()
+            page = response.json()
+            yield from page['results']
+            # The next link already carries every query parameter
+            url, params = page['next'], None
+
+    def get_emissions_export_url(self, org_id=None, export_format='csv', **filters):
+        params = {'export_format': export_format, **filters}
+        if org_id: params['organization'] = org_id
+        return requests.Request('GET', f"{self.base_url}/emissions/export/", params=params).prepare().url
+
     def create_emission_record(self, data):
         return self._post('emissions/', data=data)
 
+    def bulk_upsert_records(self, org_id, records):
+        """Creates or updates records keyed by their external_ref."""
+        return self._post('emissions/bulk-upsert/', data={'organization': org_id, 'records': records})
+
     # --- Analytics ---
     def get_dashboard_stats(self, org_id, period=None):
         params = {'organization': org_id}
         if period: params['period'] = period
         return self._get('analytics/dashboard/', params=params)
 
+    def get_emissions_trend(self, org_id, period_from=None, period_to=None, facility_id=None, rolling_window=3):
+        params = {'organization': org_id, 'rolling_window': rolling_window}
+        if period_from: params['period_from'] = period_from
+        if period_to: params['period_to'] = period_to
+        if facility_id: params['facility'] = facility_id
+        return self._get('analytics/trend/', params=params)
+
+    def get_fiscal_summary(self, org_id, fiscal_year=None, granularity='year'):
+        params = {'organization': org_id, 'granularity': granularity}
+        if fiscal_year: params['fiscal_year'] = fiscal_year
+        return self._get('analytics/fiscal/', params=params)
+
+    def get_target_progress(self, org_id, year=None, target_year=None, target_reduction_pct=None):
+        params = {'organization': org_id}
+        if year: params['year'] = year
+        if target_year: params['target_year'] = target_year
+        if target_reduction_pct: params['target_reduction_pct'] = target_reduction_pct
+        return self._get('analytics/targets/', params=params)
+
     # --- Uploads ---
     def upload_bulk_csv(self, org_id, file):
         files = {'file': file}
         data = {'organization': org_id, 'file_type': 'bulk_upload'}
         # Note: requests uses different format for multipart/form-data
-        response = requests.post(
+        response = self.session.post(
             f"{self.base_url}/uploads/", 
             files=files, 
             data=data
         )
         response.raise_for_status()
+        self.cache.clear()
         return response.json()
+
+    def get_upload(self, upload_id):
+        # Polled for progress, so never served from the cache
+        return self._get(f'uploads/{upload_id}/', cache=False)
+
+
+@st.cache_resource
+def get_api_client():
+    """
+    One APIClient per server process, shared by every Streamlit session
+    and rerun, so the connection pool and response cache are reused.
+    """
+    return APIClient()
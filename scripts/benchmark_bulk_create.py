@@ -0,0 +1,114 @@
+"""
+Benchmark: per-row EmissionService.create_record loop vs set-based
+EmissionService.bulk_create_records.
+
+Runs against a throwaway test database created from the current settings.
+
+Usage:
+    python scripts/benchmark_bulk_create.py
+    python scripts/benchmark_bulk_create.py --sizes 10000 100000 --legacy-max 100000
+
+Measured with --sizes 10000 100000 1000000 --legacy-max 100000
+(SQLite in-memory test database, 1 CPU, summaries maintained on both paths):
+    10k    bulk      6.9s   1,445 rows/s   per-row    145.2s  69 rows/s  21.0x
+    100k   bulk     48.2s   2,073 rows/s   per-row  1,108.0s  90 rows/s  23.0x
+    1M     bulk    522.9s   1,912 rows/s   per-row  not run (~3h at 90 rows/s)
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import django
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.db import connection, transaction
+from apps.organizations.models import Organization
+from apps.facilities.models import Facility
+from apps.emissions.models import EmissionRecord
+from apps.emissions.services import EmissionService
+
+
+CATEGORIES = [
+    ('scope1', 'Diesel', 'Stationary', 'liter', '2.68787'),
+    ('scope1', 'Refrigerant', 'HFC-134a', 'kg', '1430.0'),
+    ('scope2', 'Electricity', 'Grid (India)', 'kWh', '0.712'),
+    ('scope3', 'Business Travel', 'Flight - Long Haul (Economy)', 'km', '0.147'),
+]
+
+
+def build_rows(count, facility_ids):
+    start = date(2024, 1, 1)
+    rows = []
+    for i in range(count):
+        scope, category, subcategory, unit, ef = CATEGORIES[i % len(CATEGORIES)]
+        rows.append({
+            'facility_id': facility_ids[i % len(facility_ids)],
+            'scope': scope,
+            'category': category,
+            'subcategory': subcategory,
+            'quantity': Decimal(100 + i % 900) / 4,
+            'unit': unit,
+            'emission_factor_used': Decimal(ef),
+            'activity_date': start + timedelta(days=i % 365),
+            'notes': '',
+        })
+    return rows
+
+
+def run_legacy(rows, organization):
+    with transaction.atomic():
+        for row in rows:
+            EmissionService.create_record(dict(row), organization)
+    return len(rows)
+
+
+def run_bulk(rows, organization):
+    return EmissionService.bulk_create_records(rows, organization).created_count
+
+
+def timed(label, func, rows, organization):
+    EmissionRecord.all_objects.all().delete()
+    started = time.perf_counter()
+    created = func(rows, organization)
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<8} {created:>9,} rows  {elapsed:>9.2f}s  {created / elapsed:>11,.0f} rows/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--legacy-max', type=int, default=None,
+                        help='Skip the per-row path for sizes above this value')
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        organization = Organization.objects.create(name='Benchmark Corp')
+        facility_ids = [
+            Facility.objects.create(organization=organization, name=f'Site {i}').id
+            for i in range(10)
+        ]
+
+        print(f"Database: {connection.vendor}")
+        for size in args.sizes:
+            rows = build_rows(size, facility_ids)
+            print(f"{size:,} rows")
+            bulk = timed('bulk', run_bulk, rows, organization)
+            if args.legacy_max is None or size <= args.legacy_max:
+                legacy = timed('per-row', run_legacy, rows, organization)
+                print(f"  speedup  {legacy / bulk:.1f}x")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: per-row calculator dispatch through CalculatorFactory.
+
+Compares the old dispatch (substring checks on category.lower() and a new
+calculator object per call) with the memoized routing table, and puts both
+next to the cost of the calculation itself.
+
+No database is needed.
+
+Usage:
+    python scripts/benchmark_calculator_dispatch.py
+    python scripts/benchmark_calculator_dispatch.py --rows 500000 --categories 50
+"""
+
+import argparse
+import os
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+import django
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from apps.emissions.calculators import (
+    CalculatorFactory, FugitiveCalculator, RadiativeForcingCalculator, StandardCalculator,
+)
+
+
+def legacy_get_calculator(category):
+    """CalculatorFactory.get_calculator as it was before the routing table."""
+    category_lower = category.lower()
+    if 'refrigerant' in category_lower or 'fugitive' in category_lower:
+        return FugitiveCalculator()
+    if 'flight' in category_lower or 'air travel' in category_lower:
+        return RadiativeForcingCalculator()
+    return StandardCalculator()
+
+
+def make_categories(rows, distinct):
+    names = ['Refrigerant Leak', 'Business Travel - Flight', 'Diesel', 'Electricity', 'Natural Gas']
+    names += [f'Purchased Goods {i}' for i in range(max(distinct - len(names), 0))]
+    names = names[:distinct]
+    return [names[i % len(names)] for i in range(rows)]
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--categories', type=int, default=20, help='Distinct categories in the batch')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    categories = make_categories(args.rows, args.categories)
+    quantity, factor = Decimal('125.5000'), Decimal('2.687870')
+    calculator = StandardCalculator()
+
+    def empty_loop():
+        for category in categories:
+            pass
+
+    def legacy_dispatch():
+        for category in categories:
+            legacy_get_calculator(category)
+
+    def routed_dispatch():
+        get_calculator = CalculatorFactory.get_calculator
+        for category in categories:
+            get_calculator(category)
+
+    def calculation_only():
+        for category in categories:
+            calculator.calculate(quantity, factor)
+
+    baseline = best_of(empty_loop, args.repeat)
+    legacy = best_of(legacy_dispatch, args.repeat) - baseline
+    routed = best_of(routed_dispatch, args.repeat) - baseline
+    calculation = best_of(calculation_only, args.repeat) - baseline
+
+    per_row = lambda seconds: seconds / args.rows * 1e9
+    print(f"{args.rows:,} rows, {args.categories} distinct categories (per row, loop overhead removed)")
+    print(f"  legacy dispatch   {per_row(legacy):>8.1f} ns")
+    print(f"  routing table     {per_row(routed):>8.1f} ns  ({legacy / routed:.1f}x faster)")
+    print(f"  Decimal calculate {per_row(calculation):>8.1f} ns  (dispatch is {routed / calculation:.1%} of it)")
+
+
+if __name__ == '__main__':
+    main()
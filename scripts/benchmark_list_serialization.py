@@ -0,0 +1,117 @@
+"""
+Benchmark: emissions list rendering through EmissionRecordSerializer +
+JSONRenderer vs the lean .values() path + ORJSONRenderer.
+
+Times building and rendering the rows for a full page straight from the
+queryset, plus one end-to-end GET per mode through the API.
+
+Runs against a throwaway test database created from the current settings.
+
+Usage:
+    python scripts/benchmark_list_serialization.py
+    python scripts/benchmark_list_serialization.py --rows 20000 --page-sizes 100 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import django
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment
+from rest_framework.renderers import JSONRenderer
+from apps.core.renderers import ORJSONRenderer
+from apps.organizations.models import Organization
+from apps.facilities.models import Facility
+from apps.emissions.models import EmissionRecord
+from apps.emissions.serializers import EmissionRecordSerializer
+from apps.emissions.services import EmissionService
+
+
+def seed(count, organization, facility):
+    start = date(2024, 1, 1)
+    rows = [{
+        'facility_id': facility.id,
+        'scope': 'scope1',
+        'category': 'Diesel',
+        'subcategory': 'Stationary',
+        'quantity': Decimal(100 + i % 900) / 4,
+        'unit': 'liter',
+        'emission_factor_used': Decimal('2.68787'),
+        'activity_date': start + timedelta(days=i % 365),
+        'notes': 'Monthly fuel purchase',
+        'details_data': {'vehicle': f'TRK-{i % 40}'} if i % 3 == 0 else None,
+    } for i in range(count)]
+    EmissionService.bulk_create_records(rows, organization)
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10_000, help='Records to seed')
+    parser.add_argument('--page-sizes', type=int, nargs='+', default=[100, 1000, 10_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        organization = Organization.objects.create(name='Benchmark Corp')
+        facility = Facility.objects.create(organization=organization, name='Site')
+        seed(args.rows, organization, facility)
+
+        base = EmissionRecord.objects.select_related('organization', 'facility', 'scope_details').filter(
+            organization=organization
+        )
+        print(f"Database: {connection.vendor}, {args.rows:,} records")
+        for size in args.page_sizes:
+            def serializer_path():
+                data = EmissionRecordSerializer(base[:size], many=True).data
+                return JSONRenderer().render(data)
+
+            def lean_path():
+                return ORJSONRenderer().render(list(EmissionService.lean_queryset(base[:size])))
+
+            def lean_narrow_path():
+                fields = ['activity_date', 'scope', 'category', 'co2e_calculated', 'facility_name']
+                return ORJSONRenderer().render(list(EmissionService.lean_queryset(base[:size], fields)))
+
+            serializer = best_of(serializer_path, args.repeat)
+            lean = best_of(lean_path, args.repeat)
+            narrow = best_of(lean_narrow_path, args.repeat)
+            print(f"{size:,} rows per page")
+            print(f"  serializer  {serializer * 1000:>9.1f} ms")
+            print(f"  lean        {lean * 1000:>9.1f} ms  ({serializer / lean:.1f}x)")
+            print(f"  lean/5 cols {narrow * 1000:>9.1f} ms  ({serializer / narrow:.1f}x)")
+
+        client = Client()
+        params = {'organization': str(organization.id)}
+        full = best_of(lambda: client.get('/api/v1/emissions/', params), args.repeat)
+        lean = best_of(lambda: client.get('/api/v1/emissions/', {**params, 'lean': 'true'}), args.repeat)
+        print("GET /api/v1/emissions/ (one page)")
+        print(f"  default     {full * 1000:>9.1f} ms")
+        print(f"  ?lean=true  {lean * 1000:>9.1f} ms  ({full / lean:.1f}x)")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
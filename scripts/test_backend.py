@@ -59,8 +59,11 @@ def run_test():
     print(f"Created Record: {record.category} - {record.co2e_calculated} kg CO2e")
     
     # 5. Check Aggregations
-    # Calculate for Jan 2024
-    AnalyticsService.calculate_monthly_summary(org, '2024-01')
+    # Summaries are maintained by EmissionService; check them against the records
+    mismatches = AnalyticsService.verify_summaries(org)
+    if mismatches:
+        print(f"Error: {len(mismatches)} summary rows are out of date. Run rebuild_summaries.")
+        return
     
     # Get Dashboard Data
     stats = AnalyticsService.get_dashboard_data(org, '2024-01')